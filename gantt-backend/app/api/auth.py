@@ -7,17 +7,23 @@ from app.services import user_service
 router = fastapi.APIRouter()
 
 
-def get_current_user(request: fastapi.Request, data_base: orm.Session = fastapi.Depends(db.get_db)):
-    """Получить текущего пользователя по токену из заголовка"""
+def _user_id_from_request(request: fastapi.Request) -> int:
     user_id = getattr(request.state, "user_id", None)
 
     if not user_id:
         raise fastapi.HTTPException(status_code=401, detail="Некорректный токен")
 
-    try:
-        return user_service.get_current_user_service(data_base, user_id)
-    except exception.NotFoundError as e:
-        raise fastapi.HTTPException(status_code=404, detail=str(e))
+    return user_id
+
+
+def get_current_user(request: fastapi.Request, data_base: orm.Session = fastapi.Depends(db.get_db)):
+    """Получить текущего пользователя по токену из заголовка; строка Users читается лениво"""
+    return user_service.CurrentUser(data_base, _user_id_from_request(request))
+
+
+async def get_current_user_id(request: fastapi.Request) -> int:
+    """id текущего пользователя из токена без обращения к базе; для асинхронных эндпоинтов"""
+    return _user_id_from_request(request)
 
 
 @router.post("/api/check-email")
@@ -28,18 +34,22 @@ def check_email(email: str, data_base: orm.Session = fastapi.Depends(db.get_db))
 
 
 @router.post("/api/register", status_code=201)
-def register(email: str, nickname: str, password: str, data_base: orm.Session = fastapi.Depends(db.get_db)):
+async def register(email: str, nickname: str, password: str, data_base: orm.Session = fastapi.Depends(db.get_db)):
     """Зарегистрировать нового пользователя"""
     try:
-        return user_service.register_user_service(data_base, email, nickname, password)
+        return await user_service.register_user_service(data_base, email, nickname, password)
     except exception.ConflictError as e:
         raise fastapi.HTTPException(status_code=409, detail=str(e))
+    except exception.UnavailableError as e:
+        raise fastapi.HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
 
 
 @router.post("/api/login")
-def login(email: str, password: str, data_base: orm.Session = fastapi.Depends(db.get_db)):
+async def login(email: str, password: str, data_base: orm.Session = fastapi.Depends(db.get_db)):
     """Авторизовать пользователя и вернуть токен"""
     try:
-        return user_service.login_user_service(data_base, email, password)
+        return await user_service.login_user_service(data_base, email, password)
     except exception.ForbiddenError as e:
         raise fastapi.HTTPException(status_code=401, detail=str(e))
+    except exception.UnavailableError as e:
+        raise fastapi.HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
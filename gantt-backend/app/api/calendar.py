@@ -13,7 +13,7 @@ router = fastapi.APIRouter(prefix="/api/calendar", tags=["calendar"])
 
 @router.post("/export")
 def export_calendar(export_options: calendar_schemas.CalendarExport,
-                    data_base: orm.Session = fastapi.Depends(db.get_db),
+                    data_base: orm.Session = fastapi.Depends(db.get_read_db),
                     current_user=fastapi.Depends(auth.get_current_user), ):
     try:
         calendar_data = calendar_service.export_calendar_service(data_base, current_user.id, export_options)
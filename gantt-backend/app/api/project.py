@@ -1,10 +1,13 @@
 
 import fastapi
 from sqlalchemy import orm
+from sqlalchemy.ext import asyncio
 
 from app.api import auth
-from app.core import db, exception
+from app.core import conditional, db, exception, streaming
 from app.models import user as user_models
+from app.schemas import gantt as gantt_schemas
+from app.schemas import meta as meta_schemas
 from app.schemas import project as project_schemas
 from app.schemas import stream as stream_schemas
 from app.schemas import task as task_schemas
@@ -37,10 +40,48 @@ def delete_project(proj_id: int, current_user=fastapi.Depends(auth.get_current_u
 
 
 @router.get("/api/project/{project_id}/tasks", response_model=list[task_schemas.TaskResponse])
-def get_project_tasks(project_id: int, current_user=fastapi.Depends(auth.get_current_user),
-                      data_base: orm.Session = fastapi.Depends(db.get_db)):
+async def get_project_tasks(project_id: int, request: fastapi.Request, response: fastapi.Response,
+                            current_user_id: int = fastapi.Depends(auth.get_current_user_id),
+                            data_base: asyncio.AsyncSession = fastapi.Depends(db.get_async_db),
+                            read_db: asyncio.AsyncSession = fastapi.Depends(db.get_async_read_db)):
     try:
-        return task_service.get_project_tasks_service(data_base, project_id, current_user.id)
+        version = await db.run_sync(data_base, project_service.get_project_version_service, project_id,
+                                    current_user_id)
+        ndjson = streaming.accepts_ndjson(request)
+        etag = conditional.make_etag("project-tasks", project_id, version, "ndjson" if ndjson else None)
+        if conditional.is_not_modified(request, etag):
+            return conditional.not_modified_response(etag)
+
+        read_db = await db.async_read_db_at_version(read_db, data_base, project_service.get_project_version_service,
+                                                    project_id, current_user_id, version=version)
+        if ndjson:
+            tasks = await db.run_sync(read_db, task_service.iter_project_tasks_service, project_id, current_user_id)
+            return streaming.ndjson_response_async(read_db, tasks, task_schemas.TaskResponse, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return await db.run_sync(read_db, task_service.get_project_tasks_service, project_id, current_user_id,
+                                 schema=task_schemas.TaskResponse)
+    except exception.NotFoundError as e:
+        raise fastapi.HTTPException(404, str(e))
+    except exception.ForbiddenError as e:
+        raise fastapi.HTTPException(403, str(e))
+
+
+@router.get("/api/project/{proj_id}/gantt", response_model=gantt_schemas.GanttSnapshotResponse)
+def get_project_gantt(proj_id: int, request: fastapi.Request, response: fastapi.Response,
+                      current_user=fastapi.Depends(auth.get_current_user),
+                      data_base: orm.Session = fastapi.Depends(db.get_db),
+                      read_db: orm.Session = fastapi.Depends(db.get_read_db)):
+    """Получить все данные проекта proj_id для диаграммы Ганта одним запросом"""
+    try:
+        version = project_service.get_project_version_service(data_base, proj_id, current_user.id)
+        etag = conditional.make_etag("project-gantt", proj_id, version)
+        if conditional.is_not_modified(request, etag):
+            return conditional.not_modified_response(etag)
+
+        response.headers["ETag"] = etag
+        read_db = db.read_db_at_version(read_db, data_base, project_service.get_project_version_service, proj_id,
+                                        current_user.id, version=version)
+        return project_service.get_project_gantt_service(read_db, proj_id, current_user.id)
     except exception.NotFoundError as e:
         raise fastapi.HTTPException(404, str(e))
     except exception.ForbiddenError as e:
@@ -49,14 +90,26 @@ def get_project_tasks(project_id: int, current_user=fastapi.Depends(auth.get_cur
 
 @router.get("/api/project/{proj_id}/streams", response_model=list[stream_schemas.StreamResponse],
             status_code=fastapi.status.HTTP_200_OK)
-def get_project_streams(
+async def get_project_streams(
         proj_id: int,
-        current_user: user_models.User = fastapi.Depends(auth.get_current_user),
-        data_base: orm.Session = fastapi.Depends(db.get_db)
+        request: fastapi.Request,
+        response: fastapi.Response,
+        current_user_id: int = fastapi.Depends(auth.get_current_user_id),
+        data_base: asyncio.AsyncSession = fastapi.Depends(db.get_async_db),
+        read_db: asyncio.AsyncSession = fastapi.Depends(db.get_async_read_db)
 ):
     """Получить все стримы в проекте proj_id"""
     try:
-        streams = stream_service.get_project_streams_service(data_base, proj_id, current_user.id)
+        version = await db.run_sync(data_base, project_service.get_project_version_service, proj_id, current_user_id)
+        etag = conditional.make_etag("project-streams", proj_id, version)
+        if conditional.is_not_modified(request, etag):
+            return conditional.not_modified_response(etag)
+
+        response.headers["ETag"] = etag
+        read_db = await db.async_read_db_at_version(read_db, data_base, project_service.get_project_version_service,
+                                                    proj_id, current_user_id, version=version)
+        streams = await db.run_sync(read_db, stream_service.get_project_streams_service, proj_id, current_user_id,
+                                    schema=stream_schemas.StreamResponse)
         return streams
     except exception.NotFoundError as e:
         raise fastapi.HTTPException(status_code=404, detail=str(e))
@@ -79,3 +132,18 @@ def create_stream(proj_id: int, stream_data: stream_schemas.StreamCreate,
         raise fastapi.HTTPException(status_code=409, detail=str(e))
     except exception.ForbiddenError as e:
         raise fastapi.HTTPException(status_code=403, detail=str(e))
+
+
+@router.put("/api/project/{proj_id}/streams/order", status_code=fastapi.status.HTTP_204_NO_CONTENT)
+def reorder_streams(proj_id: int, order: meta_schemas.Reorder,
+                    current_user: user_models.User = fastapi.Depends(auth.get_current_user),
+                    data_base: orm.Session = fastapi.Depends(db.get_db)):
+    """Расставить стримы проекта proj_id в порядке order.ids"""
+    try:
+        stream_service.reorder_project_streams_service(data_base, proj_id, current_user.id, order.ids)
+    except exception.ValidationError as e:
+        raise fastapi.HTTPException(status_code=400, detail=str(e))
+    except exception.NotFoundError as e:
+        raise fastapi.HTTPException(status_code=404, detail=str(e))
+    except exception.ForbiddenError as e:
+        raise fastapi.HTTPException(status_code=403, detail=str(e))
@@ -1,11 +1,12 @@
-
 import fastapi
 from sqlalchemy import orm
+from sqlalchemy.ext import asyncio
 
 from app.api import auth
-from app.core import db, exception
+from app.core import conditional, db, exception, streaming
 from app.models import user as user_models
 from app.schemas import goal as goal_schemas
+from app.schemas import meta as meta_schemas
 from app.schemas import stream as stream_schemas
 from app.schemas import task as task_schemas
 from app.services import goal_service, stream_service, task_service
@@ -16,7 +17,7 @@ router = fastapi.APIRouter()
 @router.get("/api/stream/{stream_id}", response_model=stream_schemas.StreamResponse,
             status_code=fastapi.status.HTTP_200_OK)
 def get_stream(stream_id: int, current_user: user_models.User = fastapi.Depends(auth.get_current_user),
-               data_base: orm.Session = fastapi.Depends(db.get_db)):
+               data_base: orm.Session = fastapi.Depends(db.get_read_db)):
     """Получить информацию о стриме stream_id"""
     try:
         stream = stream_service.get_stream_service(data_base, stream_id, current_user.id)
@@ -57,10 +58,25 @@ def delete_stream(stream_id: int, current_user: user_models.User = fastapi.Depen
 
 
 @router.get("/api/stream/{stream_id}/tasks", response_model=list[task_schemas.TaskResponse])
-def get_stream_tasks(stream_id: int, current_user=fastapi.Depends(auth.get_current_user),
-                     data_base: orm.Session = fastapi.Depends(db.get_db)):
+async def get_stream_tasks(stream_id: int, request: fastapi.Request, response: fastapi.Response,
+                           current_user_id: int = fastapi.Depends(auth.get_current_user_id),
+                           data_base: asyncio.AsyncSession = fastapi.Depends(db.get_async_db),
+                           read_db: asyncio.AsyncSession = fastapi.Depends(db.get_async_read_db)):
     try:
-        return task_service.get_stream_tasks_service(data_base, stream_id, current_user.id)
+        version = await db.run_sync(data_base, stream_service.get_stream_version_service, stream_id, current_user_id)
+        ndjson = streaming.accepts_ndjson(request)
+        etag = conditional.make_etag("stream-tasks", stream_id, version, "ndjson" if ndjson else None)
+        if conditional.is_not_modified(request, etag):
+            return conditional.not_modified_response(etag)
+
+        read_db = await db.async_read_db_at_version(read_db, data_base, stream_service.get_stream_version_service,
+                                                    stream_id, current_user_id, version=version)
+        if ndjson:
+            tasks = await db.run_sync(read_db, task_service.iter_stream_tasks_service, stream_id, current_user_id)
+            return streaming.ndjson_response_async(read_db, tasks, task_schemas.TaskResponse, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return await db.run_sync(read_db, task_service.get_stream_tasks_service, stream_id, current_user_id,
+                                 schema=task_schemas.TaskResponse)
     except exception.NotFoundError as e:
         raise fastapi.HTTPException(404, str(e))
     except exception.ForbiddenError as e:
@@ -68,10 +84,21 @@ def get_stream_tasks(stream_id: int, current_user=fastapi.Depends(auth.get_curre
 
 
 @router.get("/api/stream/{stream_id}/goals", response_model=list[goal_schemas.GoalResponse])
-def get_goals(stream_id: int, current_user=fastapi.Depends(auth.get_current_user),
-              data_base: orm.Session = fastapi.Depends(db.get_db)):
+async def get_goals(stream_id: int, request: fastapi.Request, response: fastapi.Response,
+                    current_user_id: int = fastapi.Depends(auth.get_current_user_id),
+                    data_base: asyncio.AsyncSession = fastapi.Depends(db.get_async_db),
+                    read_db: asyncio.AsyncSession = fastapi.Depends(db.get_async_read_db)):
     try:
-        return goal_service.get_stream_goals_service(data_base, stream_id, current_user.id)
+        version = await db.run_sync(data_base, stream_service.get_stream_version_service, stream_id, current_user_id)
+        etag = conditional.make_etag("stream-goals", stream_id, version)
+        if conditional.is_not_modified(request, etag):
+            return conditional.not_modified_response(etag)
+
+        response.headers["ETag"] = etag
+        read_db = await db.async_read_db_at_version(read_db, data_base, stream_service.get_stream_version_service,
+                                                    stream_id, current_user_id, version=version)
+        return await db.run_sync(read_db, goal_service.get_stream_goals_service, stream_id, current_user_id,
+                                 schema=goal_schemas.GoalResponse)
     except exception.NotFoundError as e:
         raise fastapi.HTTPException(status_code=404, detail=str(e))
     except exception.ForbiddenError as e:
@@ -89,6 +116,47 @@ def create_task(stream_id: int, task_data: task_schemas.TaskCreate, current_user
         raise fastapi.HTTPException(403, str(e))
 
 
+@router.post("/api/stream/{stream_id}/tasks/bulk", response_model=task_schemas.TaskBulkCreateResponse, status_code=201)
+def create_tasks_bulk(stream_id: int, bulk_data: task_schemas.TaskBulkCreate,
+                      current_user=fastapi.Depends(auth.get_current_user),
+                      data_base: orm.Session = fastapi.Depends(db.get_db)):
+    """Создать задачи в стриме stream_id пачкой (импорт, шаблоны); id возвращаются в порядке запроса"""
+    try:
+        return {"ids": task_service.create_tasks_bulk_service(data_base, stream_id, current_user.id, bulk_data.tasks)}
+    except exception.NotFoundError as e:
+        raise fastapi.HTTPException(404, str(e))
+    except exception.ForbiddenError as e:
+        raise fastapi.HTTPException(403, str(e))
+
+
+@router.put("/api/stream/{stream_id}/tasks/order", status_code=fastapi.status.HTTP_204_NO_CONTENT)
+def reorder_tasks(stream_id: int, order: meta_schemas.Reorder, current_user=fastapi.Depends(auth.get_current_user),
+                  data_base: orm.Session = fastapi.Depends(db.get_db)):
+    """Расставить задачи стрима stream_id в порядке order.ids (drag-and-drop в диаграмме Ганта)"""
+    try:
+        task_service.reorder_stream_tasks_service(data_base, stream_id, current_user.id, order.ids)
+    except exception.ValidationError as e:
+        raise fastapi.HTTPException(status_code=400, detail=str(e))
+    except exception.NotFoundError as e:
+        raise fastapi.HTTPException(404, str(e))
+    except exception.ForbiddenError as e:
+        raise fastapi.HTTPException(403, str(e))
+
+
+@router.put("/api/stream/{stream_id}/goals/order", status_code=fastapi.status.HTTP_204_NO_CONTENT)
+def reorder_goals(stream_id: int, order: meta_schemas.Reorder, current_user=fastapi.Depends(auth.get_current_user),
+                  data_base: orm.Session = fastapi.Depends(db.get_db)):
+    """Расставить цели стрима stream_id в порядке order.ids"""
+    try:
+        goal_service.reorder_stream_goals_service(data_base, stream_id, current_user.id, order.ids)
+    except exception.ValidationError as e:
+        raise fastapi.HTTPException(status_code=400, detail=str(e))
+    except exception.NotFoundError as e:
+        raise fastapi.HTTPException(status_code=404, detail=str(e))
+    except exception.ForbiddenError as e:
+        raise fastapi.HTTPException(status_code=403, detail=str(e))
+
+
 @router.post("/api/stream/{stream_id}/goal/new", response_model=goal_schemas.GoalResponse, status_code=201)
 def create_goal(stream_id: int, goal_data: goal_schemas.GoalCreate, current_user=fastapi.Depends(auth.get_current_user),
                 data_base: orm.Session = fastapi.Depends(db.get_db)):
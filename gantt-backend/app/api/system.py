@@ -0,0 +1,65 @@
+import hmac
+
+import fastapi
+from anyio import to_thread
+
+from app.api import auth
+from app.core import cache, db, metrics, pool
+from app.core.config import settings
+from app.core.scheduler import SCAN_JOB_ID, scheduler
+from app.schemas import system as system_schemas
+
+router = fastapi.APIRouter()
+
+
+@router.get("/api/system/cache", response_model=system_schemas.CacheStatsResponse)
+def get_cache_stats(current_user=fastapi.Depends(auth.get_current_user)):
+    """Получить счетчики попаданий и промахов кэша по пространствам имен"""
+    return {
+        "backend": type(cache.cache.backend).__name__,
+        "namespaces": cache.cache.stats(),
+    }
+
+
+@router.get("/api/system/pool", response_model=dict[str, system_schemas.PoolStatsResponse])
+def get_pool_stats(current_user=fastapi.Depends(auth.get_current_user)):
+    """Получить состояние пулов соединений каждого движка, число таймаутов и время ожидания соединения"""
+    return {name: pool.pool_status(engine.pool) for name, engine in db.engines().items()}
+
+
+def _check_metrics_token(authorization: str | None):
+    # Без токена эндпоинт выключен, чтобы метрики не оказались открытыми по умолчанию
+    if not settings.METRICS_TOKEN:
+        raise fastapi.HTTPException(404, "Метрики отключены: не задан METRICS_TOKEN")
+    if not hmac.compare_digest(authorization or "", f"Bearer {settings.METRICS_TOKEN}"):
+        raise fastapi.HTTPException(401, "Недействительный токен метрик")
+
+
+def _system_metrics() -> list[str]:
+    limiter = to_thread.current_default_thread_limiter()
+    db_pools = {name: pool.pool_status(engine.pool) for name, engine in db.engines().items()}
+    jobs = scheduler.get_jobs()
+    scan_jobs = sum(1 for job in jobs if job.id == SCAN_JOB_ID)
+
+    return [
+        *metrics.family("threadpool_threads_busy", "gauge", "Занятые потоки пула AnyIO для синхронного кода",
+                        [(None, limiter.borrowed_tokens)]),
+        *metrics.family("threadpool_threads_limit", "gauge", "Размер пула потоков AnyIO",
+                        [(None, limiter.total_tokens)]),
+        *metrics.family("db_pool_connections", "gauge", "Соединения пула по движку и состоянию",
+                        [({"engine": name, "state": state}, db_pool[state] or 0) for name, db_pool in db_pools.items()
+                         for state in ("size", "checked_out", "checked_in", "overflow")]),
+        *metrics.family("db_pool_checkouts_total", "counter", "Выдачи соединений из пула",
+                        [({"engine": name}, db_pool["checkouts"]) for name, db_pool in db_pools.items()]),
+        *metrics.family("db_pool_timeouts_total", "counter", "Таймауты ожидания соединения",
+                        [({"engine": name}, db_pool["timeouts"]) for name, db_pool in db_pools.items()]),
+        *metrics.family("scheduler_jobs", "gauge", "Задачи планировщика напоминаний",
+                        [({"kind": "reminder"}, len(jobs) - scan_jobs), ({"kind": "scan"}, scan_jobs)]),
+    ]
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(authorization: str | None = fastapi.Header(None)):
+    """Метрики процесса в формате Prometheus"""
+    _check_metrics_token(authorization)
+    return fastapi.Response(metrics.render(_system_metrics()), media_type=metrics.CONTENT_TYPE)
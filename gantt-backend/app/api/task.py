@@ -2,7 +2,7 @@ import fastapi
 from sqlalchemy import orm
 
 from app.api import auth
-from app.core import db, exception
+from app.core import db, exception, streaming
 from app.schemas import task as task_schemas
 from app.services import task_service
 
@@ -11,10 +11,25 @@ router = fastapi.APIRouter()
 
 @router.get("/api/tasks/all", response_model=list[task_schemas.TaskResponseFull],
             status_code=fastapi.status.HTTP_200_OK)
-def get_all_tasks(current_user=fastapi.Depends(auth.get_current_user),
-                  data_base: orm.Session = fastapi.Depends(db.get_db)):
-    """Получить все задачи пользователя"""
-    return task_service.get_all_tasks_service(data_base, current_user.id)
+def get_all_tasks(request: fastapi.Request, response: fastapi.Response,
+                  page: task_schemas.TaskPageQuery = fastapi.Query(),
+                  current_user=fastapi.Depends(auth.get_current_user),
+                  data_base: orm.Session = fastapi.Depends(db.get_read_db)):
+    """Получить задачи пользователя постранично. Курсор следующей страницы возвращается в X-Next-Cursor.
+    С заголовком Accept: application/x-ndjson все подходящие задачи отдаются одним потоком"""
+    if streaming.accepts_ndjson(request):
+        tasks = task_service.iter_all_tasks_service(data_base, current_user.id, page)
+        return streaming.ndjson_response(tasks, task_schemas.TaskResponseFull)
+
+    try:
+        tasks, next_cursor = task_service.get_all_tasks_service(data_base, current_user.id, page, page.cursor,
+                                                                  page.limit)
+    except exception.ValidationError as e:
+        raise fastapi.HTTPException(400, str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return tasks
 
 
 @router.patch("/api/task/{task_id}", response_model=task_schemas.TaskResponse)
@@ -53,7 +68,7 @@ def create_task_relation(task_id: int, data: task_schemas.TaskRelationCreate,
 @router.get("/api/task/{task_id}/history", response_model=list[task_schemas.TaskHistoryEntry],
             status_code=fastapi.status.HTTP_200_OK)
 def get_task_history(task_id: int, current_user=fastapi.Depends(auth.get_current_user),
-                     data_base: orm.Session = fastapi.Depends(db.get_db)):
+                     data_base: orm.Session = fastapi.Depends(db.get_read_db)):
     """Получить историю изменений задачи"""
     try:
         return task_service.get_task_history_service(data_base, task_id, current_user.id)
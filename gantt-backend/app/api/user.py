@@ -1,5 +1,6 @@
 import fastapi
 from sqlalchemy import orm
+from sqlalchemy.ext import asyncio
 
 from app.api import auth
 from app.core import db, exception
@@ -11,10 +12,10 @@ router = fastapi.APIRouter()
 
 
 @router.get("/api/user_by_token", response_model=user_schemas.UserResponse, status_code=fastapi.status.HTTP_200_OK)
-def get_user_by_token(current_user=fastapi.Depends(auth.get_current_user),
-                      data_base: orm.Session = fastapi.Depends(db.get_db)):
+async def get_user_by_token(current_user_id: int = fastapi.Depends(auth.get_current_user_id),
+                            data_base: asyncio.AsyncSession = fastapi.Depends(db.get_async_db)):
     try:
-        user_obj, teams = user_service.get_user_by_token_service(data_base, current_user.id)
+        user_obj, teams = await db.run_sync(data_base, user_service.get_user_by_token_service, current_user_id)
 
         return {
             "id": user_obj.id,
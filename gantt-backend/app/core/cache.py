@@ -0,0 +1,194 @@
+import collections
+import json
+import threading
+import time
+
+import pydantic
+from sqlalchemy import event, orm
+
+from app.core.config import settings
+
+_MISSING = object()
+_INVALIDATE_KEY = "cache_invalidate_on_commit"
+
+
+class LRUBackend:
+    """Кэш в памяти процесса: вытесняет давно не использованные записи, записи живут ttl секунд"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return _MISSING
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisBackend:
+    """Внешний кэш в Redis, общий для всех процессов; значения хранятся в JSON"""
+
+    def __init__(self, url: str, ttl: float = 60, prefix: str = "task-tracker:"):
+        import redis
+
+        self.ttl = ttl
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str):
+        raw = self._client.get(self.prefix + key)
+        return _MISSING if raw is None else json.loads(raw)
+
+    def set(self, key: str, value):
+        self._client.set(self.prefix + key, json.dumps(value), ex=max(1, int(self.ttl)))
+
+    def delete(self, *keys: str):
+        if keys:
+            self._client.delete(*(self.prefix + key for key in keys))
+
+    def clear(self):
+        keys = list(self._client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self._client.delete(*keys)
+
+
+class NullBackend:
+    """Кэширование отключено"""
+
+    def get(self, key: str):
+        return _MISSING
+
+    def set(self, key: str, value):
+        pass
+
+    def delete(self, *keys: str):
+        pass
+
+    def clear(self):
+        pass
+
+
+class ResponseCache:
+    """Read-through кэш сериализованных ответов со счетчиками попаданий и промахов по пространствам имен.
+
+    Для ключей, которые сейчас загружаются, хранится поколение: сброс ключа его увеличивает, и загрузка,
+    начатая до сброса, свой результат в кэш не кладет.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._stats = collections.defaultdict(lambda: {"hits": 0, "misses": 0})
+        self._loading = collections.Counter()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, cache_key: str, loader, store: bool = True):
+        """Вернуть значение из кэша или загрузить его через loader и сохранить, если store"""
+        value = self.backend.get(cache_key)
+        self._count(cache_key, "hits" if value is not _MISSING else "misses")
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            self._loading[cache_key] += 1
+            generation = self._generations.get(cache_key, 0)
+        try:
+            value = loader()
+            with self._lock:
+                if store and self._generations.get(cache_key, 0) == generation:
+                    self.backend.set(cache_key, value)
+        finally:
+            with self._lock:
+                self._loading[cache_key] -= 1
+                if not self._loading[cache_key]:
+                    del self._loading[cache_key]
+                    self._generations.pop(cache_key, None)
+        return value
+
+    def invalidate(self, *keys: str):
+        with self._lock:
+            for cache_key in keys:
+                if cache_key in self._loading:
+                    self._generations[cache_key] = self._generations.get(cache_key, 0) + 1
+        self.backend.delete(*keys)
+
+    def clear(self):
+        self.backend.clear()
+        with self._lock:
+            self._stats.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {namespace: dict(counters) for namespace, counters in self._stats.items()}
+
+    def _count(self, cache_key: str, counter: str):
+        namespace = cache_key.split(":", 1)[0]
+        with self._lock:
+            self._stats[namespace][counter] += 1
+
+
+def key(namespace: str, *parts) -> str:
+    """Ключ кэша вида namespace:part1:part2; namespace используется в статистике"""
+    return ":".join([namespace, *map(str, parts)])
+
+
+def serialize(schema: type[pydantic.BaseModel], objects) -> list:
+    """Сериализовать ORM-объекты в JSON-совместимые словари для хранения в кэше"""
+    return [schema.model_validate(obj).model_dump(mode="json", by_alias=True) for obj in objects]
+
+
+def invalidate_on_commit(data_base: orm.Session, *keys: str):
+    """Сбросить ключи сразу и еще раз после коммита транзакции, чтобы не закэшировать данные до записи"""
+    cache.invalidate(*keys)
+    data_base.info.setdefault(_INVALIDATE_KEY, set()).update(keys)
+
+
+def _invalidate_after_commit(session: orm.Session):
+    keys = session.info.pop(_INVALIDATE_KEY, None)
+    if keys:
+        cache.invalidate(*keys)
+
+
+def _discard_after_rollback(session: orm.Session):
+    session.info.pop(_INVALIDATE_KEY, None)
+
+
+def build_backend():
+    if settings.CACHE_BACKEND == "redis":
+        return RedisBackend(settings.CACHE_URL, ttl=settings.CACHE_TTL_SECONDS)
+    if settings.CACHE_BACKEND == "none":
+        return NullBackend()
+    return LRUBackend(max_entries=settings.CACHE_MAX_ENTRIES, ttl=settings.CACHE_TTL_SECONDS)
+
+
+cache = ResponseCache(build_backend())
+
+event.listen(orm.Session, "after_commit", _invalidate_after_commit)
+event.listen(orm.Session, "after_rollback", _discard_after_rollback)
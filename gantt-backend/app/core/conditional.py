@@ -0,0 +1,32 @@
+import fastapi
+
+
+def make_etag(kind: str, obj_id: int, version: int, variant: str | None = None) -> str:
+    """Слабый ETag списка по версии стрима или проекта"""
+    tag = f"{kind}-{obj_id}-v{version}"
+    if variant:
+        tag = f"{tag}-{variant}"
+    return f'W/"{tag}"'
+
+
+def _opaque_tag(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def is_not_modified(request: fastapi.Request, etag: str) -> bool:
+    """Совпадает ли ETag с заголовком If-None-Match (слабое сравнение)"""
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    if "*" in candidates:
+        return True
+
+    return _opaque_tag(etag) in {_opaque_tag(candidate) for candidate in candidates}
+
+
+def not_modified_response(etag: str) -> fastapi.Response:
+    """Ответ 304 Not Modified без тела"""
+    return fastapi.Response(status_code=fastapi.status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -7,7 +7,35 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_DAYS: int = 30
+    TOKEN_CACHE_SIZE: int = 4096
+    PASSWORD_HASH_ROUNDS: int = 29000
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_LIMIT: int = 64
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: str | None = None
+    READ_DATABASE_URL: str | None = None
+    READ_AFTER_WRITE_SECONDS: int = 5
+    DB_POOL_SIZE: int = 5
+    DB_POOL_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+    DB_POOL_WAIT_WARNING_MS: int = 100
+    CACHE_BACKEND: str = "memory"
+    CACHE_URL: str | None = None
+    CACHE_TTL_SECONDS: int = 60
+    CACHE_MAX_ENTRIES: int = 1024
+    HIERARCHY_TTL_SECONDS: int = 30
+    HIERARCHY_BROADCAST: str = "local"
+    USER_CACHE_TTL_SECONDS: int = 10
+    USER_CACHE_MAX_ENTRIES: int = 4096
+    SCHEMA_CHECK_ON_STARTUP: bool = False
+    REMINDER_SCAN_INTERVAL_MINUTES: int = 15
+    REMINDER_WINDOW_MINUTES: int = 60
+    SQL_TIMING_ENABLED: bool = True
+    SQL_SLOW_REQUEST_MS: int = 500
+    SQL_SLOW_QUERY_MS: int = 100
+    METRICS_TOKEN: str | None = None
 
     model_config = {
         "env_file": "../.env",
@@ -1,16 +1,133 @@
+import fastapi
 import sqlalchemy
 from sqlalchemy import orm
+from sqlalchemy.ext import asyncio
 
+from app.core import pool, replica, sql_timing, versioning  # noqa: F401  versioning регистрирует обработчики версий стримов и проектов
 from app.core.config import settings
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+READ_DATABASE_URL = settings.READ_DATABASE_URL
 
-engine = sqlalchemy.create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = orm.sessionmaker(autocommit=False, autoflush=False, bind=engine)
+_ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
 
-def get_db():
+
+def async_database_url(url: str) -> str:
+    """Тот же URL базы с асинхронным драйвером: asyncpg для PostgreSQL, aiosqlite для SQLite"""
+    parsed = sqlalchemy.make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        return url
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or async_database_url(SQLALCHEMY_DATABASE_URL)
+
+engine = sqlalchemy.create_engine(SQLALCHEMY_DATABASE_URL, **pool.engine_options(SQLALCHEMY_DATABASE_URL))
+# Коммит один на запрос в конце сервиса; без expire_on_commit ответ сериализуется из уже загруженных объектов,
+# а не перечитывает каждую строку после коммита
+SessionLocal = orm.sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+async_engine = asyncio.create_async_engine(ASYNC_DATABASE_URL,
+                                           **pool.engine_options(ASYNC_DATABASE_URL, pool.MonitoredAsyncQueuePool))
+AsyncSessionLocal = asyncio.async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Без READ_DATABASE_URL чтение идет с основной базы
+if READ_DATABASE_URL:
+    read_engine = sqlalchemy.create_engine(READ_DATABASE_URL, **pool.engine_options(READ_DATABASE_URL))
+    ReadSessionLocal = orm.sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=read_engine)
+
+    ASYNC_READ_DATABASE_URL = async_database_url(READ_DATABASE_URL)
+    async_read_engine = asyncio.create_async_engine(
+        ASYNC_READ_DATABASE_URL, **pool.engine_options(ASYNC_READ_DATABASE_URL, pool.MonitoredAsyncQueuePool))
+    AsyncReadSessionLocal = asyncio.async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+else:
+    read_engine, ReadSessionLocal = engine, SessionLocal
+    async_read_engine, AsyncReadSessionLocal = async_engine, AsyncSessionLocal
+
+for _engine in (engine, async_engine.sync_engine, read_engine, async_read_engine.sync_engine):
+    sql_timing.instrument(_engine)
+
+
+def engines() -> dict[str, sqlalchemy.Engine]:
+    """Движки по назначению; без реплики читающие движки совпадают с основными и не повторяются"""
+    named = {}
+    for name, named_engine in (("primary", engine), ("async", async_engine.sync_engine),
+                               ("read", read_engine), ("async_read", async_read_engine.sync_engine)):
+        if all(named_engine is not other for other in named.values()):
+            named[name] = named_engine
+    return named
+
+
+def _user_id(request: fastapi.Request):
+    return getattr(request.state, "user_id", None)
+
+
+def get_db(request: fastapi.Request):
     db = SessionLocal()
+    replica.bind_user(db, _user_id(request))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_read_db(request: fastapi.Request):
+    """Сессия для чтения: реплика, если пользователь ничего не записывал последние несколько секунд"""
+    session_factory = SessionLocal if replica.wrote_recently(_user_id(request)) else ReadSessionLocal
+    db = session_factory()
+    if session_factory is not SessionLocal:
+        replica.mark_replica(db)
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_read_db(request: fastapi.Request):
+    """Асинхронная сессия для чтения с тем же правилом выбора реплики"""
+    session_factory = AsyncSessionLocal if replica.wrote_recently(_user_id(request)) else AsyncReadSessionLocal
+    async with session_factory() as db:
+        if session_factory is not AsyncSessionLocal:
+            replica.mark_replica(db.sync_session)
+        yield db
+
+
+def read_db_at_version(read_db: orm.Session, data_base: orm.Session, version_func, *args, version):
+    """Сессия для тела ответа с версией version, прочитанной с основной базы.
+
+    Реплика подходит, только если уже видит эту версию: иначе клиент получил бы старые данные под новым ETag.
+    """
+    if replica.is_replica(read_db) and version_func(read_db, *args) == version:
+        return read_db
+    return data_base
+
+
+async def async_read_db_at_version(read_db: asyncio.AsyncSession, data_base: asyncio.AsyncSession, version_func,
+                                   *args, version):
+    """Асинхронный вариант read_db_at_version"""
+    if replica.is_replica(read_db.sync_session) and await run_sync(read_db, version_func, *args) == version:
+        return read_db
+    return data_base
+
+
+async def run_sync(data_base: asyncio.AsyncSession, func, *args, schema=None):
+    """Выполнить синхронную функцию сервиса на асинхронной сессии.
+
+    Если задана схема, результат сериализуется внутри вызова, пока ленивые связи ORM-объектов
+    еще можно дозагрузить через асинхронный драйвер.
+    """
+    def call(session: orm.Session):
+        result = func(session, *args)
+        if schema is None:
+            return result
+        if isinstance(result, list):
+            return [schema.model_validate(item, from_attributes=True) for item in result]
+        return schema.model_validate(result, from_attributes=True)
+
+    return await data_base.run_sync(call)
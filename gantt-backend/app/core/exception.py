@@ -8,3 +8,15 @@ class ConflictError(Exception):
 
 class ForbiddenError(Exception):
     """Нет прав доступа"""
+
+
+class ValidationError(Exception):
+    """Некорректные входные данные"""
+
+
+class UnavailableError(Exception):
+    """Сервис временно перегружен"""
+
+
+class SchemaOutdatedError(Exception):
+    """Схема базы не соответствует миграциям"""
@@ -0,0 +1,164 @@
+import json
+import threading
+import time
+import uuid
+
+from sqlalchemy import event, orm
+
+from app.core.config import settings
+
+_INVALIDATE_KEY = "hierarchy_invalidate_on_commit"
+
+
+class LocalBroadcaster:
+    """Рассылка инвалидаций внутри одного процесса; подходит для одного воркера и для тестов"""
+
+    def __init__(self):
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+
+    def publish(self, message: dict):
+        for callback in list(self._subscribers):
+            callback(message)
+
+
+class RedisBroadcaster:
+    """Рассылка инвалидаций между воркерами через канал Redis pub/sub"""
+
+    def __init__(self, url: str, channel: str = "task-tracker:hierarchy"):
+        import redis
+
+        self.channel = channel
+        self._client = redis.Redis.from_url(url)
+        self._subscribers = []
+        self._listener = None
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+        if self._listener is None:
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.channel: self._dispatch})
+            self._listener = pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    def publish(self, message: dict):
+        self._client.publish(self.channel, json.dumps(message))
+
+    def _dispatch(self, raw):
+        message = json.loads(raw["data"])
+        for callback in list(self._subscribers):
+            callback(message)
+
+
+class HierarchyIndex:
+    """Индекс stream -> project -> team и ролей (user, team) в памяти процесса с TTL.
+
+    Запоминаются только найденные связи, поэтому отсутствие доступа всегда перепроверяется в базе.
+    Изменения сбрасывают записи локально и рассылаются другим воркерам через broadcaster.
+    """
+
+    def __init__(self, ttl: float = 30, broadcaster=None):
+        self.ttl = ttl
+        self.origin = uuid.uuid4().hex
+        self._streams = {}
+        self._projects = {}
+        self._memberships = {}
+        self._lock = threading.Lock()
+        self.broadcaster = broadcaster or LocalBroadcaster()
+        self.broadcaster.subscribe(self._on_message)
+
+    def get_stream_project(self, stream_id: int):
+        return self._get(self._streams, stream_id)
+
+    def get_project_team(self, project_id: int):
+        return self._get(self._projects, project_id)
+
+    def get_role(self, user_id: int, team_id: int):
+        return self._get(self._memberships, (user_id, team_id))
+
+    def remember_stream(self, stream_id: int, project_id: int):
+        self._set(self._streams, stream_id, project_id)
+
+    def remember_project(self, project_id: int, team_id: int):
+        self._set(self._projects, project_id, team_id)
+
+    def remember_role(self, user_id: int, team_id: int, role_id: int):
+        self._set(self._memberships, (user_id, team_id), role_id)
+
+    def invalidate(self, kind: str, *ids):
+        """Сбросить записи локально и разослать сообщение остальным воркерам"""
+        self._apply(kind, ids)
+        self.broadcaster.publish({"origin": self.origin, "kind": kind, "ids": list(ids)})
+
+    def clear(self):
+        with self._lock:
+            self._streams.clear()
+            self._projects.clear()
+            self._memberships.clear()
+
+    def _on_message(self, message: dict):
+        if message.get("origin") != self.origin:
+            self._apply(message["kind"], message["ids"])
+
+    def _apply(self, kind: str, ids):
+        with self._lock:
+            if kind == "stream":
+                self._streams.pop(ids[0], None)
+            elif kind == "project":
+                self._drop_project(ids[0])
+            elif kind == "membership":
+                self._memberships.pop(tuple(ids), None)
+            elif kind == "team":
+                for project_id in [p for p, (team_id, _) in self._projects.items() if team_id == ids[0]]:
+                    self._drop_project(project_id)
+                for key in [key for key in self._memberships if key[1] == ids[0]]:
+                    del self._memberships[key]
+
+    def _drop_project(self, project_id: int):
+        self._projects.pop(project_id, None)
+        for stream_id in [s for s, (p, _) in self._streams.items() if p == project_id]:
+            del self._streams[stream_id]
+
+    def _get(self, entries: dict, key):
+        with self._lock:
+            entry = entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del entries[key]
+                return None
+            return value
+
+    def _set(self, entries: dict, key, value):
+        with self._lock:
+            entries[key] = (value, time.monotonic() + self.ttl)
+
+
+def invalidate_on_commit(data_base: orm.Session, kind: str, *ids):
+    """Сбросить записи индекса сразу и еще раз после коммита транзакции"""
+    index.invalidate(kind, *ids)
+    data_base.info.setdefault(_INVALIDATE_KEY, []).append((kind, ids))
+
+
+def _invalidate_after_commit(session: orm.Session):
+    for kind, ids in session.info.pop(_INVALIDATE_KEY, []):
+        index.invalidate(kind, *ids)
+
+
+def _discard_after_rollback(session: orm.Session):
+    session.info.pop(_INVALIDATE_KEY, None)
+
+
+def build_broadcaster():
+    if settings.HIERARCHY_BROADCAST == "redis":
+        return RedisBroadcaster(settings.CACHE_URL)
+    return LocalBroadcaster()
+
+
+index = HierarchyIndex(ttl=settings.HIERARCHY_TTL_SECONDS, broadcaster=build_broadcaster())
+
+event.listen(orm.Session, "after_commit", _invalidate_after_commit)
+event.listen(orm.Session, "after_rollback", _discard_after_rollback)
@@ -0,0 +1,147 @@
+import bisect
+import threading
+import time
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Верхние границы корзин гистограммы задержек, секунды
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Пути без маршрута (404) сводятся в одну метку, чтобы сканеры не раздували число рядов
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RouteMetrics:
+    """Счетчики одного маршрута: ответы по статусам и гистограмма задержек"""
+
+    __slots__ = ("statuses", "buckets", "total", "count")
+
+    def __init__(self):
+        self.statuses = {}
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, status: int, duration: float):
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, duration)] += 1
+        self.total += duration
+        self.count += 1
+
+
+class Registry:
+    """Метрики процесса.
+
+    Счетчики HTTP меняет только MetricsMiddleware в потоке event loop, поэтому они обходятся без блокировок;
+    объект маршрута создается при первом запросе к нему, дальше запрос только увеличивает счетчики.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.routes = {}
+        self.in_flight = 0
+        with self._lock:
+            self.push_deliveries = {"sent": 0, "failed": 0}
+
+    def route(self, method: str, path: str) -> RouteMetrics:
+        by_path = self.routes.get(method)
+        if by_path is None:
+            by_path = self.routes[method] = {}
+        route_metrics = by_path.get(path)
+        if route_metrics is None:
+            route_metrics = by_path[path] = RouteMetrics()
+        return route_metrics
+
+    def record_push(self, outcome: str):
+        """Учесть результат отправки push; вызывается из потоков планировщика"""
+        with self._lock:
+            self.push_deliveries[outcome] = self.push_deliveries.get(outcome, 0) + 1
+
+
+registry = Registry()
+
+
+class MetricsMiddleware:
+    """ASGI-middleware: число запросов, задержки по маршрутам и запросы в обработке"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        registry.in_flight += 1
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            registry.in_flight -= 1
+            route = scope.get("route")
+            path = getattr(route, "path", UNMATCHED_ROUTE)
+            registry.route(scope["method"], path).observe(status_code, time.perf_counter() - start)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def family(name: str, kind: str, help_text: str, samples) -> list[str]:
+    """Строки одной метрики в текстовом формате Prometheus; samples — пары (метки, значение)"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines.extend(f"{name}{_labels(labels)} {value}" for labels, value in samples)
+    return lines
+
+
+def _http_lines() -> list[str]:
+    requests, histogram = [], []
+    for method, by_path in list(registry.routes.items()):
+        for path, route_metrics in list(by_path.items()):
+            labels = {"method": method, "route": path}
+            requests.extend(({**labels, "status": status}, count) for status, count in sorted(route_metrics.statuses.items()))
+
+            cumulative = 0
+            for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), route_metrics.buckets, strict=True):
+                cumulative += count
+                histogram.append(f"http_request_duration_seconds_bucket{_labels({**labels, 'le': bound})} {cumulative}")
+            histogram.append(f"http_request_duration_seconds_sum{_labels(labels)} {route_metrics.total}")
+            histogram.append(f"http_request_duration_seconds_count{_labels(labels)} {route_metrics.count}")
+
+    return [
+        *family("http_requests_total", "counter", "Обработанные HTTP-запросы", requests),
+        "# HELP http_request_duration_seconds Время обработки HTTP-запроса",
+        "# TYPE http_request_duration_seconds histogram",
+        *histogram,
+        *family("http_requests_in_flight", "gauge", "HTTP-запросы в обработке", [(None, registry.in_flight)]),
+    ]
+
+
+def render(extra_lines: list[str] = ()) -> str:
+    """Все метрики процесса в текстовом формате Prometheus"""
+    with registry._lock:
+        push = sorted(registry.push_deliveries.items())
+    lines = [
+        *_http_lines(),
+        *family("push_deliveries_total", "counter", "Отправки push-уведомлений по результату",
+                [({"outcome": outcome}, count) for outcome, count in push]),
+        *extra_lines,
+    ]
+    return "\n".join(lines) + "\n"
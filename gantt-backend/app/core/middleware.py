@@ -1,5 +1,6 @@
 import fastapi
 import jose
+from starlette import datastructures
 
 from app.core import security
 
@@ -12,32 +13,64 @@ EXEMPT_PATHS = {
     "/api/taskStatuses",
     "/api/priorities",
     "/api/connectionTypes",
+    # Prometheus ходит без JWT, со своим токеном METRICS_TOKEN; без него эндпоинт выключен
+    "/metrics",
 }
 
+# Вложенные пути без авторизации; префикс заканчивается на "/", чтобы не задеть соседние пути вроде /docsX
+EXEMPT_PREFIXES = (
+    "/docs/",
+)
 
-async def auth_middleware(request: fastapi.Request, call_next):
-    path = request.url.path
 
-    if any(path.startswith(p) for p in EXEMPT_PATHS):
-        return await call_next(request)
+def is_exempt_path(path: str) -> bool:
+    """Не требует ли путь авторизации"""
+    return path in EXEMPT_PATHS or path.startswith(EXEMPT_PREFIXES)
 
-    auth_header = request.headers.get("Authorization")
+
+def _unauthorized(detail: str) -> fastapi.responses.JSONResponse:
+    return fastapi.responses.JSONResponse(status_code=401, content={"detail": detail})
+
+
+def authenticate(auth_header: str | None):
+    """Проверить заголовок Authorization; вернуть (user_id, None) или (None, ответ 401)"""
     if not auth_header or not auth_header.startswith("Bearer "):
-        return fastapi.responses.JSONResponse(status_code=401, content={"detail": "Отсутствует токен авторизации"})
+        return None, _unauthorized("Отсутствует токен авторизации")
 
     token = auth_header.split(" ", 1)[1]
 
     try:
-        payload = security.decode_access_token(token)
+        payload = security.decode_access_token_cached(token)
     except jose.JWTError:
-        return fastapi.responses.JSONResponse(status_code=401,
-                                              content={"detail": "Недействительный или просроченный токен"})
+        return None, _unauthorized("Недействительный или просроченный токен")
 
     user_id = payload.get("sub")
 
     if not user_id:
-        return fastapi.responses.JSONResponse(status_code=401, content={"detail": "Некорректный токен"})
+        return None, _unauthorized("Некорректный токен")
+
+    return int(user_id), None
+
+
+class AuthMiddleware:
+    """ASGI-middleware авторизации: кладет user_id из JWT в request.state.
+
+    Работает напрямую с ASGI-вызовом, без BaseHTTPMiddleware, поэтому не создает
+    лишних задач и не оборачивает потоковые ответы.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or is_exempt_path(scope["path"]):
+            await self.app(scope, receive, send)
+            return
 
-    request.state.user_id = int(user_id)
+        user_id, error_response = authenticate(datastructures.Headers(scope=scope).get("Authorization"))
+        if error_response is not None:
+            await error_response(scope, receive, send)
+            return
 
-    return await call_next(request)
+        scope.setdefault("state", {})["user_id"] = user_id
+        await self.app(scope, receive, send)
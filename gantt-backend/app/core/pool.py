@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+
+import sqlalchemy
+from sqlalchemy import exc, pool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Одно и то же предупреждение пишется в лог не чаще раза в интервал, чтобы не засыпать лог под нагрузкой
+WARNING_INTERVAL_SECONDS = 60
+
+
+class PoolStats:
+    """Счетчики выдачи соединений из пула: число выдач, таймаутов и время ожидания"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self._warned_at = {}
+
+    def record_checkout(self, wait: float):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def should_warn(self, kind: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            last = self._warned_at.get(kind)
+            if last is not None and now - last < WARNING_INTERVAL_SECONDS:
+                return False
+            self._warned_at[kind] = now
+            return True
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": self.wait_total / self.checkouts * 1000 if self.checkouts else 0.0,
+                "wait_max_ms": self.wait_max * 1000,
+            }
+
+
+class MonitoredQueuePool(pool.QueuePool):
+    """QueuePool, который замеряет ожидание соединения и предупреждает о насыщении пула.
+
+    У каждого пула свои счетчики и свой лимит частоты предупреждений.
+    """
+
+    def __init__(self, creator, pool_size: int = 5, max_overflow: int = 10, **kw):
+        super().__init__(creator, pool_size=pool_size, max_overflow=max_overflow, **kw)
+        self.max_overflow = max_overflow
+        self.stats = PoolStats()
+
+    def recreate(self):
+        # Пул пересоздается при dispose() движка; счетчики переходят в новый пул
+        new_pool = super().recreate()
+        new_pool.stats = self.stats
+        return new_pool
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            self._warn("timeout", "Пул соединений исчерпан: ожидание дольше %s с (%s)", self.timeout(), self.status())
+            raise
+
+        wait = time.perf_counter() - start
+        self.stats.record_checkout(wait)
+
+        if wait * 1000 >= settings.DB_POOL_WAIT_WARNING_MS:
+            self._warn("wait", "Ожидание соединения из пула %.0f мс (%s)", wait * 1000, self.status())
+        if self.overflow() > 0:
+            self._warn("overflow", "Пул соединений работает сверх pool_size: %s", self.status())
+        if self.max_overflow >= 0 and self.checkedout() >= self.size() + self.max_overflow:
+            self._warn("saturated", "Выданы все соединения пула: %s", self.status())
+
+        return connection
+
+    def _warn(self, kind: str, message: str, *args):
+        if self.stats.should_warn(kind):
+            logger.warning(message, *args)
+
+
+class MonitoredAsyncQueuePool(MonitoredQueuePool, pool.AsyncAdaptedQueuePool):
+    """MonitoredQueuePool для асинхронного движка"""
+
+
+def engine_options(url: str, poolclass: type[pool.QueuePool] = MonitoredQueuePool) -> dict:
+    """Параметры пула для create_engine из настроек"""
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+    parsed = sqlalchemy.make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # SQLite в памяти живет в одном соединении на поток, размер пула к нему неприменим
+        return options
+
+    options.update(
+        poolclass=poolclass,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    return options
+
+
+def pool_status(engine_pool: pool.Pool) -> dict:
+    """Текущее состояние пула и накопленные счетчики"""
+    status = {"pool_class": type(engine_pool).__name__, "size": None, "checked_out": None,
+              "checked_in": None, "overflow": None, "max_overflow": None}
+
+    if isinstance(engine_pool, pool.QueuePool):
+        status.update(
+            size=engine_pool.size(),
+            checked_out=engine_pool.checkedout(),
+            checked_in=engine_pool.checkedin(),
+            overflow=max(engine_pool.overflow(), 0),
+            max_overflow=getattr(engine_pool, "max_overflow", None),
+        )
+
+    # У пулов без учета (SQLite в памяти) счетчики нулевые
+    status.update(getattr(engine_pool, "stats", PoolStats()).snapshot())
+    return status
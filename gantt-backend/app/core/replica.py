@@ -0,0 +1,47 @@
+from sqlalchemy import event, orm
+
+from app.core import cache
+from app.core.config import settings
+
+_USER_KEY = "replica_user_id"
+_REPLICA_KEY = "replica_read"
+
+
+def build_backend():
+    """Отметки о недавних записях; с Redis они общие для всех воркеров"""
+    if settings.CACHE_BACKEND == "redis":
+        return cache.RedisBackend(settings.CACHE_URL, ttl=settings.READ_AFTER_WRITE_SECONDS,
+                                  prefix="task-tracker:recent-write:")
+    return cache.LRUBackend(max_entries=settings.CACHE_MAX_ENTRIES, ttl=settings.READ_AFTER_WRITE_SECONDS)
+
+
+recent_writes = build_backend()
+
+
+def bind_user(data_base: orm.Session, user_id: int | None):
+    """Связать сессию с пользователем, чтобы после его коммита читать с основной базы"""
+    data_base.info[_USER_KEY] = user_id
+
+
+def mark_replica(data_base: orm.Session):
+    """Отметить сессию, читающую с реплики: ее данные могут отставать и не попадают в общие кэши"""
+    data_base.info[_REPLICA_KEY] = True
+
+
+def is_replica(data_base: orm.Session) -> bool:
+    """Читает ли сессия с реплики"""
+    return data_base.info.get(_REPLICA_KEY, False)
+
+
+def wrote_recently(user_id: int | None) -> bool:
+    """Был ли у пользователя коммит за последние READ_AFTER_WRITE_SECONDS секунд"""
+    return user_id is not None and recent_writes.get(str(user_id)) is True
+
+
+def _remember_write(session: orm.Session):
+    user_id = session.info.get(_USER_KEY)
+    if user_id is not None:
+        recent_writes.set(str(user_id), True)
+
+
+event.listen(orm.Session, "after_commit", _remember_write)
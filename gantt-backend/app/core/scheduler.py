@@ -1,29 +1,53 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from app.core.config import settings
 from app.core.db import SessionLocal
 from app.crud import reminder as reminder_crud
 from app.services import push_service
 
+SCAN_JOB_ID = "reminders-scan"
+
 scheduler = AsyncIOScheduler()
 
 
+def schedule_upcoming_reminders():
+    """Поставить в планировщик неотправленные напоминания, срок которых наступает в ближайшее окно.
+
+    Окно берется не короче двух интервалов просмотра: даже если следующий просмотр запустится с опозданием
+    до одного интервала, напоминание не проскочит между просмотрами.
+    """
+    now = datetime.utcnow()
+    window = timedelta(minutes=max(settings.REMINDER_WINDOW_MINUTES, 2 * settings.REMINDER_SCAN_INTERVAL_MINUTES))
+
+    db = SessionLocal()
+    try:
+        reminders = reminder_crud.get_pending_reminders(db, since=now, until=now + window)
+    finally:
+        db.close()
+
+    for r in reminders:
+        scheduler.add_job(
+            push_service.send_push,
+            "date",
+            run_date=r.remind_at,
+            args=[r.id],
+            id=str(r.id),
+            replace_existing=True
+        )
+
+
 def start_scheduler():
     if scheduler.running:
         return
 
     scheduler.start()
 
-    db = SessionLocal()
-    reminders = reminder_crud.get_pending_reminders(db)
-
-    for r in reminders:
-        if r.remind_at > datetime.utcnow():
-            scheduler.add_job(
-                push_service.send_push,
-                "date",
-                run_date=r.remind_at,
-                args=[r.id],
-                id=str(r.id)
-            )
-
-    db.close()
\ No newline at end of file
+    # Первый просмотр выполняется в пуле потоков планировщика уже после старта и не задерживает готовность воркера
+    scheduler.add_job(
+        schedule_upcoming_reminders,
+        "interval",
+        minutes=settings.REMINDER_SCAN_INTERVAL_MINUTES,
+        next_run_time=datetime.now(),
+        id=SCAN_JOB_ID,
+        replace_existing=True
+    )
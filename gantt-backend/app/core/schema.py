@@ -0,0 +1,31 @@
+import logging
+from pathlib import Path
+
+import sqlalchemy
+
+from app.core import exception
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).parents[2] / "alembic.ini"
+
+
+def check_schema(engine: sqlalchemy.Engine):
+    """Проверить, что база обновлена до последней миграции.
+
+    Alembic импортируется только здесь: проверка включается настройкой SCHEMA_CHECK_ON_STARTUP
+    и при обычном старте не нужна.
+    """
+    from alembic.config import Config
+    from alembic.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    expected = set(ScriptDirectory.from_config(Config(str(ALEMBIC_INI))).get_heads())
+    with engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+
+    if current != expected:
+        logger.error("Схема базы не соответствует миграциям: в базе %s, ожидается %s",
+                     sorted(current) or "нет ревизии", sorted(expected))
+        raise exception.SchemaOutdatedError(
+            f"Схема базы устарела ({', '.join(sorted(current)) or 'нет ревизии'}), выполните alembic upgrade head")
@@ -1,11 +1,26 @@
+import asyncio
+import collections
 import datetime
+import multiprocessing
+import threading
+import time
+from concurrent import futures
+from concurrent.futures import process
 
 from jose import jwt
 from passlib.context import CryptContext
 
+from app.core import exception
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# Хеши с другим числом раундов считаются устаревшими и пересчитываются при входе
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    deprecated="auto",
+    pbkdf2_sha256__default_rounds=settings.PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__min_rounds=settings.PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__max_rounds=settings.PASSWORD_HASH_ROUNDS,
+)
 
 
 def get_password_hash(password: str) -> str:
@@ -18,6 +33,68 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str):
+    """Проверка пароля; вернуть (верен ли пароль, новый хеш или None, если пересчет не нужен)"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class PasswordHasher:
+    """Хеширование паролей в отдельном пуле процессов.
+
+    Не занимает потоки AnyIO, на которых выполняются синхронные эндпоинты. Число задач в работе
+    и в очереди ограничено: при переполнении запрос сразу отклоняется, а не ждет. Воркеры запускаются
+    через forkserver (spawn, где его нет): fork многопоточного сервера может зависнуть на чужой блокировке.
+    """
+
+    def __init__(self, workers: int = 2, queue_limit: int = 64):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str):
+        return await self._run(verify_and_update_password, plain_password, hashed_password)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, func, *args):
+        with self._lock:
+            if self._in_flight >= self.workers + self.queue_limit:
+                raise exception.UnavailableError("Сервер перегружен, повторите попытку позже")
+            self._in_flight += 1
+            if self._executor is None:
+                self._executor = futures.ProcessPoolExecutor(max_workers=self.workers, mp_context=_mp_context())
+            executor = self._executor
+
+        try:
+            return await asyncio.wrap_future(executor.submit(func, *args))
+        except process.BrokenProcessPool:
+            # упавший воркер ломает весь пул; следующий вызов создаст новый
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_LIMIT)
+
+
 def create_access_token(data: dict) -> str:
     """Создание JWT токена"""
     to_encode = data.copy()
@@ -30,3 +107,53 @@ def create_access_token(data: dict) -> str:
 def decode_access_token(token: str) -> dict:
     """Проверка и декодирование токена"""
     return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+
+class TokenCache:
+    """Ограниченный LRU-кэш проверенных токенов; запись живет не дольше срока действия токена (exp)"""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+
+            claims, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[token]
+                return None
+
+            self._entries.move_to_end(token)
+            return dict(claims)
+
+    def set(self, token: str, claims: dict):
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)) or self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[token] = (dict(claims), expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE)
+
+
+def decode_access_token_cached(token: str) -> dict:
+    """Декодирование токена с кэшем уже проверенных подписей; невалидные токены не кэшируются"""
+    claims = token_cache.get(token)
+    if claims is None:
+        claims = decode_access_token(token)
+        token_cache.set(token, claims)
+    return claims
@@ -0,0 +1,131 @@
+import contextvars
+import logging
+import time
+
+import sqlalchemy
+from sqlalchemy import event
+from starlette import datastructures
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_START_KEY = "sql_timing_start"
+
+
+class RequestStats:
+    """SQL-запросы одного HTTP-запроса: число, суммарное время и самый медленный запрос"""
+
+    __slots__ = ("queries", "duration", "slowest", "slowest_statement")
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+        self.slowest = 0.0
+        self.slowest_statement = None
+
+    def record(self, statement: str, duration: float):
+        self.queries += 1
+        self.duration += duration
+        if duration > self.slowest:
+            self.slowest = duration
+            self.slowest_statement = statement
+
+    def server_timing(self) -> str:
+        return (f'db;dur={self.duration * 1000:.1f};desc="{self.queries} queries", '
+                f"db-slowest;dur={self.slowest * 1000:.1f}")
+
+
+# Синхронные эндпоинты и зависимости выполняются в пуле потоков с копией контекста, поэтому видят тот же объект
+current = contextvars.ContextVar("sql_timing_current", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current.get() is not None:
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current.get()
+    starts = conn.info.get(_START_KEY)
+    if stats is None or not starts:
+        return
+
+    duration = time.perf_counter() - starts.pop()
+    stats.record(statement, duration)
+    if duration * 1000 >= settings.SQL_SLOW_QUERY_MS:
+        logger.warning("Медленный SQL-запрос %.1f мс: %s", duration * 1000, statement)
+
+
+def _handle_error(exception_context):
+    # После ошибки after_cursor_execute не вызывается: убираем отметку, иначе она останется
+    # на соединении в пуле и достанется следующему запросу
+    conn = exception_context.connection
+    starts = conn.info.get(_START_KEY) if conn is not None else None
+    if starts:
+        starts.pop()
+
+
+def instrument(engine: sqlalchemy.Engine):
+    """Подключить учет SQL-запросов к движку; повторный вызов для того же движка ничего не меняет"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+class SQLTimingMiddleware:
+    """ASGI-middleware: считает SQL-запросы каждого HTTP-запроса.
+
+    Итог отдается в заголовке Server-Timing и пишется в лог; запросы дольше SQL_SLOW_REQUEST_MS
+    пишутся с уровнем WARNING. У потоковых ответов заголовок уходит до конца выдачи и учитывает только
+    запросы до начала ответа, в лог попадает полный итог.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.SQL_TIMING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = datastructures.MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current.reset(token)
+            _log_request(scope, status_code, stats, time.perf_counter() - start)
+
+
+def _log_request(scope, status_code: int, stats: RequestStats, elapsed: float):
+    elapsed_ms = elapsed * 1000
+    level = logging.WARNING if elapsed_ms >= settings.SQL_SLOW_REQUEST_MS else logging.DEBUG
+    if not logger.isEnabledFor(level):
+        return
+
+    fields = {
+        "method": scope["method"],
+        "path": scope["path"],
+        "status": status_code,
+        "duration_ms": round(elapsed_ms, 1),
+        "queries": stats.queries,
+        "db_ms": round(stats.duration * 1000, 1),
+        "slowest_ms": round(stats.slowest * 1000, 1),
+        "slowest_statement": " ".join(stats.slowest_statement.split()) if stats.slowest_statement else None,
+    }
+    # Поля в виде key=value для поиска по логам и в extra для JSON-форматтеров
+    logger.log(level, "request %s", " ".join(f"{name}={value!r}" if isinstance(value, str) else f"{name}={value}"
+                                             for name, value in fields.items()), extra={"sql": fields})
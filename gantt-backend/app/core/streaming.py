@@ -0,0 +1,40 @@
+import itertools
+
+import fastapi
+import pydantic
+from sqlalchemy.ext import asyncio
+from starlette import responses
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NDJSON_ASYNC_BATCH_SIZE = 500
+
+
+def accepts_ndjson(request: fastapi.Request) -> bool:
+    """Запросил ли клиент потоковый ответ в формате NDJSON"""
+    return NDJSON_MEDIA_TYPE in request.headers.get("Accept", "")
+
+
+def ndjson_response(items, model: type[pydantic.BaseModel], headers: dict | None = None) -> responses.StreamingResponse:
+    """Сериализовать объекты по одному в строки NDJSON по мере их чтения из базы"""
+
+    def lines():
+        for item in items:
+            yield model.model_validate(item).model_dump_json(by_alias=True) + "\n"
+
+    return responses.StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+
+def ndjson_response_async(data_base: asyncio.AsyncSession, items, model: type[pydantic.BaseModel],
+                          headers: dict | None = None) -> responses.StreamingResponse:
+    """То же для асинхронной сессии: синхронный итератор читается пачками через run_sync, без потоков"""
+    items = iter(items)
+
+    def next_lines(session):
+        return "".join(model.model_validate(item).model_dump_json(by_alias=True) + "\n"
+                       for item in itertools.islice(items, NDJSON_ASYNC_BATCH_SIZE))
+
+    async def lines():
+        while chunk := await data_base.run_sync(next_lines):
+            yield chunk
+
+    return responses.StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE, headers=headers)
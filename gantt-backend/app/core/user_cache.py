@@ -0,0 +1,39 @@
+from sqlalchemy import event, orm
+
+from app.core import cache
+from app.core.config import settings
+from app.models import user
+
+_INVALIDATE_KEY = "user_cache_invalidate_on_commit"
+
+# Короткий TTL: кэш в памяти процесса не получает инвалидаций от других воркеров
+profiles = cache.ResponseCache(cache.LRUBackend(max_entries=settings.USER_CACHE_MAX_ENTRIES,
+                                                ttl=settings.USER_CACHE_TTL_SECONDS))
+
+
+def key(user_id: int) -> str:
+    return cache.key("users", user_id)
+
+
+def _forget_changed_users(session: orm.Session, flush_context):
+    """Сбросить профили измененных и удаленных пользователей сразу и еще раз после коммита"""
+    keys = {key(obj.id) for obj in (*session.dirty, *session.deleted)
+            if isinstance(obj, user.User) and obj.id is not None}
+    if keys:
+        profiles.invalidate(*keys)
+        session.info.setdefault(_INVALIDATE_KEY, set()).update(keys)
+
+
+def _invalidate_after_commit(session: orm.Session):
+    keys = session.info.pop(_INVALIDATE_KEY, None)
+    if keys:
+        profiles.invalidate(*keys)
+
+
+def _discard_after_rollback(session: orm.Session):
+    session.info.pop(_INVALIDATE_KEY, None)
+
+
+event.listen(orm.Session, "after_flush", _forget_changed_users)
+event.listen(orm.Session, "after_commit", _invalidate_after_commit)
+event.listen(orm.Session, "after_rollback", _discard_after_rollback)
@@ -0,0 +1,110 @@
+import sqlalchemy
+from sqlalchemy import event, orm
+
+from app.models import custom_field, goal, meta, tag, task
+from app.models import project as project_model
+from app.models import stream as stream_model
+
+_PENDING_KEY = "pending_version_bumps"
+
+# Объекты, изменение которых меняет содержимое стрима, и их атрибуты со ссылкой на задачу
+_TASK_CHILDREN = {
+    meta.UserTask: ("task_id",),
+    tag.TaskTag: ("task_id",),
+    task.TaskRelation: ("task_id_1", "task_id_2"),
+    custom_field.TaskCustomFieldValue: ("task_id",),
+}
+_STREAM_CHILDREN = (task.Task, goal.Goal)
+
+
+def _attribute_values(obj, attr: str):
+    """Текущее и прежнее (до изменения в этой транзакции) значения атрибута"""
+    history = orm.attributes.get_history(obj, attr)
+    values = set(history.added) | set(history.unchanged) | set(history.deleted)
+    current = getattr(obj, attr, None)
+    if current is not None:
+        values.add(current)
+    return {value for value in values if value is not None}
+
+
+def _changed_objects(session: orm.Session):
+    yield from session.new
+    yield from session.deleted
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            yield obj
+
+
+def _empty_bumps() -> dict:
+    return {"streams": set(), "tasks": set(), "projects": set(), "teams": set()}
+
+
+def _collect_version_bumps(session: orm.Session, flush_context, instances):
+    """Запомнить, версии каких стримов и проектов нужно увеличить после flush"""
+    pending = session.info.setdefault(_PENDING_KEY, _empty_bumps())
+
+    for obj in _changed_objects(session):
+        if isinstance(obj, _STREAM_CHILDREN):
+            pending["streams"] |= _attribute_values(obj, "stream_id")
+        elif isinstance(obj, tuple(_TASK_CHILDREN)):
+            for attr in _TASK_CHILDREN[type(obj)]:
+                pending["tasks"] |= _attribute_values(obj, attr)
+        elif isinstance(obj, stream_model.Stream):
+            pending["projects"] |= _attribute_values(obj, "project_id")
+        elif isinstance(obj, project_model.Project) and obj.id is not None:
+            pending["projects"].add(obj.id)
+        elif isinstance(obj, tag.Tag):
+            pending["teams"] |= _attribute_values(obj, "team_id")
+
+
+def _apply_version_bumps(session: orm.Session, flush_context):
+    """Увеличить версии затронутых стримов и их проектов в той же транзакции"""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending or not any(pending.values()):
+        return
+    _bump(session, pending)
+
+
+def bump_streams(session: orm.Session, stream_ids):
+    """Увеличить версии стримов и их проектов после записи в обход flush (массовые insert/update)"""
+    _bump(session, {**_empty_bumps(), "streams": set(stream_ids)})
+
+
+def bump_projects(session: orm.Session, project_ids):
+    """Увеличить версии проектов после записи в обход flush"""
+    _bump(session, {**_empty_bumps(), "projects": set(project_ids)})
+
+
+def _bump(session: orm.Session, pending: dict):
+    streams = stream_model.Stream.__table__
+    projects = project_model.Project.__table__
+    tasks = task.Task.__table__
+
+    team_projects = sqlalchemy.select(projects.c.id).where(projects.c.team_id.in_(pending["teams"]))
+    stream_filter = sqlalchemy.or_(
+        streams.c.id.in_(pending["streams"]),
+        streams.c.id.in_(sqlalchemy.select(tasks.c.stream_id).where(tasks.c.id.in_(pending["tasks"]))),
+        streams.c.project_id.in_(team_projects),
+    )
+    project_filter = sqlalchemy.or_(
+        projects.c.id.in_(pending["projects"]),
+        projects.c.id.in_(sqlalchemy.select(streams.c.project_id).where(stream_filter)),
+        projects.c.team_id.in_(pending["teams"]),
+    )
+
+    connection = session.connection()
+    connection.execute(streams.update().where(stream_filter).values(version=streams.c.version + 1))
+    connection.execute(projects.update().where(project_filter).values(version=projects.c.version + 1))
+
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, (stream_model.Stream, project_model.Project)) and sqlalchemy.inspect(obj).persistent:
+            session.expire(obj, ["version"])
+
+
+def _discard_version_bumps(session: orm.Session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+event.listen(orm.Session, "before_flush", _collect_version_bumps)
+event.listen(orm.Session, "after_flush", _apply_version_bumps)
+event.listen(orm.Session, "after_rollback", _discard_version_bumps)
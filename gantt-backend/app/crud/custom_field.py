@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 
+from app.core import cache
 from app.models import custom_field as custom_field_model
 from app.schemas import custom_field as custom_field_schema
 
@@ -18,8 +19,8 @@ def get_custom_field_by_team_and_name(db: Session, team_id: int, name: str):
 def create_custom_field(db: Session, team_id: int, field: custom_field_schema.CustomFieldBase):
     db_field = custom_field_model.CustomField(**field.model_dump(), team_id=team_id)
     db.add(db_field)
-    db.commit()
-    db.refresh(db_field)
+    cache.invalidate_on_commit(db, cache.key("team_custom_fields", team_id))
+    db.flush()
     return db_field
 
 
@@ -33,8 +34,8 @@ def update_custom_field(db: Session, field_id: int, field_update: custom_field_s
         update_data = field_update.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_field, key, value)
-        db.commit()
-        db.refresh(db_field)
+        cache.invalidate_on_commit(db, cache.key("team_custom_fields", db_field.team_id))
+        db.flush()
     return db_field
 
 
@@ -42,25 +43,40 @@ def delete_custom_field(db: Session, field_id: int):
     db_field = db.query(custom_field_model.CustomField).filter(custom_field_model.CustomField.id == field_id).first()
     if db_field:
         db.delete(db_field)
-        db.commit()
+        cache.invalidate_on_commit(db, cache.key("team_custom_fields", db_field.team_id))
+        db.flush()
     return db_field
 
 
-def set_task_custom_field_value(db: Session, task_id: int, field_value: custom_field_schema.TaskCustomFieldValueBase):
-    db_value = db.query(custom_field_model.TaskCustomFieldValue).filter_by(task_id=task_id,
-                                                                           custom_field_id=field_value.custom_field_id).first()
+def set_task_custom_field_values(db: Session, task_id: int,
+                                 field_values: list[custom_field_schema.TaskCustomFieldValueBase]):
+    """Записать значения кастомных полей задачи: одним запросом найти существующие, затем один flush"""
+    # Если поле передано несколько раз, действует последнее значение
+    by_field = {field_value.custom_field_id: field_value for field_value in field_values}
+    if not by_field:
+        return []
 
-    if db_value:
-        update_data = field_value.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_value, key, value)
-    else:
-        db_value = custom_field_model.TaskCustomFieldValue(task_id=task_id, **field_value.model_dump())
-        db.add(db_value)
+    existing = {
+        value.custom_field_id: value
+        for value in db.query(custom_field_model.TaskCustomFieldValue).filter(
+            custom_field_model.TaskCustomFieldValue.task_id == task_id,
+            custom_field_model.TaskCustomFieldValue.custom_field_id.in_(by_field),
+        )
+    }
 
-    db.commit()
-    db.refresh(db_value)
-    return db_value
+    db_values = []
+    for custom_field_id, field_value in by_field.items():
+        db_value = existing.get(custom_field_id)
+        if db_value:
+            for key, value in field_value.model_dump(exclude_unset=True).items():
+                setattr(db_value, key, value)
+        else:
+            db_value = custom_field_model.TaskCustomFieldValue(task_id=task_id, **field_value.model_dump())
+            db.add(db_value)
+        db_values.append(db_value)
+
+    db.flush()
+    return db_values
 
 
 def delete_task_custom_field_value(db: Session, task_id: int, custom_field_id: int):
@@ -71,5 +87,5 @@ def delete_task_custom_field_value(db: Session, task_id: int, custom_field_id: i
     ).first()
     if db_value:
         db.delete(db_value)
-        db.commit()
+        db.flush()
     return db_value
@@ -1,6 +1,7 @@
 from sqlalchemy import orm
 
-from app.models import goal
+from app.core import cache
+from app.models import goal, stream
 
 
 def get_goal_by_id(data_base: orm.Session, goal_id: int):
@@ -11,6 +12,17 @@ def get_goals_by_stream(data_base: orm.Session, stream_id: int):
     return data_base.query(goal.Goal).filter(goal.Goal.stream_id == stream_id).all()
 
 
+def get_goals_by_project(data_base: orm.Session, project_id: int):
+    """Получить цели всех стримов проекта project_id"""
+    return (
+        data_base.query(goal.Goal)
+        .join(stream.Stream, stream.Stream.id == goal.Goal.stream_id)
+        .filter(stream.Stream.project_id == project_id)
+        .order_by(goal.Goal.stream_id, goal.Goal.position)
+        .all()
+    )
+
+
 def get_goal_by_name_in_stream(data_base: orm.Session, stream_id: int, name: str, exclude_id: int = None):
     q = data_base.query(goal.Goal).filter(goal.Goal.stream_id == stream_id, goal.Goal.name == name)
 
@@ -31,8 +43,8 @@ def create_goal(data_base: orm.Session, stream_id: int, goal_data):
     )
 
     data_base.add(new_goal)
-    data_base.commit()
-    data_base.refresh(new_goal)
+    cache.invalidate_on_commit(data_base, cache.key("stream_goals", stream_id))
+    data_base.flush()
     return new_goal
 
 
@@ -40,11 +52,12 @@ def update_goal(data_base: orm.Session, goal_obj, goal_data):
     for field, value in goal_data.model_dump(exclude_unset=True).items():
         setattr(goal_obj, field, value)
 
-    data_base.commit()
-    data_base.refresh(goal_obj)
+    cache.invalidate_on_commit(data_base, cache.key("stream_goals", goal_obj.stream_id))
+    data_base.flush()
     return goal_obj
 
 
 def delete_goal(data_base: orm.Session, goal_obj):
     data_base.delete(goal_obj)
-    data_base.commit()
+    cache.invalidate_on_commit(data_base, cache.key("stream_goals", goal_obj.stream_id))
+    data_base.flush()
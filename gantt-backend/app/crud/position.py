@@ -0,0 +1,19 @@
+import sqlalchemy
+from sqlalchemy import orm
+
+
+def get_positions(db: orm.Session, model, container_column, container_id: int) -> dict[int, int]:
+    """Текущие позиции всех объектов контейнера container_id"""
+    return dict(db.query(model.id, model.position).filter(container_column == container_id))
+
+
+def position_changes(current: dict[int, int], ids) -> dict[int, tuple[int, int]]:
+    """Изменения {id: (старая позиция, новая)} при расстановке ids по порядку с позиции 1"""
+    return {obj_id: (current[obj_id], position) for position, obj_id in enumerate(ids, start=1)
+            if current[obj_id] != position}
+
+
+def set_positions(db: orm.Session, model, positions: dict[int, int]):
+    """Записать новые позиции одним UPDATE ... SET position = CASE id WHEN ... END"""
+    db.execute(sqlalchemy.update(model).where(model.id.in_(positions))
+               .values(position=sqlalchemy.case(positions, value=model.id)))
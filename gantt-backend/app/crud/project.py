@@ -1,6 +1,8 @@
+import sqlalchemy
 from sqlalchemy import orm
 
-from app.models import project
+from app.core import cache, hierarchy
+from app.models import project, team
 
 
 def get_project_by_id(data_base: orm.Session, project_id: int):
@@ -8,6 +10,22 @@ def get_project_by_id(data_base: orm.Session, project_id: int):
     return data_base.query(project.Project).filter(project.Project.id == project_id).first()
 
 
+def get_project_version_for_user(data_base: orm.Session, project_id: int, user_id: int):
+    """Получить версию проекта и членство пользователя в его команде одним запросом"""
+    return data_base.query(project.Project.version, team.UserTeam.id).outerjoin(
+        team.UserTeam, sqlalchemy.and_(team.UserTeam.team_id == project.Project.team_id,
+                                       team.UserTeam.user_id == user_id)
+    ).filter(project.Project.id == project_id).first()
+
+
+def get_project_with_user_team(data_base: orm.Session, project_id: int, user_id: int):
+    """Получить проект и членство пользователя в его команде одним запросом"""
+    return data_base.query(project.Project, team.UserTeam).outerjoin(
+        team.UserTeam, sqlalchemy.and_(team.UserTeam.team_id == project.Project.team_id,
+                                       team.UserTeam.user_id == user_id)
+    ).filter(project.Project.id == project_id).first()
+
+
 def get_projects_by_team(data_base: orm.Session, team_id: int):
     return data_base.query(project.Project).filter(project.Project.team_id == team_id).all()
 
@@ -18,19 +36,23 @@ def create_project(data_base: orm.Session, team_id: int, project_data):
         team_id=team_id
     )
     data_base.add(new_project)
-    data_base.commit()
-    data_base.refresh(new_project)
+    data_base.flush()
+    hierarchy.invalidate_on_commit(data_base, "project", new_project.id)
+    cache.invalidate_on_commit(data_base, cache.key("team_projects", team_id))
     return new_project
 
 
 def update_project(data_base: orm.Session, project_obj, update_data):
     for field, value in update_data.model_dump(exclude_unset=True).items():
         setattr(project_obj, field, value)
-    data_base.commit()
-    data_base.refresh(project_obj)
+    cache.invalidate_on_commit(data_base, cache.key("team_projects", project_obj.team_id))
+    data_base.flush()
     return project_obj
 
 
 def delete_project(data_base: orm.Session, project_obj):
     data_base.delete(project_obj)
-    data_base.commit()
+    hierarchy.invalidate_on_commit(data_base, "project", project_obj.id)
+    cache.invalidate_on_commit(data_base, cache.key("team_projects", project_obj.team_id),
+                               cache.key("project_streams", project_obj.id))
+    data_base.flush()
@@ -31,5 +31,5 @@ def create_subscription(db: orm.Session, user_id: int, endpoint: str, p256dh: st
 def delete_subscription(db: orm.Session, subscription_obj):
     """Удалить подписку на push уведомления"""
     db.delete(subscription_obj)
-    db.commit()
+    db.flush()
 
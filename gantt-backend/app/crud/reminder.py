@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from sqlalchemy import orm
 
 from app.models import task
@@ -23,11 +25,16 @@ def get_reminders_by_user(db: orm.Session, user_id: int):
     ).all()
 
 
-def get_pending_reminders(db: orm.Session):
-    """Получить все напоминания, которые нужно отправить"""
-    return db.query(task.TaskReminder).filter(
+def get_pending_reminders(db: orm.Session, since: datetime | None = None, until: datetime | None = None):
+    """Получить неотправленные напоминания, срок которых в интервале (since, until]"""
+    query = db.query(task.TaskReminder).filter(
         task.TaskReminder.sent == False
-    ).all()
+    )
+    if since is not None:
+        query = query.filter(task.TaskReminder.remind_at > since)
+    if until is not None:
+        query = query.filter(task.TaskReminder.remind_at <= until)
+    return query.order_by(task.TaskReminder.remind_at).all()
 
 
 def create_reminder(db: orm.Session, task_id: int, user_id: int, remind_at):
@@ -46,21 +53,19 @@ def update_reminder(db: orm.Session, reminder_obj, reminder_update_data):
     """Обновить напоминание"""
     for field, value in reminder_update_data.model_dump(exclude_unset=True).items():
         setattr(reminder_obj, field, value)
-    db.commit()
-    db.refresh(reminder_obj)
+    db.flush()
     return reminder_obj
 
 
 def mark_as_sent(db: orm.Session, reminder_obj):
     """Отметить напоминание как отправленное"""
     reminder_obj.sent = True
-    db.commit()
-    db.refresh(reminder_obj)
+    db.flush()
     return reminder_obj
 
 
 def delete_reminder(db: orm.Session, reminder_obj):
     """Удалить напоминание"""
     db.delete(reminder_obj)
-    db.commit()
+    db.flush()
 
@@ -1,7 +1,8 @@
+import sqlalchemy
 from sqlalchemy import orm
 
-from app.core import exception
-from app.models import goal, stream, task
+from app.core import cache, exception, hierarchy
+from app.models import goal, project, stream, task, team
 from app.schemas import stream as stream_schemas
 
 
@@ -18,6 +19,26 @@ def get_stream_by_id(data_base: orm.Session, stream_id: int):
     return stream_obj
 
 
+def get_stream_version_for_user(data_base: orm.Session, stream_id: int, user_id: int):
+    """Получить версию стрима и членство пользователя в команде его проекта одним запросом"""
+    return data_base.query(stream.Stream.version, team.UserTeam.id).join(
+        project.Project, project.Project.id == stream.Stream.project_id
+    ).outerjoin(
+        team.UserTeam, sqlalchemy.and_(team.UserTeam.team_id == project.Project.team_id,
+                                       team.UserTeam.user_id == user_id)
+    ).filter(stream.Stream.id == stream_id).first()
+
+
+def get_stream_with_access(data_base: orm.Session, stream_id: int, user_id: int):
+    """Получить стрим, его проект и членство пользователя в команде проекта одним запросом"""
+    return data_base.query(stream.Stream, project.Project, team.UserTeam).outerjoin(
+        project.Project, project.Project.id == stream.Stream.project_id
+    ).outerjoin(
+        team.UserTeam, sqlalchemy.and_(team.UserTeam.team_id == project.Project.team_id,
+                                       team.UserTeam.user_id == user_id)
+    ).filter(stream.Stream.id == stream_id).first()
+
+
 def get_stream_by_name_and_proj_id(data_base: orm.Session, name: str, proj_id: int):
     return data_base.query(stream.Stream).filter(stream.Stream.project_id == proj_id,
                                                  stream.Stream.name == name).first()
@@ -26,8 +47,9 @@ def get_stream_by_name_and_proj_id(data_base: orm.Session, name: str, proj_id: i
 def create_new_stream(data_base: orm.Session, proj_id: int, stream_data: stream_schemas.StreamCreate):
     new_stream = stream.Stream(name=stream_data.name, project_id=proj_id, position=stream_data.position)
     data_base.add(new_stream)
-    data_base.commit()
-    data_base.refresh(new_stream)
+    data_base.flush()
+    hierarchy.invalidate_on_commit(data_base, "stream", new_stream.id)
+    cache.invalidate_on_commit(data_base, cache.key("project_streams", proj_id))
     return new_stream
 
 
@@ -44,8 +66,8 @@ def update_stream(data_base: orm.Session, stream_obj: stream.Stream, stream_upda
     if stream_update_data.position is not None:
         stream_obj.position = stream_update_data.position
 
-    data_base.commit()
-    data_base.refresh(stream_obj)
+    cache.invalidate_on_commit(data_base, cache.key("project_streams", stream_obj.project_id))
+    data_base.flush()
 
     return stream_obj
 
@@ -60,4 +82,7 @@ def delete_stream(data_base: orm.Session, stream_id: int):
         raise exception.NotFoundError("Стрим не найден")
 
     data_base.delete(stream_obj)
-    data_base.commit()
+    hierarchy.invalidate_on_commit(data_base, "stream", stream_id)
+    cache.invalidate_on_commit(data_base, cache.key("project_streams", stream_obj.project_id),
+                               cache.key("stream_goals", stream_id))
+    data_base.flush()
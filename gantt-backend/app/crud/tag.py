@@ -1,13 +1,14 @@
 from sqlalchemy import orm
 
+from app.core import cache
 from app.models import tag
 
 
 def create_tag(db: orm.Session, team_id: int, name: str, color: str):
     t = tag.Tag(name=name, color=color, team_id=team_id)
     db.add(t)
-    db.commit()
-    db.refresh(t)
+    cache.invalidate_on_commit(db, cache.key("team_tags", team_id))
+    db.flush()
     return t
 
 
@@ -21,4 +22,5 @@ def get_tag_by_id(db: orm.Session, tag_id: int):
 
 def delete_tag(db: orm.Session, t: tag.Tag):
     db.delete(t)
-    db.commit()
\ No newline at end of file
+    cache.invalidate_on_commit(db, cache.key("team_tags", t.team_id))
+    db.flush()
\ No newline at end of file
@@ -1,34 +1,170 @@
 from datetime import datetime
 
+import sqlalchemy
 from sqlalchemy import orm
 
-from app.models import task, team, project as project_model, stream as stream_model, user as user_model
+from app.models import (meta, tag, task, team, custom_field as custom_field_model, project as project_model,
+                        stream as stream_model, user as user_model)
 
 
 def get_task_by_id(db: orm.Session, task_id: int):
     return db.query(task.Task).filter(task.Task.id == task_id).first()
 
 
-def get_tasks_by_stream(db: orm.Session, stream_id: int):
-    tasks = db.query(task.Task).filter(task.Task.stream_id == stream_id).all()
-    for task_obj in tasks:
-        if task_obj.assigned_users:
-            task_obj.assignee_email = task_obj.assigned_users[0].user.email
+def get_task_with_access(db: orm.Session, task_id: int, user_id: int):
+    """Получить задачу, ее стрим, проект и членство пользователя в команде проекта одним запросом"""
+    return db.query(task.Task, stream_model.Stream, project_model.Project, team.UserTeam).outerjoin(
+        stream_model.Stream, stream_model.Stream.id == task.Task.stream_id
+    ).outerjoin(
+        project_model.Project, project_model.Project.id == stream_model.Stream.project_id
+    ).outerjoin(
+        team.UserTeam, sqlalchemy.and_(team.UserTeam.team_id == project_model.Project.team_id,
+                                       team.UserTeam.user_id == user_id)
+    ).filter(task.Task.id == task_id).first()
 
-    return tasks
 
+TASK_STREAM_BATCH_SIZE = 500
 
-def get_tasks_by_project(db: orm.Session, project_obj):
-    tasks = []
-    for stream_obj in project_obj.streams:
-        stream_tasks = db.query(task.Task).filter(task.Task.stream_id == stream_obj.id).all()
-        tasks.extend(stream_tasks)
 
-    for task_obj in tasks:
-        if task_obj.assigned_users:
-            task_obj.assignee_email = task_obj.assigned_users[0].user.email
+def load_task_graph(query):
+    """Подгрузить теги, связи, кастомные поля и ответственных сразу для всех задач выборки.
+
+    Каждая связь читается одним запросом на всю пачку задач вместо ленивой загрузки по задаче.
+    """
+    return query.options(
+        orm.selectinload(task.Task.assigned_users).joinedload(meta.UserTask.user),
+        orm.selectinload(task.Task.tags).joinedload(tag.TaskTag.tag),
+        orm.selectinload(task.Task.relations_outgoing).joinedload(task.TaskRelation.connection),
+        orm.selectinload(task.Task.relations_incoming).joinedload(task.TaskRelation.connection),
+        orm.selectinload(task.Task.custom_field_values),
+    )
+
+
+def _set_assignee_email(task_obj):
+    if task_obj.assigned_users:
+        task_obj.assignee_email = task_obj.assigned_users[0].user.email
+    return task_obj
+
+
+def _tasks_by_stream_query(db: orm.Session, stream_id: int):
+    return load_task_graph(db.query(task.Task).filter(task.Task.stream_id == stream_id))
+
 
-    return tasks
+def _tasks_by_project_query(db: orm.Session, project_id: int):
+    return load_task_graph(
+        db.query(task.Task)
+        .join(stream_model.Stream, stream_model.Stream.id == task.Task.stream_id)
+        .filter(stream_model.Stream.project_id == project_id)
+    )
+
+
+def get_tasks_by_stream(db: orm.Session, stream_id: int):
+    return [_set_assignee_email(task_obj) for task_obj in _tasks_by_stream_query(db, stream_id).all()]
+
+
+def iter_tasks_by_stream(db: orm.Session, stream_id: int):
+    """Итерироваться по задачам стрима, читая их из курсора пачками."""
+    for task_obj in _tasks_by_stream_query(db, stream_id).yield_per(TASK_STREAM_BATCH_SIZE):
+        yield _set_assignee_email(task_obj)
+
+
+def get_tasks_by_project(db: orm.Session, project_obj):
+    return [_set_assignee_email(task_obj) for task_obj in _tasks_by_project_query(db, project_obj.id).all()]
+
+
+def iter_tasks_by_project(db: orm.Session, project_obj):
+    """Итерироваться по задачам проекта, читая их из курсора пачками."""
+    for task_obj in _tasks_by_project_query(db, project_obj.id).yield_per(TASK_STREAM_BATCH_SIZE):
+        yield _set_assignee_email(task_obj)
+
+
+def _apply_task_filters(query, filters):
+    """Добавить в запрос условия фильтрации задач."""
+    if filters is None:
+        return query
+
+    if filters.status_id:
+        query = query.filter(task.Task.status_id.in_(filters.status_id))
+    if filters.priority_id:
+        query = query.filter(task.Task.priority_id.in_(filters.priority_id))
+    if filters.tag_id:
+        tagged = sqlalchemy.select(tag.TaskTag.task_id).where(tag.TaskTag.tag_id.in_(filters.tag_id))
+        query = query.filter(task.Task.id.in_(tagged))
+    if filters.assignee_email:
+        assigned = (
+            sqlalchemy.select(meta.UserTask.task_id)
+            .join(user_model.User, user_model.User.id == meta.UserTask.user_id)
+            .where(user_model.User.email.in_(filters.assignee_email))
+        )
+        query = query.filter(task.Task.id.in_(assigned))
+    if filters.team_id:
+        query = query.filter(project_model.Project.team_id.in_(filters.team_id))
+    if filters.project_id:
+        query = query.filter(stream_model.Stream.project_id.in_(filters.project_id))
+    if filters.stream_id:
+        query = query.filter(task.Task.stream_id.in_(filters.stream_id))
+    if filters.start_date_from:
+        query = query.filter(task.Task.start_date >= filters.start_date_from)
+    if filters.start_date_to:
+        query = query.filter(task.Task.start_date <= filters.start_date_to)
+    if filters.deadline_from:
+        query = query.filter(task.Task.deadline >= filters.deadline_from)
+    if filters.deadline_to:
+        query = query.filter(task.Task.deadline <= filters.deadline_to)
+
+    return query
+
+
+def _tasks_with_context_query(db: orm.Session, user_id: int, filters=None):
+    query = _join_user_teams(
+        db.query(
+            task.Task,
+            team.Team.id,
+            team.Team.name,
+            project_model.Project.name,
+            stream_model.Stream.name,
+        ),
+        user_id,
+    ).join(team.Team, team.Team.id == project_model.Project.team_id)
+    return _apply_task_filters(query, filters)
+
+
+def _attach_context(row):
+    task_obj, team_id, team_name, project_name, stream_name = row
+    task_obj.team_id = team_id
+    task_obj.team_name = team_name
+    task_obj.project_name = project_name
+    task_obj.stream_name = stream_name
+    return _set_assignee_email(task_obj)
+
+
+def get_tasks_with_context_by_user(db: orm.Session, user_id: int, filters=None,
+                                   after: tuple[int, int, int] | None = None, limit: int | None = None):
+    """Получить задачи из команд пользователя вместе с названиями команды, проекта и стрима.
+
+    Задачи упорядочены по (stream_id, position, id); after - ключ последней задачи предыдущей страницы.
+    """
+    query = _tasks_with_context_query(db, user_id, filters)
+
+    if after is not None:
+        query = query.filter(sqlalchemy.tuple_(task.Task.stream_id, task.Task.position, task.Task.id) >
+                             sqlalchemy.tuple_(*after))
+
+    query = query.order_by(task.Task.stream_id, task.Task.position, task.Task.id)
+    if limit is not None:
+        query = query.limit(limit)
+
+    return [_attach_context(row) for row in load_task_graph(query).all()]
+
+
+def iter_tasks_with_context_by_user(db: orm.Session, user_id: int, filters=None):
+    """Итерироваться по задачам из команд пользователя, читая их из курсора пачками."""
+    query = load_task_graph(
+        _tasks_with_context_query(db, user_id, filters)
+        .order_by(task.Task.stream_id, task.Task.position, task.Task.id)
+    ).yield_per(TASK_STREAM_BATCH_SIZE)
+    for row in query:
+        yield _attach_context(row)
 
 
 def create_task(db: orm.Session, stream_id: int, task_data):
@@ -47,17 +183,44 @@ def create_task(db: orm.Session, stream_id: int, task_data):
     return new_task
 
 
+def get_last_task_position(db: orm.Session, stream_id: int):
+    return db.query(sqlalchemy.func.max(task.Task.position)).filter(task.Task.stream_id == stream_id).scalar()
+
+
+def insert_tasks(db: orm.Session, stream_id: int, tasks_data) -> list[int]:
+    """Вставить задачи одним пакетным INSERT ... RETURNING; id возвращаются в порядке tasks_data"""
+    rows = [{
+        "name": task_data.name,
+        "description": task_data.description or "",
+        "stream_id": stream_id,
+        "status_id": task_data.status_id or 1,
+        "priority_id": task_data.priority_id or 1,
+        "start_date": task_data.start_date,
+        "deadline": task_data.deadline,
+        "position": task_data.position,
+    } for task_data in tasks_data]
+    statement = sqlalchemy.insert(task.Task).returning(task.Task.id, sort_by_parameter_order=True)
+    return list(db.scalars(statement, rows))
+
+
+def insert_task_links(db: orm.Session, assignees=(), task_tags=(), custom_field_values=()):
+    """Вставить исполнителей, теги и значения полей задач пакетами (executemany), минуя unit of work"""
+    for model, rows in ((meta.UserTask, assignees), (tag.TaskTag, task_tags),
+                        (custom_field_model.TaskCustomFieldValue, custom_field_values)):
+        if rows:
+            db.execute(sqlalchemy.insert(model), rows)
+
+
 def update_task(db: orm.Session, task_obj, task_update_data):
     for field, value in task_update_data.items():
         setattr(task_obj, field, value)
-    db.commit()
-    db.refresh(task_obj)
+    db.flush()
     return task_obj
 
 
 def delete_task(db: orm.Session, task_obj):
     db.delete(task_obj)
-    db.commit()
+    db.flush()
 
 
 def create_task_relation(db: orm.Session, task_id_1: int, task_id_2: int, connection_id: int):
@@ -67,8 +230,7 @@ def create_task_relation(db: orm.Session, task_id_1: int, task_id_2: int, connec
         connection_id=connection_id
     )
     db.add(relation)
-    db.commit()
-    db.refresh(relation)
+    db.flush()
     return relation
 
 
@@ -87,9 +249,23 @@ def create_task_history_entries(db: orm.Session, task_id: int, changed_by_id: in
         )
         db.add(entry)
         entries.append(entry)
+    db.flush()
     return entries
 
 
+def insert_task_history(db: orm.Session, changed_by_id: int, field_name: str, changes: dict):
+    """Записать изменение одного поля у многих задач одним пакетным INSERT; changes — {task_id: (старое, новое)}"""
+    now = datetime.utcnow()
+    db.execute(sqlalchemy.insert(task.TaskHistory), [{
+        "task_id": task_id,
+        "changed_by_id": changed_by_id,
+        "changed_at": now,
+        "field_name": field_name,
+        "old_value": str(old_value) if old_value is not None else None,
+        "new_value": str(new_value) if new_value is not None else None,
+    } for task_id, (old_value, new_value) in changes.items()])
+
+
 def get_task_history(db: orm.Session, task_id: int):
     """Получить историю изменений задачи."""
     return (
@@ -100,60 +276,36 @@ def get_task_history(db: orm.Session, task_id: int):
     )
 
 
-def get_tasks_by_user_id(db: orm.Session, user_id: int, only_assigned_to_user: bool = False):
-    user_teams = db.query(team.UserTeam).filter(team.UserTeam.user_id == user_id).all()
-    team_ids = [ut.team_id for ut in user_teams]
-    projects = db.query(project_model.Project).filter(project_model.Project.team_id.in_(team_ids)).all()
-    project_ids = [p.id for p in projects]
-    streams = db.query(stream_model.Stream).filter(stream_model.Stream.project_id.in_(project_ids)).all()
-    stream_ids = [s.id for s in streams]
-    query = db.query(task.Task).filter(task.Task.stream_id.in_(stream_ids))
+def _join_user_teams(query, user_id: int):
+    """Присоединить к запросу задач стрим и проект и оставить только проекты команд пользователя."""
+    user_team_ids = sqlalchemy.select(team.UserTeam.team_id).where(team.UserTeam.user_id == user_id)
+    return (
+        query
+        .join(stream_model.Stream, stream_model.Stream.id == task.Task.stream_id)
+        .join(project_model.Project, project_model.Project.id == stream_model.Stream.project_id)
+        .filter(project_model.Project.team_id.in_(user_team_ids))
+    )
+
+
+def get_tasks_by_scope(db: orm.Session, user_id: int, target: str, target_ids: list[int] | None = None,
+                       only_assigned_to_user: bool = False):
+    """Получить задачи в области target одним запросом.
+
+    target - all, team, teams, project, projects, stream или streams; target_ids - id команд, проектов или стримов.
+    Область всегда ограничена командами пользователя.
+    """
+    query = _join_user_teams(db.query(task.Task), user_id)
+
+    if target in ("team", "teams"):
+        query = query.filter(project_model.Project.team_id.in_(target_ids or []))
+    elif target in ("project", "projects"):
+        query = query.filter(stream_model.Stream.project_id.in_(target_ids or []))
+    elif target in ("stream", "streams"):
+        query = query.filter(task.Task.stream_id.in_(target_ids or []))
+    elif target != "all":
+        raise ValueError(f"Неизвестная область задач: {target}")
+
     if only_assigned_to_user:
-        query = query.filter(task.Task.assigned_users.any(user_model.User.id == user_id))
-    return query.all()
-
-
-def get_tasks_by_team_id(db: orm.Session, team_id: int, user_id: int | None = None):
-    projects = db.query(project_model.Project).filter(project_model.Project.team_id == team_id).all()
-    project_ids = [p.id for p in projects]
-    streams = db.query(stream_model.Stream).filter(stream_model.Stream.project_id.in_(project_ids)).all()
-    stream_ids = [s.id for s in streams]
-    query = db.query(task.Task).filter(task.Task.stream_id.in_(stream_ids))
-    if user_id:
-        query = query.filter(task.Task.assigned_users.any(user_model.User.id == user_id))
-    return query.all()
-
-
-def get_tasks_by_team_ids(db: orm.Session, team_ids: list[int], user_id: int | None = None):
-    projects = db.query(project_model.Project).filter(project_model.Project.team_id.in_(team_ids)).all()
-    project_ids = [p.id for p in projects]
-    streams = db.query(stream_model.Stream).filter(stream_model.Stream.project_id.in_(project_ids)).all()
-    stream_ids = [s.id for s in streams]
-    query = db.query(task.Task).filter(task.Task.stream_id.in_(stream_ids))
-    if user_id:
-        query = query.filter(task.Task.assigned_users.any(user_model.User.id == user_id))
-    return query.all()
-
-
-def get_tasks_by_project_ids(db: orm.Session, project_ids: list[int], user_id: int | None = None):
-    streams = db.query(stream_model.Stream).filter(stream_model.Stream.project_id.in_(project_ids)).all()
-    stream_ids = [s.id for s in streams]
-    query = db.query(task.Task).filter(task.Task.stream_id.in_(stream_ids))
-    if user_id:
-        query = query.filter(task.Task.assigned_users.any(user_model.User.id == user_id))
-    return query.all()
-
-
-def get_tasks_by_stream_id(db: orm.Session, stream_id: int, user_id: int | None = None):
-    query = db.query(task.Task).filter(task.Task.stream_id == stream_id)
-    if user_id:
-        query = query.filter(task.Task.assigned_users.any(user_model.User.id == user_id))
-    return query.all()
-
-
-def get_tasks_by_stream_ids(db: orm.Session, stream_ids: list[int], user_id: int | None = None):
-    query = db.query(task.Task).filter(task.Task.stream_id.in_(stream_ids))
-    if user_id:
-        query = query.filter(task.Task.assigned_users.any(user_model.User.id == user_id))
-    return query.all()
+        query = query.filter(task.Task.assigned_users.any(meta.UserTask.user_id == user_id))
 
+    return query.order_by(task.Task.id).all()
@@ -1,5 +1,7 @@
+import sqlalchemy
 from sqlalchemy import orm
 
+from app.core import cache, hierarchy
 from app.models import team, user
 
 
@@ -9,6 +11,13 @@ def get_user_team_by_id(data_base: orm.Session, user_id: int, team_id: int):
                                                  team.UserTeam.user_id == user_id).first()
 
 
+def get_team_with_user_team(data_base: orm.Session, team_id: int, user_id: int):
+    """Получить команду и членство пользователя в ней одним запросом"""
+    return data_base.query(team.Team, team.UserTeam).outerjoin(
+        team.UserTeam, sqlalchemy.and_(team.UserTeam.team_id == team.Team.id, team.UserTeam.user_id == user_id)
+    ).filter(team.Team.id == team_id).first()
+
+
 def get_team_by_id(data_base: orm.Session, team_id: int):
     return data_base.query(team.Team).filter(team.Team.id == team_id).first()
 
@@ -40,8 +49,7 @@ def get_user_by_email(data_base: orm.Session, email: str):
 def create_team(data_base: orm.Session, name: str):
     team_obj = team.Team(name=name)
     data_base.add(team_obj)
-    data_base.commit()
-    data_base.refresh(team_obj)
+    data_base.flush()
     return team_obj
 
 
@@ -52,17 +60,20 @@ def add_user_to_team(data_base: orm.Session, team_id: int, user_id: int, role_id
         role_id=role_id
     )
     data_base.add(member)
-    data_base.commit()
-    data_base.refresh(member)
+    hierarchy.invalidate_on_commit(data_base, "membership", user_id, team_id)
+    data_base.flush()
     return member
 
 
 def delete_member(data_base: orm.Session, team_id: int, user_id: int):
     data_base.query(team.UserTeam).filter(team.UserTeam.team_id == team_id, team.UserTeam.user_id == user_id).delete(
         synchronize_session=False)
-    data_base.commit()
+    hierarchy.invalidate_on_commit(data_base, "membership", user_id, team_id)
 
 
 def delete_team(data_base: orm.Session, team_obj):
     data_base.delete(team_obj)
-    data_base.commit()
+    hierarchy.invalidate_on_commit(data_base, "team", team_obj.id)
+    cache.invalidate_on_commit(data_base, *(cache.key(namespace, team_obj.id)
+                                            for namespace in ("team_projects", "team_tags", "team_custom_fields")))
+    data_base.flush()
@@ -30,13 +30,18 @@ def create_user(data_base: orm.Session, email: str, nickname: str, password_hash
         password_hash=password_hash
     )
 
-    data_base.add(new_user)
-
+    # Точка сохранения: при конфликте откатывается только эта вставка, а не вся транзакция вызывающего
     try:
-        data_base.commit()
-        data_base.refresh(new_user)
+        with data_base.begin_nested():
+            data_base.add(new_user)
+            data_base.flush()
     except exc.IntegrityError:
-        data_base.rollback()
         raise exception.ConflictError("Нарушено ограничение уникальности")
 
-    return new_user
\ No newline at end of file
+    return new_user
+
+
+def update_password_hash(data_base: orm.Session, user_obj: user.User, password_hash: str):
+    user_obj.password_hash = password_hash
+    data_base.flush()
+    return user_obj
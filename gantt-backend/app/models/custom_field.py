@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Text, Date, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Text, Date, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 
 from app.models import base
@@ -27,6 +27,7 @@ class CustomField(base.Base):
 
 class TaskCustomFieldValue(base.Base):
     __tablename__ = "task_custom_field_values"
+    __table_args__ = (Index("uq_task_custom_field_value", "task_id", "custom_field_id", unique=True),)
 
     id = Column(Integer, primary_key=True, index=True)
     task_id = Column(Integer, ForeignKey("Tasks.id"), nullable=False)
@@ -25,8 +25,8 @@ class ConnectionType(base.Base):
 class UserTask(base.Base):
     __tablename__ = "UserTask"
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("Users.id"), nullable=False)
-    task_id = Column(Integer, ForeignKey("Tasks.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("Users.id"), nullable=False, index=True)
+    task_id = Column(Integer, ForeignKey("Tasks.id"), nullable=False, index=True)
 
     user = relationship("User", back_populates="assigned_tasks")
     task = relationship("Task", back_populates="assigned_users")
@@ -8,7 +8,8 @@ class Project(base.Base):
     __tablename__ = "Projects"
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)
-    team_id = Column(Integer, ForeignKey('Teams.id'), nullable=False)
+    team_id = Column(Integer, ForeignKey('Teams.id'), nullable=False, index=True)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
 
     team = relationship("Team", back_populates="projects")
     streams = relationship("Stream", back_populates="project")
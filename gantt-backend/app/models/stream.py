@@ -8,8 +8,9 @@ class Stream(base.Base):
     __tablename__ = "Streams"
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)
-    project_id = Column(Integer, ForeignKey("Projects.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("Projects.id"), nullable=False, index=True)
     position = Column(Integer, nullable=False, default=0)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
 
     project = relationship("Project", back_populates="streams")
     goals = relationship("Goal", back_populates="stream")
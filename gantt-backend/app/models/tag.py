@@ -20,7 +20,7 @@ class TaskTag(base.Base):
     __tablename__ = "TaskTags"
 
     task_id = Column(Integer, ForeignKey("Tasks.id"), primary_key=True)
-    tag_id = Column(Integer, ForeignKey("Tags.id"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("Tags.id"), primary_key=True, index=True)
 
     task = orm.relationship("Task", back_populates="tags")
     tag = orm.relationship("Tag", back_populates="task_links")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Boolean, Text, orm
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Boolean, Text, orm
 
 from app.models import base
 
@@ -6,7 +6,7 @@ from app.models import base
 class Task(base.Base):
     __tablename__ = "Tasks"
     id = Column(Integer, primary_key=True)
-    stream_id = Column(Integer, ForeignKey("Streams.id"), nullable=False)
+    stream_id = Column(Integer, ForeignKey("Streams.id"), nullable=False, index=True)
     name = Column(String, nullable=False, index=True)
     description = Column(String, nullable=True)
     status_id = Column(Integer, nullable=True)
@@ -32,8 +32,8 @@ class TaskRelation(base.Base):
     __tablename__ = "TaskRelations"
 
     id = Column(Integer, primary_key=True)
-    task_id_1 = Column(Integer, ForeignKey("Tasks.id"), nullable=False)
-    task_id_2 = Column(Integer, ForeignKey("Tasks.id"), nullable=False)
+    task_id_1 = Column(Integer, ForeignKey("Tasks.id"), nullable=False, index=True)
+    task_id_2 = Column(Integer, ForeignKey("Tasks.id"), nullable=False, index=True)
     connection_id = Column(Integer, ForeignKey("Connections.id"), nullable=False)
 
     task1 = orm.relationship("Task", foreign_keys=[task_id_1], backref="relations_outgoing")
@@ -47,6 +47,8 @@ class TaskRelation(base.Base):
 
 class TaskReminder(base.Base):
     __tablename__ = "task_reminders"
+    # Планировщик выбирает неотправленные напоминания, срок которых наступил
+    __table_args__ = (Index("ix_task_reminders_sent_remind_at", "sent", "remind_at"),)
 
     id = Column(Integer, primary_key=True)
 
@@ -59,6 +61,7 @@ class TaskReminder(base.Base):
 
 class TaskHistory(base.Base):
     __tablename__ = "TaskHistory"
+    __table_args__ = (Index("ix_TaskHistory_task_id_changed_at", "task_id", "changed_at"),)
 
     id = Column(Integer, primary_key=True)
     task_id = Column(Integer, ForeignKey("Tasks.id", ondelete="CASCADE"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.models import base
@@ -17,6 +17,7 @@ class Team(base.Base):
 
 class UserTeam(base.Base):
     __tablename__ = "UserTeam"
+    __table_args__ = (Index("ix_UserTeam_user_id_team_id", "user_id", "team_id"),)
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('Users.id'), nullable=False)
     team_id = Column(Integer, ForeignKey("Teams.id"), nullable=False)
@@ -10,6 +10,7 @@ class ExportScope(str, Enum):
 class ExportTarget(str, Enum):
     all = "all"
     team = "team"
+    project = "project"
     stream = "stream"
     teams = "teams"
     projects = "projects"
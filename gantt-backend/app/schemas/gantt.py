@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+from app.schemas.goal import GoalResponse
+from app.schemas.project import ProjectResponse
+from app.schemas.stream import StreamResponse
+from app.schemas.task import TaskRelationResponse, TaskResponse
+
+
+class GanttSnapshotResponse(BaseModel):
+    project: ProjectResponse
+    streams: list[StreamResponse]
+    goals: list[GoalResponse]
+    tasks: list[TaskResponse]
+    relations: list[TaskRelationResponse]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 
 
 class StatusResponse(BaseModel):
@@ -14,3 +14,14 @@ class PriorityResponse(BaseModel):
 class ConnectionTypeResponse(BaseModel):
     id: int
     name: str
+
+
+class Reorder(BaseModel):
+    """Новый порядок объектов контейнера: все его объекты, позиции выставляются по номеру в списке с 1"""
+    ids: list[int] = Field(..., min_length=1, max_length=5000)
+
+    @field_validator("ids")
+    def validate_unique(cls, ids):
+        if len(set(ids)) != len(ids):
+            raise ValueError("id в списке не должны повторяться")
+        return ids
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+
+
+class CacheCounters(BaseModel):
+    hits: int
+    misses: int
+
+
+class CacheStatsResponse(BaseModel):
+    backend: str
+    namespaces: dict[str, CacheCounters]
+
+
+class PoolStatsResponse(BaseModel):
+    pool_class: str
+    size: int | None
+    checked_out: int | None
+    checked_in: int | None
+    overflow: int | None
+    max_overflow: int | None
+    checkouts: int
+    timeouts: int
+    wait_avg_ms: float
+    wait_max_ms: float
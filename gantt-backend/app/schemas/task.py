@@ -26,6 +26,14 @@ class TaskCreate(BaseModel):
         return deadline
 
 
+class TaskBulkCreate(BaseModel):
+    tasks: list[TaskCreate] = Field(..., min_length=1, max_length=5000)
+
+
+class TaskBulkCreateResponse(BaseModel):
+    ids: list[int]
+
+
 class TaskUpdate(BaseModel):
     name: str | None = Field(None, min_length=1)
     description: str | None = None
@@ -96,6 +104,25 @@ class TaskResponseFull(BaseModel):
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
 
+class TaskFilters(BaseModel):
+    status_id: list[int] | None = None
+    priority_id: list[int] | None = None
+    tag_id: list[int] | None = None
+    assignee_email: list[str] | None = None
+    team_id: list[int] | None = None
+    project_id: list[int] | None = None
+    stream_id: list[int] | None = None
+    start_date_from: datetime | None = None
+    start_date_to: datetime | None = None
+    deadline_from: datetime | None = None
+    deadline_to: datetime | None = None
+
+
+class TaskPageQuery(TaskFilters):
+    cursor: str | None = None
+    limit: int = Field(500, ge=1, le=1000)
+
+
 class TaskRelationCreate(BaseModel):
     task_id: int
     connection_id: int
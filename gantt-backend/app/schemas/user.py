@@ -6,6 +6,14 @@ class TeamResponse(BaseModel):
     name: str
 
 
+class UserProfile(BaseModel):
+    id: int
+    email: EmailStr
+    nickname: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class UserResponse(BaseModel):
     id: int
     email: EmailStr
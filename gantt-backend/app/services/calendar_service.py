@@ -1,31 +1,23 @@
 import datetime
-import ics
 
 from sqlalchemy import orm
-from app.crud.task import get_tasks_by_user_id, get_tasks_by_team_id, get_tasks_by_stream_id, \
-    get_tasks_by_team_ids, get_tasks_by_project_ids, get_tasks_by_stream_ids
+from app.crud import task as task_crud
 from app.schemas import calendar
 
+_SINGLE_TARGETS = ("team", "project", "stream")
+
 
 def export_calendar_service(data_base: orm.Session, user_id: int, export_options: calendar.CalendarExport) -> str:
-    tasks = []
-    if export_options.target == "all":
-        tasks = get_tasks_by_user_id(data_base, user_id, export_options.scope == "my")
-    elif export_options.target == "team":
-        tasks = get_tasks_by_team_id(data_base, export_options.target_id,
-                                     user_id if export_options.scope == "my" else None)
-    elif export_options.target == "stream":
-        tasks = get_tasks_by_stream_id(data_base, export_options.target_id,
-                                       user_id if export_options.scope == "my" else None)
-    elif export_options.target == "teams":
-        tasks = get_tasks_by_team_ids(data_base, export_options.target_ids,
-                                      user_id if export_options.scope == "my" else None)
-    elif export_options.target == "projects":
-        tasks = get_tasks_by_project_ids(data_base, export_options.target_ids,
-                                         user_id if export_options.scope == "my" else None)
-    elif export_options.target == "streams":
-        tasks = get_tasks_by_stream_ids(data_base, export_options.target_ids,
-                                        user_id if export_options.scope == "my" else None)
+    # ics нужен только для экспорта, поэтому не загружается при старте приложения
+    import ics
+
+    if export_options.target in _SINGLE_TARGETS:
+        target_ids = [export_options.target_id] if export_options.target_id is not None else []
+    else:
+        target_ids = export_options.target_ids
+
+    tasks = task_crud.get_tasks_by_scope(data_base, user_id, export_options.target, target_ids,
+                                         only_assigned_to_user=export_options.scope == "my")
 
     clndr = ics.Calendar()
     for task in tasks:
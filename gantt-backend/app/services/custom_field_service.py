@@ -1,6 +1,6 @@
 from sqlalchemy import orm
 
-from app.core import exception
+from app.core import cache, exception
 from app.crud import custom_field as custom_field_crud
 from app.models import custom_field as custom_field_model
 from app.schemas import custom_field as custom_field_schema
@@ -17,12 +17,18 @@ def create_custom_field_service(data_base: orm.Session, team_id: int, user_id: i
     )
     if existing_field:
         return existing_field
-    return custom_field_crud.create_custom_field(db=data_base, team_id=team_id, field=field_data)
+    new_field = custom_field_crud.create_custom_field(db=data_base, team_id=team_id, field=field_data)
+    data_base.commit()
+    return new_field
 
 
 def get_custom_fields_by_team_service(data_base: orm.Session, team_id: int, user_id: int):
-    permissions.check_team_access(data_base, team_id, user_id)
-    return custom_field_crud.get_custom_fields_by_team(db=data_base, team_id=team_id)
+    permissions.ensure_team_access(data_base, team_id, user_id)
+    return cache.cache.get_or_load(
+        cache.key("team_custom_fields", team_id),
+        lambda: cache.serialize(custom_field_schema.CustomField,
+                                custom_field_crud.get_custom_fields_by_team(db=data_base, team_id=team_id)),
+    )
 
 
 def update_custom_field_service(data_base: orm.Session, field_id: int, user_id: int,
@@ -32,7 +38,9 @@ def update_custom_field_service(data_base: orm.Session, field_id: int, user_id:
     if not db_field:
         raise exception.NotFoundError("Кастомное поле не найдено")
     permissions.check_team_access(data_base, db_field.team_id, user_id, need_lead=True)
-    return custom_field_crud.update_custom_field(db=data_base, field_id=field_id, field_update=field_update)
+    updated_field = custom_field_crud.update_custom_field(db=data_base, field_id=field_id, field_update=field_update)
+    data_base.commit()
+    return updated_field
 
 
 def delete_custom_field_service(data_base: orm.Session, field_id: int, user_id: int):
@@ -41,4 +49,6 @@ def delete_custom_field_service(data_base: orm.Session, field_id: int, user_id:
     if not db_field:
         raise exception.NotFoundError("Кастомное поле не найдено")
     permissions.check_team_access(data_base, db_field.team_id, user_id, need_lead=True)
-    return custom_field_crud.delete_custom_field(db=data_base, field_id=field_id)
+    deleted_field = custom_field_crud.delete_custom_field(db=data_base, field_id=field_id)
+    data_base.commit()
+    return deleted_field
@@ -1,14 +1,21 @@
 from sqlalchemy import orm
 
-from app.core import exception
+from app.core import cache, exception, replica, versioning
 from app.crud import goal as goal_crud
+from app.crud import position as position_crud
 from app.models import goal
+from app.schemas import goal as goal_schemas
 from app.services import permissions
 
 
 def get_stream_goals_service(data_base: orm.Session, stream_id: int, user_id: int):
-    permissions.check_stream_access(data_base, stream_id, user_id)
-    return goal_crud.get_goals_by_stream(data_base, stream_id)
+    permissions.ensure_stream_access(data_base, stream_id, user_id)
+    return cache.cache.get_or_load(
+        cache.key("stream_goals", stream_id),
+        lambda: cache.serialize(goal_schemas.GoalResponse, goal_crud.get_goals_by_stream(data_base, stream_id)),
+        # данные с реплики могут отставать и в общий кэш не попадают
+        store=not replica.is_replica(data_base),
+    )
 
 
 def create_goal_service(data_base: orm.Session, stream_id: int, user_id: int, goal_data):
@@ -22,7 +29,9 @@ def create_goal_service(data_base: orm.Session, stream_id: int, user_id: int, go
             goal.Goal.position.desc()).first()
         goal_data.position = (last.position + 1) if last else 1
 
-    return goal_crud.create_goal(data_base, stream_id, goal_data)
+    new_goal = goal_crud.create_goal(data_base, stream_id, goal_data)
+    data_base.commit()
+    return new_goal
 
 
 def update_goal_service(data_base: orm.Session, goal_id: int, user_id: int, goal_update_data):
@@ -43,7 +52,9 @@ def update_goal_service(data_base: orm.Session, goal_id: int, user_id: int, goal
             if existing:
                 raise exception.ConflictError("Цель с таким названием уже существует в стриме")
 
-    return goal_crud.update_goal(data_base, goal_obj, goal_update_data)
+    goal_obj = goal_crud.update_goal(data_base, goal_obj, goal_update_data)
+    data_base.commit()
+    return goal_obj
 
 
 def delete_goal_service(data_base: orm.Session, goal_id: int, user_id: int):
@@ -54,3 +65,22 @@ def delete_goal_service(data_base: orm.Session, goal_id: int, user_id: int):
     permissions.check_stream_access(data_base, goal_obj.stream_id, user_id, need_lead=True)
 
     goal_crud.delete_goal(data_base, goal_obj)
+    data_base.commit()
+
+
+def reorder_stream_goals_service(data_base: orm.Session, stream_id: int, user_id: int, ids: list[int]):
+    """Расставить цели стрима в порядке ids одним UPDATE"""
+    permissions.check_stream_access(data_base, stream_id, user_id, need_lead=True)
+
+    current = position_crud.get_positions(data_base, goal.Goal, goal.Goal.stream_id, stream_id)
+    if current.keys() != set(ids):
+        raise exception.ValidationError("Нужно передать все цели стрима и только их")
+
+    changes = position_crud.position_changes(current, ids)
+    if not changes:
+        return
+
+    position_crud.set_positions(data_base, goal.Goal, {goal_id: new for goal_id, (_, new) in changes.items()})
+    cache.invalidate_on_commit(data_base, cache.key("stream_goals", stream_id))
+    versioning.bump_streams(data_base, [stream_id])
+    data_base.commit()
@@ -1,74 +1,210 @@
-from sqlalchemy import orm
+from sqlalchemy import event, orm
 
-from app.core import exception
+from app.core import exception, hierarchy, replica
 from app.crud import project as project_crud
 from app.crud import stream as stream_crud
 from app.crud import task as task_crud
-from app.models import role, team
+from app.crud import team as team_crud
+from app.models import role
+
+_ACCESS_CONTEXT_KEY = "access_context"
+
+
+class AccessContext:
+    """Найденные в рамках одной сессии (одного запроса) команды, проекты, стримы, задачи и членства.
+
+    Объекты, прочитанные с реплики, в общий индекс иерархии не попадают: реплика может отставать.
+    """
+
+    def __init__(self, shared: bool = True):
+        self.shared = shared
+        self.teams = {}
+        self.projects = {}
+        self.streams = {}
+        self.tasks = {}
+        self.user_teams = {}
+
+
+def get_access_context(data_base: orm.Session) -> AccessContext:
+    """Контекст проверок доступа, привязанный к сессии; живет, пока живет сессия запроса"""
+    if _ACCESS_CONTEXT_KEY not in data_base.info:
+        data_base.info[_ACCESS_CONTEXT_KEY] = AccessContext(shared=not replica.is_replica(data_base))
+    return data_base.info[_ACCESS_CONTEXT_KEY]
+
+
+def reset_access_context(data_base: orm.Session):
+    """Забыть найденные объекты, например если одна сессия обслуживает несколько запросов"""
+    data_base.info.pop(_ACCESS_CONTEXT_KEY, None)
+
+
+def _forget_deleted(session: orm.Session, flush_context):
+    """Убрать из контекста объекты, удаленные в этой сессии"""
+    context = session.info.get(_ACCESS_CONTEXT_KEY)
+    if context is None or not session.deleted:
+        return
+
+    deleted = {id(obj) for obj in session.deleted}
+    for cache in (context.teams, context.projects, context.streams, context.tasks, context.user_teams):
+        for key in [key for key, obj in cache.items() if id(obj) in deleted]:
+            del cache[key]
+
+
+event.listen(orm.Session, "after_flush", _forget_deleted)
+
+
+def _remember(context: AccessContext, user_id: int, task_obj=None, stream_obj=None, project_obj=None,
+              team_obj=None, user_team=None):
+    """Запомнить найденные объекты; отсутствие объекта не запоминается"""
+    if task_obj is not None:
+        context.tasks[task_obj.id] = task_obj
+    if stream_obj is not None:
+        context.streams[stream_obj.id] = stream_obj
+        if context.shared:
+            hierarchy.index.remember_stream(stream_obj.id, stream_obj.project_id)
+    if project_obj is not None:
+        context.projects[project_obj.id] = project_obj
+        if context.shared:
+            hierarchy.index.remember_project(project_obj.id, project_obj.team_id)
+    if team_obj is not None:
+        context.teams[team_obj.id] = team_obj
+    if user_team is not None:
+        context.user_teams[(user_team.team_id, user_id)] = user_team
+        if context.shared:
+            hierarchy.index.remember_role(user_id, user_team.team_id, user_team.role_id)
+
+
+def _check_role_id(role_id: int, need_lead: bool):
+    if need_lead and role_id != role.Role.EDITOR:
+        raise exception.ForbiddenError("У вас нет прав на выполнение этого действия")
+
+
+def _check_role(user_team, need_lead: bool):
+    _check_role_id(user_team.role_id, need_lead)
+
+
+def _check_project_membership(project_obj, user_team, need_lead: bool):
+    if not project_obj:
+        raise exception.NotFoundError("Проект не найден")
+
+    if not user_team:
+        raise exception.ForbiddenError("Вы должны состоять в команде проекта")
+
+    _check_role(user_team, need_lead)
 
 
 def check_team_access(data_base: orm.Session, team_id: int, user_id: int, need_lead: bool = False):
     """Проверить, что пользователь имеет доступ к команде."""
-    team_obj = data_base.query(team.Team).filter(team.Team.id == team_id).first()
+    context = get_access_context(data_base)
+    team_obj = context.teams.get(team_id)
+    user_team = context.user_teams.get((team_id, user_id))
+
+    if team_obj is None or user_team is None:
+        team_obj, user_team = team_crud.get_team_with_user_team(data_base, team_id, user_id) or (None, None)
+        _remember(context, user_id, team_obj=team_obj, user_team=user_team)
+
     if not team_obj:
         raise exception.NotFoundError("Команда не найдена")
 
-    user_team = data_base.query(team.UserTeam).filter(
-        team.UserTeam.team_id == team_id,
-        team.UserTeam.user_id == user_id
-    ).first()
-
     if not user_team:
         raise exception.ForbiddenError("У вас нет доступа к этой команде")
 
-    if need_lead and user_team.role_id != role.Role.EDITOR:
-        raise exception.ForbiddenError("У вас нет прав на выполнение этого действия")
+    _check_role(user_team, need_lead)
 
     return team_obj, user_team
 
 
 def check_project_access(data_base: orm.Session, project_id: int, user_id: int, need_lead: bool = False):
     """Проверить, что пользователь имеет доступ к проекту."""
-    project_obj = project_crud.get_project_by_id(data_base, project_id)
-    if not project_obj:
-        raise exception.NotFoundError("Проект не найден")
+    context = get_access_context(data_base)
+    project_obj = context.projects.get(project_id)
+    user_team = context.user_teams.get((project_obj.team_id, user_id)) if project_obj is not None else None
 
-    user_team = data_base.query(team.UserTeam).filter(
-        team.UserTeam.team_id == project_obj.team_id,
-        team.UserTeam.user_id == user_id
-    ).first()
+    if project_obj is None or user_team is None:
+        project_obj, user_team = project_crud.get_project_with_user_team(data_base, project_id, user_id) or (None, None)
+        _remember(context, user_id, project_obj=project_obj, user_team=user_team)
 
-    if not user_team:
-        raise exception.ForbiddenError("Вы должны состоять в команде проекта")
-
-    if need_lead and user_team.role_id != role.Role.EDITOR:
-        raise exception.ForbiddenError("У вас нет прав на выполнение этого действия")
+    _check_project_membership(project_obj, user_team, need_lead)
 
     return project_obj, user_team
 
 
 def check_stream_access(data_base: orm.Session, stream_id: int, user_id: int, need_lead: bool = False):
     """Проверить, что пользователь имеет доступ к стриму."""
-    stream_obj = stream_crud.get_stream_by_id(data_base, stream_id)
+    context = get_access_context(data_base)
+    stream_obj = context.streams.get(stream_id)
+    if stream_obj is not None:
+        project_obj, user_team = check_project_access(data_base, stream_obj.project_id, user_id, need_lead=need_lead)
+        return stream_obj, project_obj, user_team
+
+    stream_obj, project_obj, user_team = stream_crud.get_stream_with_access(data_base, stream_id, user_id) or (
+        None, None, None)
+    _remember(context, user_id, stream_obj=stream_obj, project_obj=project_obj, user_team=user_team)
+
     if not stream_obj:
         raise exception.NotFoundError("Стрим не найден")
 
-    project_obj, user_team = check_project_access(data_base, stream_obj.project_id, user_id, need_lead=need_lead)
+    _check_project_membership(project_obj, user_team, need_lead)
 
     return stream_obj, project_obj, user_team
 
 
 def check_task_access(data_base: orm.Session, task_id: int, user_id: int, need_lead: bool = False):
     """Проверить, что пользователь имеет доступ к задаче."""
-    task_obj = task_crud.get_task_by_id(data_base, task_id)
+    context = get_access_context(data_base)
+    task_obj = context.tasks.get(task_id)
+    if task_obj is not None:
+        stream_obj, project_obj, user_team = check_stream_access(data_base, task_obj.stream_id, user_id,
+                                                                 need_lead=need_lead)
+        return task_obj, stream_obj, project_obj, user_team
+
+    task_obj, stream_obj, project_obj, user_team = task_crud.get_task_with_access(data_base, task_id, user_id) or (
+        None, None, None, None)
+    _remember(context, user_id, task_obj=task_obj, stream_obj=stream_obj, project_obj=project_obj,
+              user_team=user_team)
+
     if not task_obj:
         raise exception.NotFoundError("Задача не найдена")
 
-    stream_obj, project_obj, user_team = check_stream_access(data_base, task_obj.stream_id, user_id, need_lead=need_lead)
+    if not stream_obj:
+        raise exception.NotFoundError("Стрим не найден")
+
+    _check_project_membership(project_obj, user_team, need_lead)
 
     return task_obj, stream_obj, project_obj, user_team
 
 
+def ensure_team_access(data_base: orm.Session, team_id: int, user_id: int, need_lead: bool = False):
+    """Проверить доступ к команде, не загружая объекты, если роль уже есть в индексе иерархии"""
+    role_id = hierarchy.index.get_role(user_id, team_id)
+    if role_id is None:
+        _, user_team = check_team_access(data_base, team_id, user_id)
+        role_id = user_team.role_id
+
+    _check_role_id(role_id, need_lead)
+
+
+def ensure_project_access(data_base: orm.Session, project_id: int, user_id: int, need_lead: bool = False):
+    """Проверить доступ к проекту, не загружая объекты, если проект и роль уже есть в индексе иерархии"""
+    team_id = hierarchy.index.get_project_team(project_id)
+    role_id = hierarchy.index.get_role(user_id, team_id) if team_id is not None else None
+    if role_id is None:
+        _, user_team = check_project_access(data_base, project_id, user_id)
+        role_id = user_team.role_id
+
+    _check_role_id(role_id, need_lead)
+
+
+def ensure_stream_access(data_base: orm.Session, stream_id: int, user_id: int, need_lead: bool = False):
+    """Проверить доступ к стриму, не загружая объекты, если вся цепочка уже есть в индексе иерархии"""
+    project_id = hierarchy.index.get_stream_project(stream_id)
+    if project_id is None:
+        _, _, user_team = check_stream_access(data_base, stream_id, user_id)
+        _check_role_id(user_team.role_id, need_lead)
+        return
+
+    ensure_project_access(data_base, project_id, user_id, need_lead=need_lead)
+
+
 def check_editor_permission(user_team):
     """Проверить, что у пользователя права редактора."""
     if user_team.role_id != role.Role.EDITOR:
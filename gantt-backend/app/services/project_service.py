@@ -1,24 +1,70 @@
 from sqlalchemy import orm
 
-from app.core import exception
+from app.core import cache, exception
+from app.crud import goal as goal_crud
 from app.crud import project as project_crud
+from app.crud import stream as stream_crud
+from app.crud import task as task_crud
 from app.models import goal, stream, task
+from app.schemas import project as project_schemas
 from app.services import permissions
 
 
 def get_team_projects_service(data_base: orm.Session, team_id: int, user_id: int):
-    permissions.check_team_access(data_base, team_id, user_id)
-    return project_crud.get_projects_by_team(data_base, team_id)
+    permissions.ensure_team_access(data_base, team_id, user_id)
+    return cache.cache.get_or_load(
+        cache.key("team_projects", team_id),
+        lambda: cache.serialize(project_schemas.ProjectResponse, project_crud.get_projects_by_team(data_base, team_id)),
+    )
+
+
+def get_project_version_service(data_base: orm.Session, proj_id: int, user_id: int):
+    """Получить версию содержимого проекта с проверкой доступа"""
+    row = project_crud.get_project_version_for_user(data_base, proj_id, user_id)
+    if not row:
+        raise exception.NotFoundError("Проект не найден")
+
+    version, user_team_id = row
+    if user_team_id is None:
+        raise exception.ForbiddenError("Вы должны состоять в команде проекта")
+
+    return version
+
+
+def get_project_gantt_service(data_base: orm.Session, proj_id: int, user_id: int):
+    """Получить стримы, цели, задачи и связи проекта для диаграммы Ганта одной проверкой доступа"""
+    project_obj, _ = permissions.check_project_access(data_base, proj_id, user_id)
+
+    streams = stream_crud.get_streams_by_project_id(data_base, proj_id)
+    goals = goal_crud.get_goals_by_project(data_base, proj_id)
+    tasks = task_crud.get_tasks_by_project(data_base, project_obj)
+
+    relations = {}
+    for task_obj in tasks:
+        for relation in task_obj.relations:
+            relations.setdefault(relation.id, relation)
+
+    return {
+        "project": project_obj,
+        "streams": streams,
+        "goals": goals,
+        "tasks": tasks,
+        "relations": list(relations.values()),
+    }
 
 
 def create_project_service(data_base: orm.Session, team_id: int, user_id: int, project_data):
     permissions.check_team_access(data_base, team_id, user_id, need_lead=True)
-    return project_crud.create_project(data_base, team_id, project_data)
+    new_project = project_crud.create_project(data_base, team_id, project_data)
+    data_base.commit()
+    return new_project
 
 
 def update_project_service(data_base: orm.Session, proj_id: int, user_id: int, update_data):
     project_obj, _ = permissions.check_project_access(data_base, proj_id, user_id, need_lead=True)
-    return project_crud.update_project(data_base, project_obj, update_data)
+    project_obj = project_crud.update_project(data_base, project_obj, update_data)
+    data_base.commit()
+    return project_obj
 
 
 def delete_project_service(data_base: orm.Session, proj_id: int, user_id: int):
@@ -35,3 +81,4 @@ def delete_project_service(data_base: orm.Session, proj_id: int, user_id: int):
         data_base.query(stream.Stream).filter(stream.Stream.project_id == proj_id).delete(synchronize_session=False)
 
     project_crud.delete_project(data_base, project_obj)
+    data_base.commit()
@@ -1,9 +1,8 @@
 import json
 
-from pywebpush import webpush
 from sqlalchemy import orm
 
-from app.core import exception
+from app.core import exception, metrics
 from app.core.config import settings
 from app.core.db import SessionLocal
 from app.crud import push as push_crud
@@ -16,6 +15,9 @@ from app.crud import team as team_crud
 
 def send_push(reminder_id: int):
     """Отправить push уведомление по напоминанию"""
+    # pywebpush тянет aiohttp и cryptography; импорт при первой отправке ускоряет старт воркера
+    from pywebpush import webpush
+
     db = SessionLocal()
 
     reminder = reminder_crud.get_reminder_by_id(db, reminder_id)
@@ -58,9 +60,12 @@ def send_push(reminder_id: int):
                 vapid_claims={"sub": settings.VAPID_CLAIMS_SUB},
             )
         except Exception:
-            pass
+            metrics.registry.record_push("failed")
+        else:
+            metrics.registry.record_push("sent")
 
     reminder_crud.mark_as_sent(db, reminder)
+    db.commit()
     db.close()
 
 
@@ -72,7 +77,6 @@ def create_push_subscription_service(
         data_base, user_id=user_id, endpoint=endpoint, p256dh=p256dh, auth=auth
     )
     data_base.commit()
-    data_base.refresh(subscription)
     return subscription
 
 
@@ -93,3 +97,4 @@ def delete_push_subscription_service(
         raise exception.ForbiddenError("Вы не можете удалить чужую подписку")
 
     push_crud.delete_subscription(data_base, subscription)
+    data_base.commit()
@@ -43,7 +43,6 @@ def create_reminder_service(
         remind_at=reminder_data.remind_at
     )
     data_base.commit()
-    data_base.refresh(reminder)
     return reminder
 
 
@@ -64,7 +63,9 @@ def update_reminder_service(
     if reminder_data.remind_at and reminder_data.remind_at < datetime.utcnow():
         raise exception.ConflictError("Время напоминания не может быть в прошлом")
 
-    return reminder_crud.update_reminder(data_base, reminder, reminder_data)
+    reminder = reminder_crud.update_reminder(data_base, reminder, reminder_data)
+    data_base.commit()
+    return reminder
 
 
 def delete_reminder_service(data_base: orm.Session, reminder_id: int, user_id: int):
@@ -77,4 +78,5 @@ def delete_reminder_service(data_base: orm.Session, reminder_id: int, user_id: i
         raise exception.ForbiddenError("Вы не можете удалить это напоминание")
 
     reminder_crud.delete_reminder(data_base, reminder)
+    data_base.commit()
 
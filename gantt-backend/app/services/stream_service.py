@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 
-from app.core import exception
+from app.core import cache, exception, replica, versioning
+from app.crud import position as position_crud
 from app.crud import stream as stream_crud
 from app.models import stream as stream_model
 from app.schemas import stream as stream_schemas
@@ -9,9 +10,14 @@ from app.services import permissions
 
 def get_project_streams_service(data_base: Session, project_id: int, user_id: int):
     """Получить все стримы проекта"""
-    permissions.check_project_access(data_base, project_id, user_id)
-    streams = stream_crud.get_streams_by_project_id(data_base, project_id)
-    return streams
+    permissions.ensure_project_access(data_base, project_id, user_id)
+    return cache.cache.get_or_load(
+        cache.key("project_streams", project_id),
+        lambda: cache.serialize(stream_schemas.StreamResponse,
+                                stream_crud.get_streams_by_project_id(data_base, project_id)),
+        # данные с реплики могут отставать и в общий кэш не попадают
+        store=not replica.is_replica(data_base),
+    )
 
 
 def get_stream_service(data_base: Session, stream_id: int, user_id: int):
@@ -20,6 +26,19 @@ def get_stream_service(data_base: Session, stream_id: int, user_id: int):
     return stream
 
 
+def get_stream_version_service(data_base: Session, stream_id: int, user_id: int):
+    """Получить версию содержимого стрима с проверкой доступа"""
+    row = stream_crud.get_stream_version_for_user(data_base, stream_id, user_id)
+    if not row:
+        raise exception.NotFoundError("Стрим не найден")
+
+    version, user_team_id = row
+    if user_team_id is None:
+        raise exception.ForbiddenError("Вы должны состоять в команде проекта")
+
+    return version
+
+
 def create_stream_service(data_base: Session, project_id: int, stream_data: stream_schemas.StreamCreate, user_id: int):
     """Создать новый стрим"""
     _, user_team = permissions.check_project_access(data_base, project_id, user_id)
@@ -37,6 +56,7 @@ def create_stream_service(data_base: Session, project_id: int, stream_data: stre
         stream_data.position = (last_stream.position + 1) if last_stream else 1
 
     new_stream = stream_crud.create_new_stream(data_base, project_id, stream_data)
+    data_base.commit()
     return new_stream
 
 
@@ -47,6 +67,7 @@ def update_stream_service(data_base: Session, stream_id: int, update_data: strea
     permissions.check_editor_permission(user_team)
 
     updated_stream = stream_crud.update_stream(data_base, stream, update_data)
+    data_base.commit()
     return updated_stream
 
 
@@ -57,3 +78,25 @@ def delete_stream_service(data_base: Session, stream_id: int, user_id: int):
     permissions.check_editor_permission(user_team)
 
     stream_crud.delete_stream(data_base, stream_id)
+    data_base.commit()
+
+
+def reorder_project_streams_service(data_base: Session, project_id: int, user_id: int, ids: list[int]):
+    """Расставить стримы проекта в порядке ids одним UPDATE"""
+    _, user_team = permissions.check_project_access(data_base, project_id, user_id)
+
+    permissions.check_editor_permission(user_team)
+
+    current = position_crud.get_positions(data_base, stream_model.Stream, stream_model.Stream.project_id, project_id)
+    if current.keys() != set(ids):
+        raise exception.ValidationError("Нужно передать все стримы проекта и только их")
+
+    changes = position_crud.position_changes(current, ids)
+    if not changes:
+        return
+
+    position_crud.set_positions(data_base, stream_model.Stream,
+                                {stream_id: new for stream_id, (_, new) in changes.items()})
+    cache.invalidate_on_commit(data_base, cache.key("project_streams", project_id))
+    versioning.bump_projects(data_base, [project_id])
+    data_base.commit()
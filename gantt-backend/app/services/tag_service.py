@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
-from app.core import exception
+from app.core import cache, exception
 from app.crud import tag as tag_crud
+from app.schemas import tag as tag_schemas
 from app.services import permissions
 
 
@@ -8,14 +9,19 @@ def create_tag_service(data_base: Session, team_id: int, user_id: int, tag_data)
     """Создать новый тег"""
     permissions.check_team_access(data_base, team_id, user_id)
 
-    return tag_crud.create_tag(data_base, team_id, tag_data.name, tag_data.color)
+    new_tag = tag_crud.create_tag(data_base, team_id, tag_data.name, tag_data.color)
+    data_base.commit()
+    return new_tag
 
 
 def get_team_tags_service(data_base: Session, team_id: int, user_id: int):
     """Получить все теги команды"""
-    permissions.check_team_access(data_base, team_id, user_id)
+    permissions.ensure_team_access(data_base, team_id, user_id)
 
-    return tag_crud.get_team_tags(data_base, team_id)
+    return cache.cache.get_or_load(
+        cache.key("team_tags", team_id),
+        lambda: cache.serialize(tag_schemas.TagResponse, tag_crud.get_team_tags(data_base, team_id)),
+    )
 
 
 def delete_tag_service(data_base: Session, tag_id: int, user_id: int):
@@ -28,3 +34,4 @@ def delete_tag_service(data_base: Session, tag_id: int, user_id: int):
     permissions.check_team_access(data_base, tag_obj.team_id, user_id)
 
     tag_crud.delete_tag(data_base, tag_obj)
+    data_base.commit()
@@ -1,40 +1,48 @@
+import base64
+import binascii
+
 from sqlalchemy import orm
 
-from app.core import exception
-from app.crud import task as task_crud, custom_field as custom_field_crud
+from app.core import exception, versioning
+from app.crud import task as task_crud, custom_field as custom_field_crud, position as position_crud
 from app.models import meta, project, task, team, user, tag, stream, custom_field
 from app.services import permissions
 
 
-def get_all_tasks_service(data_base: orm.Session, user_id: int):
-    user_teams = data_base.query(team.UserTeam).filter(team.UserTeam.user_id == user_id).all()
+def _encode_task_cursor(task_obj) -> str:
+    key = f"{task_obj.stream_id}:{task_obj.position}:{task_obj.id}"
+    return base64.urlsafe_b64encode(key.encode()).decode()
 
-    if not user_teams:
-        return []
 
-    tasks = []
+def _decode_task_cursor(cursor: str) -> tuple[int, int, int]:
+    try:
+        stream_id, position, task_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return int(stream_id), int(position), int(task_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise exception.ValidationError("Некорректный курсор")
 
-    for user_team in user_teams:
-        team_projects = data_base.query(project.Project).filter(project.Project.team_id == user_team.team_id).all()
 
-        for project_obj in team_projects:
-            for stream_obj in project_obj.streams:
-                stream_tasks = data_base.query(task.Task).filter(task.Task.stream_id == stream_obj.id).all()
+def get_all_tasks_service(data_base: orm.Session, user_id: int, filters=None, cursor: str | None = None,
+                          limit: int | None = None):
+    """Получить страницу задач пользователя и курсор следующей страницы."""
+    after = _decode_task_cursor(cursor) if cursor else None
+    tasks = task_crud.get_tasks_with_context_by_user(data_base, user_id, filters, after,
+                                                     limit + 1 if limit is not None else None)
 
-                for task_obj in stream_tasks:
-                    task_obj.team_id = project_obj.team_id
-                    task_obj.team_name = project_obj.team.name if project_obj.team else None
-                    task_obj.project_name = project_obj.name
-                    task_obj.stream_name = stream_obj.name
-                    tasks.append(task_obj)
+    next_cursor = None
+    if limit is not None and len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = _encode_task_cursor(tasks[-1])
 
-                    if task_obj.assigned_users:
-                        task_obj.assignee_email = task_obj.assigned_users[0].user.email
+    return tasks, next_cursor
 
-    return tasks
 
+def iter_all_tasks_service(data_base: orm.Session, user_id: int, filters=None):
+    """Итерироваться по всем задачам пользователя без разбиения на страницы."""
+    return task_crud.iter_tasks_with_context_by_user(data_base, user_id, filters)
 
-def get_project_tasks_service(data_base: orm.Session, project_id: int, user_id: int):
+
+def _get_accessible_project(data_base: orm.Session, project_id: int, user_id: int):
     project_obj = data_base.query(project.Project).filter(project.Project.id == project_id).first()
     if not project_obj:
         raise exception.NotFoundError("Проект не найден")
@@ -44,14 +52,51 @@ def get_project_tasks_service(data_base: orm.Session, project_id: int, user_id:
     if not user_team:
         raise exception.ForbiddenError("У вас нет доступа к проекту")
 
+    return project_obj
+
+
+def get_project_tasks_service(data_base: orm.Session, project_id: int, user_id: int):
+    project_obj = _get_accessible_project(data_base, project_id, user_id)
     return task_crud.get_tasks_by_project(data_base, project_obj)
 
 
+def iter_project_tasks_service(data_base: orm.Session, project_id: int, user_id: int):
+    project_obj = _get_accessible_project(data_base, project_id, user_id)
+    return task_crud.iter_tasks_by_project(data_base, project_obj)
+
+
 def get_stream_tasks_service(data_base: orm.Session, stream_id: int, user_id: int):
-    permissions.check_stream_access(data_base, stream_id, user_id)
+    permissions.ensure_stream_access(data_base, stream_id, user_id)
     return task_crud.get_tasks_by_stream(data_base, stream_id)
 
 
+def iter_stream_tasks_service(data_base: orm.Session, stream_id: int, user_id: int):
+    permissions.ensure_stream_access(data_base, stream_id, user_id)
+    return task_crud.iter_tasks_by_stream(data_base, stream_id)
+
+
+_CUSTOM_FIELD_VALUE_COLUMNS = ("value_string", "value_text", "value_date", "value_datetime", "value_bool")
+
+
+def _custom_field_value(field_value):
+    """Заданное значение кастомного поля: у значения заполнена одна из колонок value_*"""
+    return next((value for value in (getattr(field_value, column) for column in _CUSTOM_FIELD_VALUE_COLUMNS)
+                 if value is not None), None)
+
+
+def _check_tags(data_base: orm.Session, tag_ids, team_id: int):
+    """Проверить одним запросом, что все теги существуют и принадлежат команде"""
+    tags_by_id = {tag_obj.id: tag_obj for tag_obj in data_base.query(tag.Tag).filter(tag.Tag.id.in_(tag_ids))}
+    for tag_id in tag_ids:
+        tag_obj = tags_by_id.get(tag_id)
+
+        if not tag_obj:
+            raise exception.NotFoundError(f"Тег с id {tag_id} не найден")
+
+        if tag_obj.team_id != team_id:
+            raise exception.ForbiddenError("Тег принадлежит другой команде")
+
+
 def create_task_service(data_base: orm.Session, stream_id: int, user_id: int, task_data):
     permissions.check_stream_access(data_base, stream_id, user_id, need_lead=True)
 
@@ -75,27 +120,71 @@ def create_task_service(data_base: orm.Session, stream_id: int, user_id: int, ta
         if not stream_obj:
             raise exception.NotFoundError("Стрим не найден")
 
-        team_id = stream_obj.project.team_id
+        _check_tags(data_base, task_data.tag_ids, stream_obj.project.team_id)
+        data_base.add_all(tag.TaskTag(task_id=new_task.id, tag_id=tag_id) for tag_id in task_data.tag_ids)
+
+    if task_data.custom_fields:
+        custom_field_crud.set_task_custom_field_values(data_base, new_task.id, task_data.custom_fields)
+
+    data_base.commit()
+    return new_task
 
-        for tag_id in task_data.tag_ids:
 
-            tag_obj = data_base.query(tag.Tag).filter(tag.Tag.id == tag_id).first()
+def create_tasks_bulk_service(data_base: orm.Session, stream_id: int, user_id: int, tasks_data) -> list[int]:
+    """Создать задачи стрима пачкой: проверки и вставки идут пакетами, а не по запросу на задачу"""
+    _, project_obj, _ = permissions.check_stream_access(data_base, stream_id, user_id, need_lead=True)
 
-            if not tag_obj:
-                raise exception.NotFoundError(f"Тег с id {tag_id} не найден")
+    emails = {task_data.assignee_email for task_data in tasks_data if task_data.assignee_email}
+    user_ids = dict(data_base.query(user.User.email, user.User.id).filter(user.User.email.in_(emails))) if emails else {}
+    if len(user_ids) != len(emails):
+        raise exception.NotFoundError("Пользователь не найден")
 
-            if tag_obj.team_id != team_id:
-                raise exception.ForbiddenError("Тег принадлежит другой команде")
+    tag_ids = list(dict.fromkeys(tag_id for task_data in tasks_data for tag_id in task_data.tag_ids or ()))
+    if tag_ids:
+        _check_tags(data_base, tag_ids, project_obj.team_id)
 
-            data_base.add(tag.TaskTag(task_id=new_task.id, tag_id=tag_id))
+    next_position = (task_crud.get_last_task_position(data_base, stream_id) or 0) + 1
+    for task_data in tasks_data:
+        if task_data.position is None:
+            task_data.position = next_position
+            next_position += 1
 
-    if task_data.custom_fields:
-        for field_value in task_data.custom_fields:
-            custom_field_crud.set_task_custom_field_value(data_base, new_task.id, field_value)
+    task_ids = task_crud.insert_tasks(data_base, stream_id, tasks_data)
+
+    assignees, task_tags, custom_field_values = [], [], []
+    for task_id, task_data in zip(task_ids, tasks_data, strict=True):
+        if task_data.assignee_email:
+            assignees.append({"user_id": user_ids[task_data.assignee_email], "task_id": task_id})
+        task_tags.extend({"task_id": task_id, "tag_id": tag_id} for tag_id in dict.fromkeys(task_data.tag_ids or ()))
+        # Как и при создании одной задачи, повторное значение поля заменяет предыдущее
+        field_values = {field_value.custom_field_id: field_value for field_value in task_data.custom_fields or ()}
+        custom_field_values.extend({"task_id": task_id, **field_value.model_dump()}
+                                   for field_value in field_values.values())
+
+    task_crud.insert_task_links(data_base, assignees, task_tags, custom_field_values)
+    # Пакетные вставки идут мимо flush, поэтому версию стрима для ETag увеличиваем явно
+    versioning.bump_streams(data_base, [stream_id])
 
     data_base.commit()
-    data_base.refresh(new_task)
-    return new_task
+    return task_ids
+
+
+def reorder_stream_tasks_service(data_base: orm.Session, stream_id: int, user_id: int, ids: list[int]):
+    """Расставить задачи стрима в порядке ids одним UPDATE; сдвиги пишутся в историю одной пачкой"""
+    permissions.check_stream_access(data_base, stream_id, user_id, need_lead=True)
+
+    current = position_crud.get_positions(data_base, task.Task, task.Task.stream_id, stream_id)
+    if current.keys() != set(ids):
+        raise exception.ValidationError("Нужно передать все задачи стрима и только их")
+
+    changes = position_crud.position_changes(current, ids)
+    if not changes:
+        return
+
+    position_crud.set_positions(data_base, task.Task, {task_id: new for task_id, (_, new) in changes.items()})
+    task_crud.insert_task_history(data_base, user_id, "position", changes)
+    versioning.bump_streams(data_base, [stream_id])
+    data_base.commit()
 
 
 def update_task_service(data_base: orm.Session, task_id: int, user_id: int, task_update_data):
@@ -133,36 +222,30 @@ def update_task_service(data_base: orm.Session, task_id: int, user_id: int, task
         if old_tag_ids != new_tag_ids:
             changes["tag_ids"] = (old_tag_ids, new_tag_ids)
 
-        data_base.query(tag.TaskTag).filter(tag.TaskTag.task_id == task_id).delete()
-
-        for tag_id in task_update_data.tag_ids:
-
-            tag_obj = data_base.query(tag.Tag).filter(tag.Tag.id == tag_id).first()
-
-            if not tag_obj:
-                raise exception.NotFoundError(f"Тег с id {tag_id} не найден")
+        for task_tag in data_base.query(tag.TaskTag).filter(tag.TaskTag.task_id == task_id).all():
+            data_base.delete(task_tag)
 
-            if tag_obj.team_id != team_obj.id:
-                raise exception.ForbiddenError("Тег принадлежит другой команде")
-
-            data_base.add(tag.TaskTag(task_id=task_id, tag_id=tag_id))
+        _check_tags(data_base, task_update_data.tag_ids, team_obj.id)
+        data_base.add_all(tag.TaskTag(task_id=task_id, tag_id=tag_id) for tag_id in task_update_data.tag_ids)
 
     if task_update_data.custom_fields is not None:
-        old_custom_fields = {cf.custom_field_id: cf.value for cf in task_obj.custom_field_values}
-        new_custom_fields = {cf.custom_field_id: cf.value for cf in task_update_data.custom_fields}
+        old_custom_fields = {cf.custom_field_id: _custom_field_value(cf) for cf in task_obj.custom_field_values}
+        new_custom_fields = {cf.custom_field_id: _custom_field_value(cf) for cf in task_update_data.custom_fields}
         if old_custom_fields != new_custom_fields:
             changes["custom_fields"] = (old_custom_fields, new_custom_fields)
 
-        for field_value in task_update_data.custom_fields:
-            custom_field_crud.set_task_custom_field_value(data_base, task_id, field_value)
+        custom_field_crud.set_task_custom_field_values(data_base, task_id, task_update_data.custom_fields)
 
     task_update_data_filtered = task_update_data.model_dump(exclude_unset=True, exclude={'custom_fields'})
     task_crud.update_task(data_base, task_obj, task_update_data_filtered)
 
     if changes:
         task_crud.create_task_history_entries(data_base, task_id, user_id, changes)
-        data_base.commit()
 
+    data_base.commit()
+    # Исполнитель, теги и значения полей менялись строками связующих таблиц, а сессия не сбрасывает объекты
+    # при коммите: сбрасываем только эти связи, чтобы ответ перечитал их
+    data_base.expire(task_obj, ["assigned_users", "tags", "custom_field_values"])
     return task_obj
 
 
@@ -173,6 +256,7 @@ def delete_task_service(data_base: orm.Session, task_id: int, user_id: int):
         data_base.delete(old_user_task)
 
     task_crud.delete_task(data_base, task_obj)
+    data_base.commit()
 
 
 def delete_task_relation_service(db: orm.Session, relation_id: int, user_id: int):
@@ -199,7 +283,9 @@ def create_task_relation_service(data_base: orm.Session, task_id_1: int, task_id
     if not connection_type:
         raise exception.NotFoundError("Тип связи не найден")
 
-    return task_crud.create_task_relation(data_base, task_id_1, task_id_2, connection_id)
+    relation = task_crud.create_task_relation(data_base, task_id_1, task_id_2, connection_id)
+    data_base.commit()
+    return relation
 
 
 def get_task_history_service(data_base: orm.Session, task_id: int, user_id: int):
@@ -226,5 +312,7 @@ def delete_task_custom_field_service(data_base: orm.Session, task_id: int, custo
     if not custom_field_obj:
         raise exception.NotFoundError()
 
-    return custom_field_crud.delete_task_custom_field_value(data_base, task_id, custom_field_id)
+    deleted_value = custom_field_crud.delete_task_custom_field_value(data_base, task_id, custom_field_id)
+    data_base.commit()
+    return deleted_value
 
@@ -7,7 +7,7 @@ from app.services import permissions
 
 
 def get_team_users_service(data_base: orm.Session, team_id: int, user_id: int):
-    permissions.check_team_access(data_base, team_id, user_id)
+    permissions.ensure_team_access(data_base, team_id, user_id)
 
     users = team_crud.get_team_users(data_base, team_id)
 
@@ -29,7 +29,6 @@ def create_team_service(data_base: orm.Session, owner_id: int, create_data):
     team_crud.add_user_to_team(data_base, team_obj.id, owner_id, role.Role.EDITOR)
 
     data_base.commit()
-    data_base.refresh(team_obj)
     return team_obj
 
 
@@ -58,10 +57,9 @@ def update_team_service(data_base: orm.Session, team_id: int, user_id: int, upda
             if not user:
                 raise exception.NotFoundError(f"Пользователь {email} не найден")
 
-            team_crud.delete_user_from_team(data_base, team_id, user.id)
+            team_crud.delete_member(data_base, team_id, user.id)
 
     data_base.commit()
-    data_base.refresh(team_obj)
     return team_obj
 
 
@@ -88,5 +86,5 @@ def delete_team_service(db: orm.Session, team_id: int, user_id: int):
 
     db.query(team.UserTeam).filter(team.UserTeam.team_id == team_id).delete(synchronize_session=False)
 
-    db.delete(team_obj)
+    team_crud.delete_team(db, team_obj)
     db.commit()
@@ -1,30 +1,90 @@
 from sqlalchemy import orm
+from starlette import concurrency
 
-from app.core import exception, security
+from app.core import exception, security, user_cache
 from app.crud import team as team_crud
 from app.crud import user as user_crud
+from app.schemas import user as user_schemas
+
+
+class CurrentUser:
+    """Текущий пользователь из токена.
+
+    id известен из JWT без запроса к базе, email и nickname берутся из кэша профилей,
+    а строка Users загружается только при обращении к остальным полям.
+    """
+
+    def __init__(self, data_base: orm.Session, user_id: int):
+        self.id = user_id
+        self._data_base = data_base
+        self._profile = None
+        self._user = None
+
+    @property
+    def profile(self) -> user_schemas.UserProfile:
+        if self._profile is None:
+            self._profile = get_user_profile_service(self._data_base, self.id)
+        return self._profile
+
+    @property
+    def email(self) -> str:
+        return self.profile.email
+
+    @property
+    def nickname(self) -> str:
+        return self.profile.nickname
+
+    def __getattr__(self, name: str):
+        # вызывается только для полей, которых нет у самого объекта
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if self._user is None:
+            self._user = get_current_user_service(self._data_base, self.id)
+        return getattr(self._user, name)
 
 
 def get_current_user_service(data_base: orm.Session, user_id: int):
     return user_crud.get_user_by_id(data_base, user_id)
 
 
+def get_user_profile_service(data_base: orm.Session, user_id: int) -> user_schemas.UserProfile:
+    """Публичные поля пользователя через кэш с коротким TTL; password_hash в кэш не попадает"""
+    def load():
+        user_obj = user_crud.get_user_by_id(data_base, user_id)
+        return user_schemas.UserProfile.model_validate(user_obj).model_dump(mode="json")
+
+    return user_schemas.UserProfile.model_validate(user_cache.profiles.get_or_load(user_cache.key(user_id), load))
+
+
 def check_email_exists_service(data_base: orm.Session, email: str):
     u = user_crud.get_user_by_email(data_base, email)
     return u is not None
 
 
-def register_user_service(data_base: orm.Session, email: str, nickname: str, password: str):
-    if user_crud.get_user_by_email(data_base, email):
+def _create_user(data_base: orm.Session, email: str, nickname: str, password_hash: str):
+    new_user = user_crud.create_user(data_base=data_base, email=email, nickname=nickname, password_hash=password_hash)
+    data_base.commit()
+    return new_user
+
+
+def _update_password_hash(data_base: orm.Session, user_obj, password_hash: str):
+    user_crud.update_password_hash(data_base, user_obj, password_hash)
+    data_base.commit()
+
+
+async def register_user_service(data_base: orm.Session, email: str, nickname: str, password: str):
+    """Зарегистрировать пользователя; запросы к базе идут в пуле потоков, хеширование — в пуле процессов"""
+    if await concurrency.run_in_threadpool(user_crud.get_user_by_email, data_base, email):
         raise exception.ConflictError("Email уже используется")
 
-    if user_crud.get_user_by_nickname(data_base, nickname):
+    if await concurrency.run_in_threadpool(user_crud.get_user_by_nickname, data_base, nickname):
         raise exception.ConflictError("Никнейм уже используется")
 
-    hashed_pass = security.get_password_hash(password)
+    hashed_pass = await security.password_hasher.hash(password)
 
     try:
-        new_user = user_crud.create_user(
+        new_user = await concurrency.run_in_threadpool(
+            _create_user,
             data_base=data_base,
             email=email,
             nickname=nickname,
@@ -37,17 +97,25 @@ def register_user_service(data_base: orm.Session, email: str, nickname: str, pas
     return {"access_token": token, "token_type": "Bearer"}
 
 
-def login_user_service(data_base: orm.Session, email: str, password: str):
-    u = user_crud.get_user_by_email(data_base, email)
-    if not u or not security.verify_password(password, u.password_hash):
+async def login_user_service(data_base: orm.Session, email: str, password: str):
+    """Проверить пароль и выдать токен; хеш с устаревшими параметрами пересчитывается при входе"""
+    u = await concurrency.run_in_threadpool(user_crud.get_user_by_email, data_base, email)
+    if not u:
+        raise exception.ForbiddenError("Неверные данные для входа")
+
+    is_valid, new_hash = await security.password_hasher.verify_and_update(password, u.password_hash)
+    if not is_valid:
         raise exception.ForbiddenError("Неверные данные для входа")
 
+    if new_hash:
+        await concurrency.run_in_threadpool(_update_password_hash, data_base, u, new_hash)
+
     token = security.create_access_token({"sub": str(u.id)})
     return {"access_token": token, "token_type": "Bearer"}
 
 
 def get_user_by_token_service(data_base: orm.Session, current_user_id: int):
-    user_obj = user_crud.get_user_by_id(data_base, current_user_id)
+    user_obj = get_user_profile_service(data_base, current_user_id)
     teams = team_crud.get_teams_by_user(data_base, user_obj.id)
     return user_obj, teams
 
@@ -56,6 +124,6 @@ def get_user_service(data_base: orm.Session, requested_user_id: int, current_use
     if requested_user_id != current_user_id:
         raise exception.ForbiddenError("Вы можете получить только свои данные")
 
-    user_obj = user_crud.get_user_by_id(data_base, requested_user_id)
+    user_obj = get_user_profile_service(data_base, requested_user_id)
     teams = team_crud.get_teams_by_user(data_base, requested_user_id)
     return user_obj, teams
\ No newline at end of file
@@ -8,14 +8,17 @@ os.environ.setdefault("AUTH_VAPID_CLAIMS_SUB", "https://gantt-tracker.ru")
 from unittest.mock import patch
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.core.db import get_db
+from app.core import cache, hierarchy, user_cache
+from app.core.db import get_async_db, get_async_read_db, get_db, get_read_db
 from app.core.security import create_access_token, get_password_hash
 from app.models import project, stream, team, user
 from app.models.base import Base
+from app.services import permissions
 
 _engine = create_engine(
     "sqlite://",
@@ -28,7 +31,7 @@ with (
     patch("app.core.db.engine", _engine),
     patch(
         "app.core.db.SessionLocal",
-        sessionmaker(autocommit=False, autoflush=False, bind=_engine),
+        sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=_engine),
     ),
 ):
     from main import app
@@ -38,19 +41,41 @@ with (
 def db_session():
     connection = _engine.connect()
     transaction = connection.begin()
-    session = sessionmaker(bind=connection)()
+    # как в приложении: после коммита объекты не сбрасываются, устаревшие связи сервис сбрасывает сам
+    session = sessionmaker(bind=connection, autoflush=False, expire_on_commit=False)()
     yield session
     session.close()
     transaction.rollback()
     connection.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.cache.clear()
+    hierarchy.index.clear()
+    user_cache.profiles.clear()
+    yield
+    cache.cache.clear()
+    hierarchy.index.clear()
+    user_cache.profiles.clear()
+
+
 @pytest.fixture(scope="function")
 def client(db_session):
     def override_get_db():
+        # в приложении у каждого запроса своя сессия, здесь сессия общая
+        permissions.reset_access_context(db_session)
         yield db_session
 
+    async def override_get_async_db():
+        # асинхронная сессия поверх той же синхронной сессии: run_sync выполняет сервисы на ней
+        permissions.reset_access_context(db_session)
+        yield AsyncSession(sync_session_class=lambda **kwargs: db_session)
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
     with TestClient(app, raise_server_exceptions=False) as client:
         yield client
     app.dependency_overrides.clear()
@@ -89,3 +114,34 @@ def seed_db(db_session):
 def auth_headers():
     token = create_access_token({"sub": "42"})
     return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def query_counter():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def postgres_session():
+    """Сессия на реальном PostgreSQL из TEST_POSTGRES_URL; все изменения откатываются после теста."""
+    url = os.environ.get("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL не задан")
+
+    pg_engine = create_engine(url)
+    connection = pg_engine.connect()
+    transaction = connection.begin()
+    Base.metadata.create_all(bind=connection)
+    session = sessionmaker(bind=connection)()
+    yield session
+    session.close()
+    transaction.rollback()
+    connection.close()
+    pg_engine.dispose()
@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import text
+
+from app.crud import task as task_crud
+from app.models import meta as meta_model
+from app.models import project as project_model
+from app.models import stream as stream_model
+from app.models import task as task_model
+from app.models import team as team_model
+
+
+@pytest.fixture
+def scoped_tasks(seed_db):
+    seed_db.add(team_model.Team(id=99, name="Other team"))
+    seed_db.add(project_model.Project(id=99, name="Other project", team_id=99))
+    seed_db.add(stream_model.Stream(id=99, name="Other stream", project_id=99))
+    seed_db.add(stream_model.Stream(id=43, name="Second stream", project_id=42))
+    seed_db.add(task_model.Task(id=1, name="Mine", stream_id=42, position=1))
+    seed_db.add(task_model.Task(id=2, name="Unassigned", stream_id=43, position=1))
+    seed_db.add(task_model.Task(id=3, name="Foreign", stream_id=99, position=1))
+    seed_db.add(meta_model.UserTask(user_id=42, task_id=1))
+    seed_db.commit()
+    return seed_db
+
+
+@pytest.mark.parametrize(
+    "target, target_ids, expected",
+    [
+        ("all", None, [1, 2]),
+        ("team", [42], [1, 2]),
+        ("teams", [42, 99], [1, 2]),
+        ("project", [42], [1, 2]),
+        ("projects", [99], []),
+        ("stream", [43], [2]),
+        ("streams", [42, 99], [1]),
+    ],
+)
+def test_get_tasks_by_scope(scoped_tasks, target, target_ids, expected):
+    tasks = task_crud.get_tasks_by_scope(scoped_tasks, 42, target, target_ids)
+
+    assert [t.id for t in tasks] == expected
+
+
+def test_get_tasks_by_scope_only_assigned(scoped_tasks):
+    tasks = task_crud.get_tasks_by_scope(scoped_tasks, 42, "all", only_assigned_to_user=True)
+
+    assert [t.id for t in tasks] == [1]
+
+
+def test_get_tasks_by_scope_single_statement(scoped_tasks, query_counter):
+    task_crud.get_tasks_by_scope(scoped_tasks, 42, "teams", [42, 99], only_assigned_to_user=True)
+
+    assert len(query_counter) == 1
+
+
+def test_export_calendar(client, scoped_tasks, auth_headers):
+    response = client.post(
+        "/api/calendar/export", json={"scope": "all", "target": "teams", "target_ids": [42, 99]}, headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    assert response.text.count("BEGIN:VEVENT") == 2
+    assert "Foreign" not in response.text
+
+
+def test_get_tasks_by_scope_postgres_plan(postgres_session):
+    query = task_crud._join_user_teams(postgres_session.query(task_model.Task), 42)
+    statement = query.statement.compile(dialect=postgres_session.bind.dialect, compile_kwargs={"literal_binds": True})
+
+    plan = postgres_session.execute(text(f"EXPLAIN {statement}")).scalars().all()
+
+    assert plan
+    assert not any("SubPlan" in line for line in plan)
@@ -0,0 +1,94 @@
+from datetime import datetime
+
+import pytest
+
+from app.models import goal as goal_model
+from app.models import meta as meta_model
+from app.models import project as project_model
+from app.models import stream as stream_model
+from app.models import task as task_model
+from app.models import team as team_model
+
+
+@pytest.fixture
+def gantt_data(seed_db):
+    seed_db.add(meta_model.ConnectionType(id=1, name="T1 blocks T2"))
+
+    def add_streams(count):
+        task_ids = []
+        for idx in range(count):
+            stream_obj = stream_model.Stream(name=f"Stream {idx}", project_id=42, position=idx + 1)
+            seed_db.add(stream_obj)
+            seed_db.flush()
+            seed_db.add(goal_model.Goal(name=f"Goal {idx}", stream_id=stream_obj.id, position=1,
+                                        deadline=datetime(2026, 12, 31)))
+            task_obj = task_model.Task(name=f"Task {idx}", stream_id=stream_obj.id, position=1)
+            seed_db.add(task_obj)
+            seed_db.flush()
+            if task_ids:
+                seed_db.add(task_model.TaskRelation(task_id_1=task_ids[-1], task_id_2=task_obj.id,
+                                                    connection_id=1))
+            task_ids.append(task_obj.id)
+        seed_db.commit()
+
+    return add_streams
+
+
+def test_get_project_gantt(client, gantt_data, auth_headers):
+    gantt_data(3)
+
+    response = client.get("/api/project/42/gantt", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["project"]["id"] == 42
+    assert [s["name"] for s in data["streams"]] == ["Test stream", "Stream 0", "Stream 1", "Stream 2"]
+    assert len(data["goals"]) == 3
+    assert len(data["tasks"]) == 3
+    assert len(data["relations"]) == 2
+    assert data["relations"][0]["connection_name"] == "T1 blocks T2"
+
+
+def test_get_project_gantt_query_count_does_not_grow(client, gantt_data, auth_headers, query_counter):
+    gantt_data(1)
+    query_counter.clear()
+    client.get("/api/project/42/gantt", headers=auth_headers)
+    small_count = len(query_counter)
+
+    gantt_data(20)
+    query_counter.clear()
+    response = client.get("/api/project/42/gantt", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert len(query_counter) == small_count
+
+
+def test_get_project_gantt_forbidden(client, seed_db, auth_headers):
+    seed_db.add(team_model.Team(id=99, name="Other team"))
+    seed_db.add(project_model.Project(id=99, name="Other project", team_id=99))
+    seed_db.commit()
+
+    response = client.get("/api/project/99/gantt", headers=auth_headers)
+
+    assert response.status_code == 403
+
+
+def test_get_project_gantt_not_found(client, seed_db, auth_headers):
+    response = client.get("/api/project/999/gantt", headers=auth_headers)
+
+    assert response.status_code == 404
+
+
+def test_get_project_gantt_not_modified(client, gantt_data, auth_headers):
+    gantt_data(1)
+    etag = client.get("/api/project/42/gantt", headers=auth_headers).headers["ETag"]
+
+    response = client.get("/api/project/42/gantt", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    response = client.patch("/api/stream/42", json={"name": "Renamed stream"}, headers=auth_headers)
+    assert response.status_code == 200
+
+    response = client.get("/api/project/42/gantt", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["streams"][0]["name"] == "Renamed stream"
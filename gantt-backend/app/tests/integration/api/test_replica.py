@@ -0,0 +1,78 @@
+import pytest
+import sqlalchemy
+from fastapi.testclient import TestClient
+from sqlalchemy import orm
+from sqlalchemy.ext import asyncio
+
+from app.core import cache, db, replica
+from app.models import project, stream, team, user
+from app.models.base import Base
+from main import app
+
+
+def _database(path, stream_name: str) -> sqlalchemy.Engine:
+    engine = sqlalchemy.create_engine(f"sqlite:///{path}")
+    # MetaData.create_all подменен в unit-тестах api, таблицы создаются по одной
+    for table in Base.metadata.sorted_tables:
+        table.create(engine)
+    with orm.Session(engine) as session:
+        session.add(team.Role(id=2, name="Editor"))
+        session.add(user.User(id=42, email="test@test.com", nickname="test_user", password_hash="-"))
+        session.add(team.Team(id=42, name="Test team"))
+        session.add(team.UserTeam(id=42, user_id=42, team_id=42, role_id=2))
+        session.add(project.Project(id=42, name="Test project", team_id=42))
+        session.add(stream.Stream(id=42, name=stream_name, project_id=42))
+        session.commit()
+    return engine
+
+
+@pytest.fixture
+def databases(tmp_path, monkeypatch):
+    """Основная база и реплика в разных файлах; имя стрима показывает, откуда прочитан ответ"""
+    primary = _database(tmp_path / "primary.db", "primary")
+    read = _database(tmp_path / "replica.db", "replica")
+    async_primary = asyncio.create_async_engine(db.async_database_url(str(primary.url)))
+    async_read = asyncio.create_async_engine(db.async_database_url(str(read.url)))
+
+    monkeypatch.setattr(db, "SessionLocal", orm.sessionmaker(bind=primary, expire_on_commit=False))
+    monkeypatch.setattr(db, "ReadSessionLocal", orm.sessionmaker(bind=read, expire_on_commit=False))
+    monkeypatch.setattr(db, "AsyncSessionLocal", asyncio.async_sessionmaker(async_primary, expire_on_commit=False))
+    monkeypatch.setattr(db, "AsyncReadSessionLocal", asyncio.async_sessionmaker(async_read, expire_on_commit=False))
+    replica.recent_writes.clear()
+    cache.cache.clear()
+
+    yield primary, read
+
+    replica.recent_writes.clear()
+    cache.cache.clear()
+    for engine in (primary, read):
+        engine.dispose()
+
+
+@pytest.fixture
+def client(databases):
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _stream_names(client, auth_headers) -> list[str]:
+    response = client.get("/api/project/42/streams", headers=auth_headers)
+    assert response.status_code == 200
+    return [item["name"] for item in response.json()]
+
+
+def test_uncached_list_is_read_from_replica(client, auth_headers):
+    assert _stream_names(client, auth_headers) == ["replica"]
+    # ответ реплики в общий кэш не попадает
+    assert _stream_names(client, auth_headers) == ["replica"]
+    assert cache.cache.stats()["project_streams"] == {"hits": 0, "misses": 2}
+
+
+def test_lagging_replica_falls_back_to_primary(client, databases, auth_headers):
+    primary, _ = databases
+    with primary.begin() as connection:
+        connection.execute(sqlalchemy.update(project.Project).values(version=project.Project.version + 1))
+
+    assert _stream_names(client, auth_headers) == ["primary"]
+    assert _stream_names(client, auth_headers) == ["primary"]
+    assert cache.cache.stats()["project_streams"] == {"hits": 1, "misses": 1}
@@ -0,0 +1,200 @@
+from datetime import datetime
+
+import pytest
+
+from app.models import goal as goal_model
+from app.models import meta as meta_model
+from app.models import project as project_model
+from app.models import stream as stream_model
+from app.models import tag as tag_model
+from app.models import task as task_model
+from app.models import team as team_model
+
+
+@pytest.fixture
+def other_stream(seed_db):
+    second = stream_model.Stream(id=43, name="Second stream", project_id=42, position=2)
+    seed_db.add(second)
+    seed_db.add(task_model.Task(id=42, name="Task 42", stream_id=42, position=1))
+    seed_db.add(task_model.Task(id=43, name="Task 43", stream_id=43, position=1))
+    seed_db.commit()
+    return second
+
+
+def _etag(client, url, auth_headers):
+    response = client.get(url, headers=auth_headers)
+    assert response.status_code == 200
+    return response.headers["ETag"]
+
+
+def test_stream_tasks_not_modified(client, seed_db, auth_headers, query_counter):
+    etag = _etag(client, "/api/stream/42/tasks", auth_headers)
+
+    query_counter.clear()
+    response = client.get("/api/stream/42/tasks", headers={**auth_headers, "If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert len([q for q in query_counter if '"Streams".version' in q]) == 1
+    assert not [q for q in query_counter if 'FROM "Tasks"' in q]
+
+
+def test_stream_tasks_etag_changes_after_task_create(client, seed_db, auth_headers):
+    stream_etag = _etag(client, "/api/stream/42/tasks", auth_headers)
+    project_etag = _etag(client, "/api/project/42/tasks", auth_headers)
+
+    response = client.post("/api/stream/42/task/new", json={"name": "New task"}, headers=auth_headers)
+    assert response.status_code == 201
+
+    response = client.get("/api/stream/42/tasks", headers={**auth_headers, "If-None-Match": stream_etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != stream_etag
+    assert [t["name"] for t in response.json()] == ["New task"]
+
+    response = client.get("/api/project/42/tasks", headers={**auth_headers, "If-None-Match": project_etag})
+    assert response.status_code == 200
+
+
+def test_task_update_bumps_only_its_stream(client, other_stream, auth_headers):
+    first_etag = _etag(client, "/api/stream/42/tasks", auth_headers)
+    second_etag = _etag(client, "/api/stream/43/tasks", auth_headers)
+
+    response = client.patch("/api/task/42", json={"name": "Renamed"}, headers=auth_headers)
+    assert response.status_code == 200
+
+    assert _etag(client, "/api/stream/42/tasks", auth_headers) != first_etag
+    assert _etag(client, "/api/stream/43/tasks", auth_headers) == second_etag
+
+
+def test_relation_and_tag_writes_bump_versions(seed_db, other_stream):
+    seed_db.add(meta_model.ConnectionType(id=1, name="T1 blocks T2"))
+    seed_db.add(tag_model.Tag(id=1, name="bug", color="#f00", team_id=42))
+    seed_db.commit()
+    first = seed_db.get(stream_model.Stream, 42)
+    second = seed_db.get(stream_model.Stream, 43)
+    versions = (first.version, second.version)
+
+    seed_db.add(task_model.TaskRelation(task_id_1=42, task_id_2=43, connection_id=1))
+    seed_db.commit()
+    assert (first.version, second.version) == (versions[0] + 1, versions[1] + 1)
+
+    seed_db.add(tag_model.TaskTag(task_id=43, tag_id=1))
+    seed_db.commit()
+    assert (first.version, second.version) == (versions[0] + 1, versions[1] + 2)
+
+    project_version = seed_db.get(project_model.Project, 42).version
+    seed_db.get(tag_model.Tag, 1).color = "#0f0"
+    seed_db.commit()
+    assert first.version == versions[0] + 2
+    assert seed_db.get(project_model.Project, 42).version == project_version + 1
+
+
+def test_ndjson_and_json_have_different_etags(client, seed_db, auth_headers):
+    json_etag = _etag(client, "/api/stream/42/tasks", auth_headers)
+
+    response = client.get("/api/stream/42/tasks",
+                          headers={**auth_headers, "Accept": "application/x-ndjson", "If-None-Match": json_etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != json_etag
+
+
+def test_goals_etag_changes_after_goal_create(client, seed_db, auth_headers):
+    etag = _etag(client, "/api/stream/42/goals", auth_headers)
+    assert client.get("/api/stream/42/goals", headers={**auth_headers, "If-None-Match": etag}).status_code == 304
+
+    response = client.post("/api/stream/42/goal/new", json={"name": "Goal", "deadline": "2026-12-31T00:00:00"},
+                           headers=auth_headers)
+    assert response.status_code == 201
+
+    assert client.get("/api/stream/42/goals", headers={**auth_headers, "If-None-Match": etag}).status_code == 200
+
+
+def test_not_modified_still_checks_access(client, seed_db, auth_headers):
+    seed_db.add(team_model.Team(id=99, name="Other team"))
+    seed_db.add(project_model.Project(id=99, name="Other project", team_id=99))
+    seed_db.add(stream_model.Stream(id=99, name="Other stream", project_id=99))
+    seed_db.commit()
+
+    response = client.get("/api/stream/99/tasks", headers={**auth_headers, "If-None-Match": "*"})
+
+    assert response.status_code == 403
+
+
+def test_reorder_tasks_is_one_update_with_batched_history(client, other_stream, db_session, auth_headers,
+                                                          query_counter):
+    db_session.add(task_model.Task(id=44, name="Task 44", stream_id=42, position=2))
+    db_session.add(task_model.Task(id=45, name="Task 45", stream_id=42, position=3))
+    db_session.commit()
+    first_etag = _etag(client, "/api/stream/42/tasks", auth_headers)
+    second_etag = _etag(client, "/api/stream/43/tasks", auth_headers)
+
+    query_counter.clear()
+    response = client.put("/api/stream/42/tasks/order", json={"ids": [45, 44, 42]}, headers=auth_headers)
+
+    assert response.status_code == 204
+    assert len([q for q in query_counter if q.startswith('UPDATE "Tasks"')]) == 1
+    assert len([q for q in query_counter if q.startswith('INSERT INTO "TaskHistory"')]) == 1
+
+    positions = dict(db_session.query(task_model.Task.id, task_model.Task.position).filter(
+        task_model.Task.stream_id == 42))
+    assert positions == {45: 1, 44: 2, 42: 3}
+    history = {(entry.task_id, entry.old_value, entry.new_value)
+               for entry in db_session.query(task_model.TaskHistory).filter_by(field_name="position")}
+    assert history == {(45, "3", "1"), (42, "1", "3")}
+
+    assert _etag(client, "/api/stream/42/tasks", auth_headers) != first_etag
+    assert _etag(client, "/api/stream/43/tasks", auth_headers) == second_etag
+
+
+@pytest.mark.parametrize("ids, status", [
+    ([44], 400),
+    ([44, 42, 43], 400),
+    ([44, 42, 999], 400),
+    ([42, 42], 422),
+    ([], 422),
+])
+def test_reorder_tasks_rejects_partial_foreign_and_invalid_ids(client, other_stream, db_session, auth_headers, ids,
+                                                               status):
+    db_session.add(task_model.Task(id=44, name="Task 44", stream_id=42, position=2))
+    db_session.commit()
+
+    response = client.put("/api/stream/42/tasks/order", json={"ids": ids}, headers=auth_headers)
+
+    assert response.status_code == status
+    assert db_session.get(task_model.Task, 42).position == 1
+    assert db_session.get(task_model.Task, 44).position == 2
+
+
+def test_reorder_goals(client, seed_db, auth_headers):
+    seed_db.add_all(goal_model.Goal(id=goal_id, name=f"Goal {goal_id}", stream_id=42, position=position,
+                                    deadline=datetime(2026, 12, 31))
+                    for goal_id, position in ((1, 1), (2, 2), (3, 3)))
+    seed_db.commit()
+    etag = _etag(client, "/api/stream/42/goals", auth_headers)
+
+    response = client.put("/api/stream/42/goals/order", json={"ids": [3, 1]}, headers=auth_headers)
+    assert response.status_code == 400
+
+    response = client.put("/api/stream/42/goals/order", json={"ids": [3, 1, 2]}, headers=auth_headers)
+    assert response.status_code == 204
+
+    response = client.get("/api/stream/42/goals", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert {goal["id"]: goal["position"] for goal in response.json()} == {3: 1, 1: 2, 2: 3}
+
+
+def test_reorder_streams(client, other_stream, auth_headers):
+    assert client.get("/api/project/42/streams", headers=auth_headers).status_code == 200
+
+    response = client.put("/api/project/42/streams/order", json={"ids": [43, 42]}, headers=auth_headers)
+    assert response.status_code == 204
+
+    streams = client.get("/api/project/42/streams", headers=auth_headers).json()
+    assert {stream["id"]: stream["position"] for stream in streams} == {43: 1, 42: 2}
+
+    response = client.put("/api/project/42/streams/order", json={"ids": [43, 99]}, headers=auth_headers)
+    assert response.status_code == 400
+    response = client.put("/api/project/42/streams/order", json={"ids": [42]}, headers=auth_headers)
+    assert response.status_code == 400
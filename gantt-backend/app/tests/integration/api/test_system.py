@@ -0,0 +1,155 @@
+import pytest
+
+from app.core import sql_timing
+from app.core.config import settings
+from app.crud import team as team_crud
+
+
+def _queries_to(query_counter, table):
+    return [q for q in query_counter if f'FROM "{table}"' in q]
+
+
+@pytest.mark.parametrize("url, table", [
+    ("/api/team/42/projects", "Projects"),
+    ("/api/project/42/streams", "Streams"),
+    ("/api/stream/42/goals", "Goals"),
+    ("/api/team/42/tags", "Tags"),
+    ("/api/teams/42/custom_fields/", "custom_fields"),
+])
+def test_hierarchy_lists_are_cached(client, seed_db, auth_headers, query_counter, url, table):
+    first = client.get(url, headers=auth_headers)
+    query_counter.clear()
+    second = client.get(url, headers=auth_headers)
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert not _queries_to(query_counter, table)
+
+
+def test_cache_hit_still_checks_access(client, seed_db, auth_headers):
+    assert client.get("/api/team/42/projects", headers=auth_headers).status_code == 200
+
+    team_crud.delete_member(seed_db, 42, 42)
+
+    assert client.get("/api/team/42/projects", headers=auth_headers).status_code == 403
+
+
+def test_project_create_invalidates_team_projects(client, seed_db, auth_headers):
+    client.get("/api/team/42/projects", headers=auth_headers)
+
+    response = client.post("/api/team/42/project/new", json={"name": "New project"}, headers=auth_headers)
+    assert response.status_code == 201
+
+    names = [p["name"] for p in client.get("/api/team/42/projects", headers=auth_headers).json()]
+    assert "New project" in names
+
+
+def test_stream_update_invalidates_project_streams(client, seed_db, auth_headers):
+    client.get("/api/project/42/streams", headers=auth_headers)
+
+    assert client.patch("/api/stream/42", json={"name": "Renamed"}, headers=auth_headers).status_code == 200
+
+    streams = client.get("/api/project/42/streams", headers=auth_headers).json()
+    assert [s["name"] for s in streams] == ["Renamed"]
+
+
+def test_goal_create_invalidates_stream_goals(client, seed_db, auth_headers):
+    assert client.get("/api/stream/42/goals", headers=auth_headers).json() == []
+
+    response = client.post("/api/stream/42/goal/new", json={"name": "Goal", "deadline": "2026-12-31T00:00:00"},
+                           headers=auth_headers)
+    assert response.status_code == 201
+
+    assert [g["name"] for g in client.get("/api/stream/42/goals", headers=auth_headers).json()] == ["Goal"]
+
+
+def test_tag_create_and_delete_invalidate_team_tags(client, seed_db, auth_headers):
+    assert client.get("/api/team/42/tags", headers=auth_headers).json() == []
+
+    created = client.post("/api/team/42/tags/new", json={"name": "bug", "color": "#f00"}, headers=auth_headers)
+    assert created.status_code == 201
+    assert [t["name"] for t in client.get("/api/team/42/tags", headers=auth_headers).json()] == ["bug"]
+
+    assert client.delete(f"/api/team/42/tags/{created.json()['id']}", headers=auth_headers).status_code == 204
+    assert client.get("/api/team/42/tags", headers=auth_headers).json() == []
+
+
+def test_custom_field_create_invalidates_team_custom_fields(client, seed_db, auth_headers):
+    assert client.get("/api/teams/42/custom_fields/", headers=auth_headers).json() == []
+
+    response = client.post("/api/teams/42/custom_fields/", json={"name": "Estimate", "type": "string"},
+                           headers=auth_headers)
+    assert response.status_code == 200
+
+    fields = client.get("/api/teams/42/custom_fields/", headers=auth_headers).json()
+    assert [f["name"] for f in fields] == ["Estimate"]
+
+
+def test_cache_stats(client, seed_db, auth_headers):
+    client.get("/api/team/42/tags", headers=auth_headers)
+    client.get("/api/team/42/tags", headers=auth_headers)
+    client.get("/api/team/42/tags", headers=auth_headers)
+
+    response = client.get("/api/system/cache", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["backend"] == "LRUBackend"
+    assert data["namespaces"]["team_tags"] == {"hits": 2, "misses": 1}
+
+
+def test_warm_hierarchy_skips_access_queries(client, seed_db, auth_headers, query_counter):
+    client.get("/api/stream/42/goals", headers=auth_headers)
+
+    query_counter.clear()
+    response = client.get("/api/stream/42/goals", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert not [q for q in query_counter if 'JOIN "UserTeam"' in q and '"Streams".version' not in q]
+
+
+
+def test_pool_stats(client, seed_db, auth_headers):
+    response = client.get("/api/system/pool", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert "primary" in data
+    for engine_stats in data.values():
+        assert {"pool_class", "size", "checked_out", "overflow", "timeouts", "wait_avg_ms",
+                "wait_max_ms"} <= engine_stats.keys()
+
+
+def test_pool_stats_requires_auth(client):
+    assert client.get("/api/system/pool").status_code == 401
+
+
+def test_server_timing_counts_request_queries(client, seed_db, auth_headers, query_counter):
+    sql_timing.instrument(seed_db.get_bind().engine)
+
+    response = client.get("/api/project/42/streams", headers=auth_headers)
+
+    timing = response.headers["Server-Timing"]
+    assert query_counter
+    assert timing.startswith("db;dur=")
+    assert f'desc="{len(query_counter)} queries"' in timing
+
+
+def test_metrics_endpoint(client, seed_db, auth_headers, monkeypatch):
+    client.get("/api/project/42/streams", headers=auth_headers)
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+    assert client.get("/metrics", headers={"Authorization": "Bearer "}).status_code == 404
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-token")
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_requests_total{method="GET",route="/api/project/{proj_id}/streams",status="200"}' in response.text
+    assert 'db_pool_checkouts_total{engine="primary"}' in response.text
+    assert 'scheduler_jobs{kind="reminder"}' in response.text
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers=auth_headers).status_code == 401
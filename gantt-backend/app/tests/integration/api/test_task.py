@@ -0,0 +1,431 @@
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.core import exception
+from app.models import custom_field as custom_field_model
+from app.models import meta as meta_model
+from app.models import project as project_model
+from app.models import stream as stream_model
+from app.models import tag as tag_model
+from app.models import task as task_model
+from app.models import team as team_model
+from app.services import permissions
+
+
+@pytest.fixture
+def task_graph(seed_db):
+    connection = meta_model.ConnectionType(id=1, name="T1 blocks T2")
+    seed_db.add(connection)
+
+    test_tag = tag_model.Tag(id=42, name="Test tag", color="#ff0000", team_id=42)
+    seed_db.add(test_tag)
+
+    test_field = custom_field_model.CustomField(
+        id=42, team_id=42, name="Test field", type=custom_field_model.CustomFieldType.STRING
+    )
+    seed_db.add(test_field)
+    seed_db.commit()
+
+    def add_tasks(streams_count, tasks_per_stream):
+        task_ids = []
+        for stream_idx in range(streams_count):
+            stream_obj = stream_model.Stream(name=f"Stream {stream_idx}", project_id=42, position=stream_idx)
+            seed_db.add(stream_obj)
+            seed_db.flush()
+
+            for task_idx in range(tasks_per_stream):
+                task_obj = task_model.Task(
+                    name=f"Task {stream_idx}-{task_idx}",
+                    stream_id=stream_obj.id,
+                    position=task_idx,
+                    deadline=datetime(2026, 12, 31),
+                )
+                seed_db.add(task_obj)
+                seed_db.flush()
+
+                seed_db.add(meta_model.UserTask(user_id=42, task_id=task_obj.id))
+                seed_db.add(tag_model.TaskTag(task_id=task_obj.id, tag_id=42))
+                seed_db.add(custom_field_model.TaskCustomFieldValue(
+                    task_id=task_obj.id, custom_field_id=42, value_string="value"
+                ))
+                if task_ids:
+                    seed_db.add(task_model.TaskRelation(
+                        task_id_1=task_ids[-1], task_id_2=task_obj.id, connection_id=1
+                    ))
+                task_ids.append(task_obj.id)
+
+        seed_db.commit()
+        return task_ids
+
+    return add_tasks
+
+
+@pytest.fixture
+def commit_counter(db_session):
+    commits = []
+
+    def after_commit(session):
+        commits.append(session)
+
+    event.listen(db_session, "after_commit", after_commit)
+    yield commits
+    event.remove(db_session, "after_commit", after_commit)
+
+
+def _add_custom_fields(db_session, count):
+    fields = [custom_field_model.CustomField(team_id=42, name=f"Field {i}", type=custom_field_model.CustomFieldType.STRING)
+              for i in range(count)]
+    db_session.add_all(fields)
+    db_session.commit()
+    return [field.id for field in fields]
+
+
+def test_get_all_tasks_returns_context(client, task_graph, auth_headers):
+    task_graph(1, 2)
+
+    response = client.get("/api/tasks/all", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 2
+    assert data[0]["team_id"] == 42
+    assert data[0]["team_name"] == "Test team"
+    assert data[0]["project_name"] == "Test project"
+    assert data[0]["stream_name"] == "Stream 0"
+    assert data[0]["assignee_email"] == "test@test.com"
+    assert data[0]["tag_list"][0]["name"] == "Test tag"
+    assert data[0]["custom_field_values"][0]["value_string"] == "value"
+    assert data[1]["relations"][0]["connection_name"] == "T1 blocks T2"
+
+
+def test_get_all_tasks_query_count_does_not_grow(client, task_graph, auth_headers, query_counter):
+    task_graph(1, 1)
+    query_counter.clear()
+    client.get("/api/tasks/all", headers=auth_headers)
+    small_count = len(query_counter)
+
+    task_graph(5, 10)
+    query_counter.clear()
+    response = client.get("/api/tasks/all", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert len(response.json()) == 51
+    assert len(query_counter) == small_count
+
+
+def test_get_all_tasks_keyset_pagination(client, task_graph, auth_headers):
+    task_ids = task_graph(2, 3)
+
+    first_page = client.get("/api/tasks/all?limit=4", headers=auth_headers)
+    cursor = first_page.headers["X-Next-Cursor"]
+    second_page = client.get(f"/api/tasks/all?limit=4&cursor={cursor}", headers=auth_headers)
+
+    assert first_page.status_code == 200
+    assert second_page.status_code == 200
+    assert "X-Next-Cursor" not in second_page.headers
+    ids = [t["id"] for t in first_page.json()] + [t["id"] for t in second_page.json()]
+    assert ids == task_ids
+
+
+def test_get_all_tasks_invalid_cursor(client, seed_db, auth_headers):
+    response = client.get("/api/tasks/all?cursor=not-a-cursor", headers=auth_headers)
+
+    assert response.status_code == 400
+
+
+def test_get_all_tasks_filters(client, task_graph, seed_db, auth_headers):
+    task_ids = task_graph(2, 2)
+    filtered_task = seed_db.get(task_model.Task, task_ids[-1])
+    filtered_task.status_id = 3
+    seed_db.commit()
+
+    by_status = client.get("/api/tasks/all?status_id=3&status_id=4", headers=auth_headers)
+    by_stream = client.get(f"/api/tasks/all?stream_id={filtered_task.stream_id}", headers=auth_headers)
+    by_tag = client.get("/api/tasks/all?tag_id=999", headers=auth_headers)
+    by_assignee = client.get("/api/tasks/all?assignee_email=test@test.com", headers=auth_headers)
+    by_deadline = client.get("/api/tasks/all?deadline_to=2026-01-01T00:00:00", headers=auth_headers)
+
+    assert [t["id"] for t in by_status.json()] == [filtered_task.id]
+    assert [t["id"] for t in by_stream.json()] == task_ids[2:]
+    assert by_tag.json() == []
+    assert len(by_assignee.json()) == 4
+    assert by_deadline.json() == []
+
+
+def test_get_stream_tasks_ndjson(client, task_graph, auth_headers):
+    task_ids = task_graph(1, 3)
+    headers = {**auth_headers, "Accept": "application/x-ndjson"}
+
+    with client.stream("GET", "/api/stream/43/tasks", headers=headers) as response:
+        lines = [json.loads(line) for line in response.iter_lines() if line]
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [t["id"] for t in lines] == task_ids
+    assert lines[0]["assignee_email"] == "test@test.com"
+
+
+def test_get_project_and_all_tasks_ndjson(client, task_graph, auth_headers):
+    task_ids = task_graph(2, 2)
+    headers = {**auth_headers, "Accept": "application/x-ndjson"}
+
+    project_response = client.get("/api/project/42/tasks", headers=headers)
+    all_response = client.get("/api/tasks/all?limit=1", headers=headers)
+
+    assert [json.loads(line)["id"] for line in project_response.text.splitlines()] == task_ids
+    all_tasks = [json.loads(line) for line in all_response.text.splitlines()]
+    assert [t["id"] for t in all_tasks] == task_ids
+    assert all_tasks[0]["stream_name"] == "Stream 0"
+
+
+def test_get_stream_tasks_ndjson_forbidden(client, seed_db, auth_headers):
+    seed_db.add(team_model.Team(id=99, name="Other team"))
+    seed_db.add(project_model.Project(id=99, name="Other project", team_id=99))
+    seed_db.add(stream_model.Stream(id=99, name="Other stream", project_id=99))
+    seed_db.commit()
+    headers = {**auth_headers, "Accept": "application/x-ndjson"}
+
+    response = client.get("/api/stream/99/tasks", headers=headers)
+
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("url", ["/api/project/42/tasks", "/api/stream/43/tasks"])
+def test_task_listing_query_count_does_not_grow(client, task_graph, auth_headers, query_counter, url):
+    task_graph(1, 1)
+    client.get(url, headers=auth_headers)
+    query_counter.clear()
+    client.get(url, headers=auth_headers)
+    small_count = len(query_counter)
+
+    task_graph(3, 100)
+    query_counter.clear()
+    response = client.get(url, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()[0]["tag_list"][0]["name"] == "Test tag"
+    assert len(query_counter) == small_count
+
+
+def test_repeated_access_checks_reuse_request_context(task_graph, db_session, query_counter):
+    task_id = task_graph(1, 1)[0]
+    stream_id = db_session.get(task_model.Task, task_id).stream_id
+    permissions.reset_access_context(db_session)
+    db_session.expire_all()
+
+    query_counter.clear()
+    permissions.check_task_access(db_session, task_id, 42, need_lead=True)
+    permissions.check_team_access(db_session, 42, 42)
+    first_count = len(query_counter)
+
+    query_counter.clear()
+    permissions.check_task_access(db_session, task_id, 42)
+    permissions.check_stream_access(db_session, stream_id, 42)
+    permissions.check_project_access(db_session, 42, 42)
+    permissions.check_team_access(db_session, 42, 42)
+
+    assert first_count == 2
+    assert query_counter == []
+
+
+def test_access_context_does_not_remember_misses(seed_db, db_session):
+    seed_db.add(team_model.Team(id=99, name="Other team"))
+    seed_db.commit()
+
+    with pytest.raises(exception.ForbiddenError):
+        permissions.check_team_access(db_session, 99, 42)
+
+    db_session.add(team_model.UserTeam(id=99, user_id=42, team_id=99, role_id=2))
+    db_session.flush()
+
+    _, user_team = permissions.check_team_access(db_session, 99, 42)
+    assert user_team.id == 99
+
+
+def test_access_context_forgets_deleted_objects(seed_db, db_session):
+    task_obj = task_model.Task(id=99, name="Task", stream_id=42, position=1)
+    db_session.add(task_obj)
+    db_session.flush()
+    permissions.check_task_access(db_session, 99, 42)
+
+    db_session.delete(task_obj)
+    db_session.flush()
+
+    with pytest.raises(exception.NotFoundError):
+        permissions.check_task_access(db_session, 99, 42)
+
+
+@pytest.mark.parametrize("check, obj_id", [
+    (permissions.check_task_access, "task"),
+    (permissions.check_stream_access, 42),
+    (permissions.check_project_access, 42),
+    (permissions.check_team_access, 42),
+])
+def test_access_check_is_single_statement(seed_db, db_session, query_counter, check, obj_id):
+    if obj_id == "task":
+        db_session.add(task_model.Task(id=99, name="Task", stream_id=42, position=1))
+        db_session.commit()
+        obj_id = 99
+    permissions.reset_access_context(db_session)
+    db_session.expire_all()
+
+    query_counter.clear()
+    check(db_session, obj_id, 42, need_lead=True)
+
+    assert len(query_counter) == 1
+
+
+@pytest.mark.parametrize("check, obj_id, error", [
+    (permissions.check_task_access, 999, exception.NotFoundError),
+    (permissions.check_stream_access, 999, exception.NotFoundError),
+    (permissions.check_project_access, 999, exception.NotFoundError),
+    (permissions.check_team_access, 999, exception.NotFoundError),
+    (permissions.check_stream_access, 99, exception.ForbiddenError),
+    (permissions.check_project_access, 99, exception.ForbiddenError),
+    (permissions.check_team_access, 99, exception.ForbiddenError),
+])
+def test_access_check_errors(seed_db, db_session, query_counter, check, obj_id, error):
+    db_session.add(team_model.Team(id=99, name="Other team"))
+    db_session.add(project_model.Project(id=99, name="Other project", team_id=99))
+    db_session.add(stream_model.Stream(id=99, name="Other stream", project_id=99))
+    db_session.commit()
+
+    query_counter.clear()
+    with pytest.raises(error):
+        check(db_session, obj_id, 42)
+
+    assert len(query_counter) == 1
+
+
+def test_create_task_with_custom_fields_is_single_transaction(client, task_graph, db_session, auth_headers,
+                                                              query_counter, commit_counter):
+    field_ids = _add_custom_fields(db_session, 10)
+
+    def create(fields_count):
+        query_counter.clear()
+        commit_counter.clear()
+        response = client.post("/api/stream/42/task/new", headers=auth_headers, json={
+            "name": f"Task with {fields_count} fields",
+            "assignee_email": "test@test.com",
+            "tag_ids": [42],
+            "custom_fields": [{"custom_field_id": field_id, "value_string": str(field_id)}
+                              for field_id in field_ids[:fields_count]],
+        })
+        assert response.status_code == 201
+        assert len(commit_counter) == 1
+        # На PostgreSQL ORM вставляет значения одним INSERT ... RETURNING, у SQLite нет такой пакетной вставки
+        return response.json(), sum(not s.startswith("INSERT INTO task_custom_field_values") for s in query_counter)
+
+    create(1)
+    _, one_field_statements = create(1)
+    data, ten_fields_statements = create(10)
+
+    assert ten_fields_statements == one_field_statements
+    assert [t["id"] for t in data["tag_list"]] == [42]
+    assert sorted(v["custom_field_id"] for v in data["custom_field_values"]) == sorted(field_ids)
+
+
+def test_create_task_failure_commits_nothing(client, task_graph, db_session, auth_headers, commit_counter):
+    field_ids = _add_custom_fields(db_session, 3)
+    commit_counter.clear()
+
+    response = client.post("/api/stream/42/task/new", headers=auth_headers, json={
+        "name": "Broken task",
+        "tag_ids": [42, 999],
+        "custom_fields": [{"custom_field_id": field_id, "value_string": "x"} for field_id in field_ids],
+    })
+
+    assert response.status_code == 404
+    assert commit_counter == []
+
+
+def test_update_task_is_single_transaction_and_returns_fresh_links(client, task_graph, db_session, auth_headers,
+                                                                   commit_counter):
+    task_id, = task_graph(1, 1)
+    field_ids = _add_custom_fields(db_session, 2)
+    db_session.add(tag_model.Tag(id=43, name="Other tag", color="#00ff00", team_id=42))
+    db_session.commit()
+    commit_counter.clear()
+
+    response = client.patch(f"/api/task/{task_id}", headers=auth_headers, json={
+        "name": "Renamed",
+        "tag_ids": [43],
+        "custom_fields": [{"custom_field_id": 42, "value_string": "new"},
+                          *({"custom_field_id": field_id, "value_string": "added"} for field_id in field_ids)],
+    })
+
+    assert response.status_code == 200
+    assert len(commit_counter) == 1
+    data = response.json()
+    assert data["name"] == "Renamed"
+    assert [t["id"] for t in data["tag_list"]] == [43]
+    values = {v["custom_field_id"]: v["value_string"] for v in data["custom_field_values"]}
+    assert values == {42: "new", **{field_id: "added" for field_id in field_ids}}
+
+    history = client.get(f"/api/task/{task_id}/history", headers=auth_headers).json()
+    assert {entry["field_name"] for entry in history} >= {"name", "tag_ids", "custom_fields"}
+
+
+def test_bulk_create_tasks(client, task_graph, db_session, auth_headers, query_counter, commit_counter):
+    existing_id, = task_graph(1, 1)
+    stream_id = db_session.get(task_model.Task, existing_id).stream_id
+    etag = client.get(f"/api/stream/{stream_id}/tasks", headers=auth_headers).headers["ETag"]
+
+    def bulk_create(count):
+        tasks = [{
+            "name": f"Imported {i}",
+            "assignee_email": "test@test.com" if i % 2 else None,
+            "tag_ids": [42, 42],
+            "custom_fields": [{"custom_field_id": 42, "value_string": "old"},
+                              {"custom_field_id": 42, "value_string": str(i)}],
+        } for i in range(count)]
+        query_counter.clear()
+        commit_counter.clear()
+        response = client.post(f"/api/stream/{stream_id}/tasks/bulk", json={"tasks": tasks}, headers=auth_headers)
+        assert response.status_code == 201
+        assert len(commit_counter) == 1
+        return response.json()["ids"], sum(not s.startswith('INSERT INTO "Tasks"') for s in query_counter)
+
+    ids, small_statements = bulk_create(2)
+    ids, large_statements = bulk_create(200)
+
+    assert large_statements == small_statements
+    tasks = {t.id: t for t in db_session.query(task_model.Task).filter(task_model.Task.id.in_(ids))}
+    assert [tasks[task_id].name for task_id in ids] == [f"Imported {i}" for i in range(200)]
+    assert [tasks[task_id].position for task_id in ids] == list(range(3, 203))
+    assert db_session.query(meta_model.UserTask).filter(meta_model.UserTask.task_id.in_(ids)).count() == 100
+    assert db_session.query(tag_model.TaskTag).filter(tag_model.TaskTag.task_id.in_(ids)).count() == 200
+    values = db_session.query(custom_field_model.TaskCustomFieldValue).filter(
+        custom_field_model.TaskCustomFieldValue.task_id == ids[7]).all()
+    assert [value.value_string for value in values] == ["7"]
+
+    response = client.get(f"/api/stream/{stream_id}/tasks", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("task, status", [
+    ({"name": "Task", "tag_ids": [999]}, 404),
+    ({"name": "Task", "assignee_email": "missing@test.com"}, 404),
+    ({"name": "Task", "tag_ids": [43]}, 403),
+])
+def test_bulk_create_tasks_validates_whole_batch(client, task_graph, db_session, auth_headers, commit_counter, task,
+                                                 status):
+    db_session.add(team_model.Team(id=99, name="Other team"))
+    db_session.add(tag_model.Tag(id=43, name="Foreign tag", color="#000000", team_id=99))
+    db_session.commit()
+    commit_counter.clear()
+
+    response = client.post("/api/stream/42/tasks/bulk", json={"tasks": [{"name": "Valid"}, task]},
+                           headers=auth_headers)
+
+    assert response.status_code == status
+    assert commit_counter == []
+
+
+def test_bulk_create_tasks_requires_items(client, seed_db, auth_headers):
+    response = client.post("/api/stream/42/tasks/bulk", json={"tasks": []}, headers=auth_headers)
+
+    assert response.status_code == 422
@@ -0,0 +1,56 @@
+import pytest
+
+from app.core import exception
+from app.crud import team as team_crud
+from app.crud import user as user_crud
+from app.models import user
+
+
+def _queries_to(query_counter, table):
+    return [q for q in query_counter if f'FROM "{table}"' in q]
+
+
+def test_regular_endpoint_does_not_load_current_user(client, seed_db, auth_headers, query_counter):
+    response = client.get("/api/stream/42/tasks", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert not _queries_to(query_counter, "Users")
+
+
+def test_user_by_token_profile_is_cached(client, seed_db, auth_headers, query_counter):
+    first = client.get("/api/user_by_token", headers=auth_headers)
+    query_counter.clear()
+    second = client.get("/api/user_by_token", headers=auth_headers)
+
+    assert first.status_code == second.status_code == 200
+    assert second.json()["email"] == "test@test.com"
+    assert not _queries_to(query_counter, "Users")
+
+
+def test_user_change_invalidates_profile(client, seed_db, auth_headers):
+    assert client.get("/api/user_by_token", headers=auth_headers).json()["nickname"] == "test_user"
+
+    seed_db.get(user.User, 42).nickname = "renamed"
+    seed_db.commit()
+
+    assert client.get("/api/user_by_token", headers=auth_headers).json()["nickname"] == "renamed"
+
+
+def test_deleted_user_profile_is_not_found(client, seed_db, auth_headers):
+    assert client.get("/api/user_by_token", headers=auth_headers).status_code == 200
+
+    team_crud.delete_member(seed_db, 42, 42)
+    seed_db.delete(seed_db.get(user.User, 42))
+    seed_db.commit()
+
+    assert client.get("/api/user_by_token", headers=auth_headers).status_code == 404
+
+
+def test_create_user_conflict_keeps_callers_transaction(seed_db):
+    user_crud.create_user(seed_db, "first@test.com", "first", "-")
+
+    with pytest.raises(exception.ConflictError):
+        user_crud.create_user(seed_db, "test@test.com", "duplicate", "-")
+    seed_db.commit()
+
+    assert seed_db.query(user.User).filter_by(email="first@test.com").one().nickname == "first"
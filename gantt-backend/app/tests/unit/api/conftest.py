@@ -10,3 +10,12 @@ from app.core.security import create_access_token
 def auth_headers():
     token = create_access_token({"sub": "42"})
     return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(autouse=True)
+def container_versions():
+    with (
+        patch("app.services.stream_service.get_stream_version_service", return_value=1) as stream_version,
+        patch("app.services.project_service.get_project_version_service", return_value=1) as project_version,
+    ):
+        yield stream_version, project_version
@@ -272,3 +272,49 @@ def test_create_stream_forbidden(mock_service, mock_user, current_user, auth_hea
     )
 
     assert response.status_code == 403
+
+
+@patch("app.services.user_service.get_current_user_service")
+@patch("app.services.project_service.get_project_gantt_service")
+def test_get_project_gantt_success(mock_service, mock_user, current_user, project, stream, task, auth_headers):
+    mock_user.return_value = current_user
+    stream.position = 1
+    task.tag_list = []
+    task.custom_field_values = []
+    mock_service.return_value = {
+        "project": project,
+        "streams": [stream],
+        "goals": [],
+        "tasks": [task],
+        "relations": [],
+    }
+
+    response = client.get("/api/project/42/gantt", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["project"]["id"] == 42
+    assert data["streams"][0]["id"] == 42
+    assert data["tasks"][0]["id"] == 42
+
+
+@patch("app.services.user_service.get_current_user_service")
+@patch("app.services.project_service.get_project_gantt_service")
+def test_get_project_gantt_not_found(mock_service, mock_user, current_user, auth_headers):
+    mock_user.return_value = current_user
+    mock_service.side_effect = exception.NotFoundError()
+
+    response = client.get("/api/project/42/gantt", headers=auth_headers)
+
+    assert response.status_code == 404
+
+
+@patch("app.services.user_service.get_current_user_service")
+@patch("app.services.project_service.get_project_gantt_service")
+def test_get_project_gantt_forbidden(mock_service, mock_user, current_user, auth_headers):
+    mock_user.return_value = current_user
+    mock_service.side_effect = exception.ForbiddenError()
+
+    response = client.get("/api/project/42/gantt", headers=auth_headers)
+
+    assert response.status_code == 403
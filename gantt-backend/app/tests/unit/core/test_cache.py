@@ -0,0 +1,73 @@
+from unittest.mock import Mock, patch
+
+from app.core.cache import _MISSING, LRUBackend, NullBackend, ResponseCache, key
+
+
+def test_key():
+    assert key("team_tags", 42) == "team_tags:42"
+
+
+def test_lru_backend_evicts_least_recently_used():
+    backend = LRUBackend(max_entries=2, ttl=60)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    backend.get("a")
+    backend.set("c", 3)
+
+    assert backend.get("a") == 1
+    assert backend.get("b") is _MISSING
+    assert backend.get("c") == 3
+
+
+def test_lru_backend_expires_entries():
+    backend = LRUBackend(ttl=10)
+    with patch("app.core.cache.time.monotonic", return_value=100):
+        backend.set("a", 1)
+    with patch("app.core.cache.time.monotonic", return_value=109):
+        assert backend.get("a") == 1
+    with patch("app.core.cache.time.monotonic", return_value=111):
+        assert backend.get("a") is _MISSING
+
+
+def test_get_or_load_counts_hits_and_misses():
+    response_cache = ResponseCache(LRUBackend())
+    loader = Mock(return_value=[{"id": 1}])
+
+    assert response_cache.get_or_load("team_tags:1", loader) == [{"id": 1}]
+    assert response_cache.get_or_load("team_tags:1", loader) == [{"id": 1}]
+    response_cache.get_or_load("team_tags:2", loader)
+
+    assert loader.call_count == 2
+    assert response_cache.stats() == {"team_tags": {"hits": 1, "misses": 2}}
+
+
+def test_invalidate_forces_reload():
+    response_cache = ResponseCache(LRUBackend())
+    loader = Mock(side_effect=[["old"], ["new"]])
+
+    response_cache.get_or_load("team_tags:1", loader)
+    response_cache.invalidate("team_tags:1")
+
+    assert response_cache.get_or_load("team_tags:1", loader) == ["new"]
+
+
+def test_load_started_before_invalidation_is_not_cached():
+    response_cache = ResponseCache(LRUBackend())
+
+    def stale_loader():
+        response_cache.invalidate("team_tags:1")
+        return ["old"]
+
+    assert response_cache.get_or_load("team_tags:1", stale_loader) == ["old"]
+    assert response_cache.get_or_load("team_tags:1", Mock(return_value=["new"])) == ["new"]
+    assert response_cache.get_or_load("team_tags:1", Mock(return_value=["newer"])) == ["new"]
+
+
+def test_null_backend_always_loads():
+    response_cache = ResponseCache(NullBackend())
+    loader = Mock(return_value=[])
+
+    response_cache.get_or_load("team_tags:1", loader)
+    response_cache.get_or_load("team_tags:1", loader)
+
+    assert loader.call_count == 2
@@ -0,0 +1,36 @@
+from unittest.mock import Mock
+
+import pytest
+
+from app.core.conditional import is_not_modified, make_etag, not_modified_response
+
+
+def _request(if_none_match=None):
+    request = Mock()
+    request.headers = {"If-None-Match": if_none_match} if if_none_match is not None else {}
+    return request
+
+
+def test_make_etag():
+    assert make_etag("stream-tasks", 42, 7) == 'W/"stream-tasks-42-v7"'
+    assert make_etag("stream-tasks", 42, 7, "ndjson") == 'W/"stream-tasks-42-v7-ndjson"'
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ('W/"stream-tasks-42-v7"', True),
+    ('"stream-tasks-42-v7"', True),
+    ('W/"stream-tasks-42-v6", W/"stream-tasks-42-v7"', True),
+    ('W/"stream-tasks-42-v6"', False),
+    ("*", True),
+])
+def test_is_not_modified(header, expected):
+    assert is_not_modified(_request(header), make_etag("stream-tasks", 42, 7)) is expected
+
+
+def test_not_modified_response():
+    response = not_modified_response('W/"a"')
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == 'W/"a"'
+    assert response.body == b""
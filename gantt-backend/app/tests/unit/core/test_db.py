@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core import db, exception, streaming
+from app.crud import user as user_crud
+from app.models import user
+from app.models.base import Base
+from app.schemas import user as user_schemas
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("postgresql://app:secret@db:5432/tracker", "postgresql+asyncpg://app:secret@db:5432/tracker"),
+    ("postgresql+psycopg2://app:secret@db/tracker", "postgresql+asyncpg://app:secret@db/tracker"),
+    ("sqlite:///./tracker.db", "sqlite+aiosqlite:///./tracker.db"),
+    ("sqlite://", "sqlite+aiosqlite://"),
+])
+def test_async_database_url(url, expected):
+    assert db.async_database_url(url) == expected
+
+
+def _run_on_aiosqlite(scenario):
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as connection:
+            # MetaData.create_all подменен в conftest юнит-тестов API, поэтому таблицы создаются по одной
+            for table in Base.metadata.sorted_tables:
+                await connection.run_sync(table.create)
+
+        session_factory = async_sessionmaker(engine, autoflush=False)
+        async with session_factory() as session:
+            session.add_all([user.User(id=i, email=f"user{i}@test.com", nickname=f"user{i}", password_hash="hash")
+                             for i in range(1, 4)])
+            await session.commit()
+
+        try:
+            async with session_factory() as session:
+                return await scenario(session)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def test_run_sync_serializes_inside_session():
+    async def scenario(session):
+        return await db.run_sync(session, user_crud.get_user_by_id, 2, schema=user_schemas.UserProfile)
+
+    profile = _run_on_aiosqlite(scenario)
+
+    assert profile == user_schemas.UserProfile(id=2, email="user2@test.com", nickname="user2")
+
+
+def test_run_sync_propagates_service_errors():
+    async def scenario(session):
+        with pytest.raises(exception.NotFoundError):
+            await db.run_sync(session, user_crud.get_user_by_id, 100)
+
+    _run_on_aiosqlite(scenario)
+
+
+def test_ndjson_response_async_reads_in_batches(monkeypatch):
+    monkeypatch.setattr(streaming, "NDJSON_ASYNC_BATCH_SIZE", 2)
+
+    async def scenario(session):
+        users = await session.run_sync(lambda s: s.query(user.User).order_by(user.User.id).yield_per(2))
+        response = streaming.ndjson_response_async(session, users, user_schemas.UserProfile)
+        return [chunk async for chunk in response.body_iterator]
+
+    chunks = _run_on_aiosqlite(scenario)
+
+    assert len(chunks) == 2
+    lines = "".join(chunks).splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [1, 2, 3]
@@ -0,0 +1,64 @@
+from unittest.mock import patch
+
+from app.core.hierarchy import HierarchyIndex, LocalBroadcaster
+
+
+def test_remember_and_get():
+    index = HierarchyIndex(ttl=30)
+    index.remember_stream(1, 10)
+    index.remember_project(10, 100)
+    index.remember_role(42, 100, 2)
+
+    assert index.get_stream_project(1) == 10
+    assert index.get_project_team(10) == 100
+    assert index.get_role(42, 100) == 2
+    assert index.get_role(43, 100) is None
+
+
+def test_entries_expire():
+    index = HierarchyIndex(ttl=30)
+    with patch("app.core.hierarchy.time.monotonic", return_value=100):
+        index.remember_role(42, 100, 2)
+    with patch("app.core.hierarchy.time.monotonic", return_value=131):
+        assert index.get_role(42, 100) is None
+
+
+def test_invalidate_project_drops_its_streams():
+    index = HierarchyIndex()
+    index.remember_stream(1, 10)
+    index.remember_stream(2, 11)
+    index.remember_project(10, 100)
+
+    index.invalidate("project", 10)
+
+    assert index.get_project_team(10) is None
+    assert index.get_stream_project(1) is None
+    assert index.get_stream_project(2) == 11
+
+
+def test_invalidate_team_drops_projects_and_memberships():
+    index = HierarchyIndex()
+    index.remember_stream(1, 10)
+    index.remember_project(10, 100)
+    index.remember_role(42, 100, 2)
+    index.remember_role(42, 200, 2)
+
+    index.invalidate("team", 100)
+
+    assert index.get_stream_project(1) is None
+    assert index.get_project_team(10) is None
+    assert index.get_role(42, 100) is None
+    assert index.get_role(42, 200) == 2
+
+
+def test_invalidation_is_broadcast_to_other_workers():
+    broadcaster = LocalBroadcaster()
+    first = HierarchyIndex(broadcaster=broadcaster)
+    second = HierarchyIndex(broadcaster=broadcaster)
+    first.remember_role(42, 100, 2)
+    second.remember_role(42, 100, 2)
+
+    first.invalidate("membership", 42, 100)
+
+    assert first.get_role(42, 100) is None
+    assert second.get_role(42, 100) is None
@@ -0,0 +1,85 @@
+import fastapi
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    metrics.registry.reset()
+    yield
+    metrics.registry.reset()
+
+
+@pytest.fixture
+def client():
+    app = fastapi.FastAPI()
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int):
+        if item_id == 0:
+            raise fastapi.HTTPException(404)
+        return {"id": item_id}
+
+    @app.get("/in_flight")
+    async def in_flight():
+        return {"in_flight": metrics.registry.in_flight}
+
+    return TestClient(app)
+
+
+def _samples(text: str) -> dict:
+    return dict(line.rsplit(" ", 1) for line in text.splitlines() if not line.startswith("#"))
+
+
+def test_requests_are_counted_by_route_template(client):
+    for item_id in (1, 2, 0):
+        client.get(f"/items/{item_id}")
+    client.get("/missing")
+
+    samples = _samples(metrics.render())
+
+    assert samples['http_requests_total{method="GET",route="/items/{item_id}",status="200"}'] == "2"
+    assert samples['http_requests_total{method="GET",route="/items/{item_id}",status="404"}'] == "1"
+    assert samples['http_requests_total{method="GET",route="<unmatched>",status="404"}'] == "1"
+    assert samples['http_request_duration_seconds_count{method="GET",route="/items/{item_id}"}'] == "3"
+
+
+def test_histogram_buckets_are_cumulative():
+    route = metrics.registry.route("GET", "/x")
+    for duration in (0.001, 0.005, 0.2, 30):
+        route.observe(200, duration)
+
+    samples = _samples(metrics.render())
+    bucket = 'http_request_duration_seconds_bucket{{method="GET",route="/x",le="{}"}}'
+
+    assert samples[bucket.format(0.005)] == "2"
+    assert samples[bucket.format(0.1)] == "2"
+    assert samples[bucket.format(0.25)] == "3"
+    assert samples[bucket.format(10.0)] == "3"
+    assert samples[bucket.format("+Inf")] == "4"
+
+
+def test_route_metrics_are_reused():
+    assert metrics.registry.route("GET", "/x") is metrics.registry.route("GET", "/x")
+
+
+def test_in_flight(client):
+    assert client.get("/in_flight").json() == {"in_flight": 1}
+    assert metrics.registry.in_flight == 0
+
+
+def test_push_outcomes_and_label_escaping():
+    metrics.registry.record_push("sent")
+    metrics.registry.record_push("failed")
+    metrics.registry.record_push("sent")
+
+    text = metrics.render(metrics.family("example", "gauge", "Пример", [({"name": 'a"b\\c'}, 1)]))
+    samples = _samples(text)
+
+    assert samples['push_deliveries_total{outcome="sent"}'] == "2"
+    assert samples['push_deliveries_total{outcome="failed"}'] == "1"
+    assert samples['example{name="a\\"b\\\\c"}'] == "1"
+    assert "# TYPE example gauge" in text
@@ -0,0 +1,71 @@
+import fastapi
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import middleware, security
+
+
+@pytest.fixture
+def client():
+    app = fastapi.FastAPI()
+    app.add_middleware(middleware.AuthMiddleware)
+
+    @app.get("/api/me")
+    def me(request: fastapi.Request):
+        return {"user_id": request.state.user_id}
+
+    @app.get("/api/login")
+    def login():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/docs", True),
+    ("/docs/oauth2-redirect", True),
+    ("/api/login", True),
+    ("/api/taskStatuses", True),
+    ("/api/tasks/all", False),
+    ("/", False),
+    ("/docsX", False),
+    ("/metricsX", False),
+    ("/api/prioritiesFoo", False),
+    ("/api/login/extra", False),
+])
+def test_is_exempt_path(path, expected):
+    assert middleware.is_exempt_path(path) is expected
+
+
+def test_sets_user_id_from_token(client):
+    token = security.create_access_token({"sub": "42"})
+
+    response = client.get("/api/me", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert response.json() == {"user_id": 42}
+
+
+@pytest.mark.parametrize("headers, detail", [
+    ({}, "Отсутствует токен авторизации"),
+    ({"Authorization": "Token abc"}, "Отсутствует токен авторизации"),
+    ({"Authorization": "Bearer abc"}, "Недействительный или просроченный токен"),
+])
+def test_rejects_missing_or_invalid_token(client, headers, detail):
+    response = client.get("/api/me", headers=headers)
+
+    assert response.status_code == 401
+    assert response.json() == {"detail": detail}
+
+
+def test_rejects_token_without_subject(client):
+    token = security.create_access_token({"role": "guest"})
+
+    response = client.get("/api/me", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Некорректный токен"}
+
+
+def test_exempt_path_skips_auth(client):
+    assert client.get("/api/login").status_code == 200
@@ -0,0 +1,123 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+import sqlalchemy
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import orm
+
+from app.crud import goal as goal_crud
+from app.crud import stream as stream_crud
+from app.crud import team as team_crud
+from app.models import base, custom_field, goal, meta, stream, task, team
+
+ALEMBIC_INI = Path(__file__).parents[4] / "alembic.ini"
+
+
+def _alembic_config(url: str) -> Config:
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("sqlalchemy.url", url)
+    config.attributes["configure_logger"] = False
+    return config
+
+
+@pytest.fixture
+def engine(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    command.upgrade(_alembic_config(url), "head")
+    engine = sqlalchemy.create_engine(url)
+    yield engine
+    engine.dispose()
+
+
+def _plan(session: orm.Session, query) -> str:
+    statement = query.statement.compile(session.bind, compile_kwargs={"literal_binds": True})
+    rows = session.execute(sqlalchemy.text(f"EXPLAIN QUERY PLAN {statement}")).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_migrations_match_models(engine):
+    with engine.connect() as connection:
+        context = MigrationContext.configure(connection, opts={"compare_type": True})
+        assert compare_metadata(context, base.Base.metadata) == []
+
+
+def test_migrations_seed_dictionaries(engine):
+    with orm.Session(engine) as session:
+        assert [r.name for r in session.query(team.Role).order_by(team.Role.id)] == ["Reader", "Editor"]
+        assert session.query(meta.Status).count() == 4
+        assert session.query(meta.Priority).count() == 5
+        assert session.query(meta.ConnectionType).count() == 3
+
+
+def test_downgrade_to_base(engine):
+    command.downgrade(_alembic_config(engine.url.render_as_string()), "base")
+
+    assert sqlalchemy.inspect(engine).get_table_names() == ["alembic_version"]
+
+
+def test_unique_custom_field_value_migration_removes_duplicates(tmp_path):
+    url = f"sqlite:///{tmp_path / 'duplicates.db'}"
+    command.upgrade(_alembic_config(url), "0002")
+
+    engine = sqlalchemy.create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(sqlalchemy.text("INSERT INTO \"Teams\" (id, name) VALUES (1, 'team')"))
+        connection.execute(sqlalchemy.text(
+            "INSERT INTO custom_fields (id, team_id, name, type) VALUES (1, 1, 'field', 'STRING')"))
+        for value_id, value in ((1, "old"), (2, "new")):
+            connection.execute(sqlalchemy.text(
+                "INSERT INTO task_custom_field_values (id, task_id, custom_field_id, value_string) "
+                "VALUES (:id, 1, 1, :value)"), {"id": value_id, "value": value})
+
+    command.upgrade(_alembic_config(url), "head")
+
+    with orm.Session(engine) as session:
+        values = session.query(custom_field.TaskCustomFieldValue).all()
+        assert [v.value_string for v in values] == ["new"]
+    engine.dispose()
+
+
+@pytest.mark.parametrize("build_query, index", [
+    (lambda s: s.query(task.Task).filter(task.Task.stream_id == 1).order_by(task.Task.position),
+     "ix_Tasks_stream_id"),
+    (lambda s: s.query(team.UserTeam).filter(team.UserTeam.team_id == 1, team.UserTeam.user_id == 1),
+     "ix_UserTeam_user_id_team_id"),
+    (lambda s: s.query(task.TaskHistory).filter(task.TaskHistory.task_id == 1)
+     .order_by(task.TaskHistory.changed_at.desc()),
+     "ix_TaskHistory_task_id_changed_at"),
+    (lambda s: s.query(task.TaskReminder).filter(task.TaskReminder.sent == False,  # noqa: E712
+                                                 task.TaskReminder.remind_at <= datetime(2026, 1, 1)),
+     "ix_task_reminders_sent_remind_at"),
+    (lambda s: s.query(goal.Goal).filter(goal.Goal.stream_id == 1), "ix_Goals_stream_id"),
+    (lambda s: s.query(stream.Stream).filter(stream.Stream.project_id == 1), "ix_Streams_project_id"),
+    (lambda s: s.query(meta.UserTask).filter(meta.UserTask.task_id == 1), "ix_UserTask_task_id"),
+    (lambda s: s.query(task.TaskRelation).filter(task.TaskRelation.task_id_2 == 1), "ix_TaskRelations_task_id_2"),
+])
+def test_hot_queries_use_indexes(engine, build_query, index):
+    with orm.Session(engine) as session:
+        assert f"INDEX {index}" in _plan(session, build_query(session))
+
+
+def test_crud_queries_use_indexes(engine, monkeypatch):
+    """Запросы crud проверяются как есть: перехватываем Query.all/first и смотрим план"""
+    plans = []
+
+    def capture(query):
+        plans.append(_plan(query.session, query))
+        return []
+
+    monkeypatch.setattr(orm.Query, "all", capture)
+    monkeypatch.setattr(orm.Query, "first", capture)
+
+    with orm.Session(engine) as session:
+        goal_crud.get_goals_by_stream(session, 1)
+        stream_crud.get_streams_by_project_id(session, 1)
+        team_crud.get_user_team(session, 1, 1)
+
+    assert "INDEX ix_Goals_stream_id" in plans[0]
+    assert "INDEX ix_Streams_project_id" in plans[1]
+    assert "INDEX ix_UserTeam_user_id_team_id" in plans[2]
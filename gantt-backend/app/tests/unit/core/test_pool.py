@@ -0,0 +1,108 @@
+import logging
+from unittest.mock import patch
+
+import pytest
+import sqlalchemy
+from sqlalchemy import exc
+
+from app.core import pool
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=pool.MonitoredQueuePool,
+                                      pool_size=1, max_overflow=1, pool_timeout=0.05)
+    yield engine
+    engine.dispose()
+
+
+def test_checkouts_are_counted(engine):
+    for _ in range(3):
+        with engine.connect():
+            pass
+
+    status = pool.pool_status(engine.pool)
+
+    assert status["pool_class"] == "MonitoredQueuePool"
+    assert status["checkouts"] == 3
+    assert status["checked_out"] == 0
+    assert status["size"] == 1
+    assert status["max_overflow"] == 1
+
+
+def test_each_pool_has_own_stats(engine, tmp_path):
+    other = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'other.db'}", poolclass=pool.MonitoredQueuePool)
+    try:
+        with other.connect():
+            pass
+
+        assert pool.pool_status(engine.pool)["checkouts"] == 0
+        assert pool.pool_status(other.pool)["checkouts"] == 1
+    finally:
+        other.dispose()
+
+
+def test_stats_survive_dispose(engine):
+    with engine.connect():
+        pass
+    engine.dispose()
+
+    assert pool.pool_status(engine.pool)["checkouts"] == 1
+
+
+def test_overflow_and_saturation_are_logged(engine, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.core.pool"):
+        with engine.connect(), engine.connect():
+            status = pool.pool_status(engine.pool)
+
+    assert status["checked_out"] == 2
+    assert status["overflow"] == 1
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("сверх pool_size" in message for message in messages)
+    assert any("Выданы все соединения" in message for message in messages)
+
+
+def test_timeout_is_counted_and_logged(engine, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.core.pool"):
+        with engine.connect(), engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+
+    assert pool.pool_status(engine.pool)["timeouts"] == 1
+    assert any("исчерпан" in record.getMessage() for record in caplog.records)
+
+
+def test_slow_checkout_is_logged(engine, caplog):
+    with patch.object(pool.settings, "DB_POOL_WAIT_WARNING_MS", 0), caplog.at_level(logging.WARNING,
+                                                                                     logger="app.core.pool"):
+        with engine.connect():
+            pass
+
+    assert any("Ожидание соединения" in record.getMessage() for record in caplog.records)
+
+
+def test_warnings_are_throttled(engine, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.core.pool"):
+        for _ in range(3):
+            with engine.connect(), engine.connect():
+                pass
+
+    assert sum("сверх pool_size" in record.getMessage() for record in caplog.records) == 1
+
+
+def test_engine_options_for_server_database():
+    options = pool.engine_options("postgresql://user:pass@db/tracker")
+
+    assert options["poolclass"] is pool.MonitoredQueuePool
+    assert options["pool_size"] == pool.settings.DB_POOL_SIZE
+    assert options["max_overflow"] == pool.settings.DB_POOL_MAX_OVERFLOW
+    assert options["pool_timeout"] == pool.settings.DB_POOL_TIMEOUT
+    assert options["pool_recycle"] == pool.settings.DB_POOL_RECYCLE
+    assert options["pool_pre_ping"] == pool.settings.DB_POOL_PRE_PING
+
+
+def test_engine_options_for_sqlite_in_memory():
+    options = pool.engine_options("sqlite://")
+
+    assert "pool_size" not in options
+    assert sqlalchemy.create_engine("sqlite://", **options).connect()
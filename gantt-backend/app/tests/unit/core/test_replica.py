@@ -0,0 +1,105 @@
+import fastapi
+import pytest
+import sqlalchemy
+from fastapi.testclient import TestClient
+from sqlalchemy import orm
+from sqlalchemy.ext import asyncio
+
+from app.core import db, middleware, replica, security
+from app.services import permissions
+
+
+def _marker_database(path, name: str) -> str:
+    engine = sqlalchemy.create_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        connection.execute(sqlalchemy.text("CREATE TABLE marker (name TEXT)"))
+        connection.execute(sqlalchemy.text("INSERT INTO marker VALUES (:name)"), {"name": name})
+    engine.dispose()
+    return f"sqlite:///{path}"
+
+
+def _where(session: orm.Session) -> str:
+    return session.execute(sqlalchemy.text("SELECT name FROM marker")).scalar_one()
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    primary_url = _marker_database(tmp_path / "primary.db", "primary")
+    replica_url = _marker_database(tmp_path / "replica.db", "replica")
+
+    engines = [sqlalchemy.create_engine(primary_url), sqlalchemy.create_engine(replica_url)]
+    async_engines = [asyncio.create_async_engine(db.async_database_url(primary_url)),
+                     asyncio.create_async_engine(db.async_database_url(replica_url))]
+    monkeypatch.setattr(db, "SessionLocal", orm.sessionmaker(bind=engines[0]))
+    monkeypatch.setattr(db, "ReadSessionLocal", orm.sessionmaker(bind=engines[1]))
+    monkeypatch.setattr(db, "AsyncSessionLocal", asyncio.async_sessionmaker(async_engines[0]))
+    monkeypatch.setattr(db, "AsyncReadSessionLocal", asyncio.async_sessionmaker(async_engines[1]))
+    replica.recent_writes.clear()
+
+    app = fastapi.FastAPI()
+    app.add_middleware(middleware.AuthMiddleware)
+
+    @app.get("/where")
+    def where(data_base: orm.Session = fastapi.Depends(db.get_read_db)):
+        return {"database": _where(data_base)}
+
+    @app.get("/where_async")
+    async def where_async(data_base: asyncio.AsyncSession = fastapi.Depends(db.get_async_read_db)):
+        return {"database": await data_base.run_sync(_where)}
+
+    @app.get("/shared")
+    def shared(data_base: orm.Session = fastapi.Depends(db.get_read_db)):
+        return {"shared": permissions.get_access_context(data_base).shared}
+
+    @app.get("/shared_async")
+    async def shared_async(data_base: asyncio.AsyncSession = fastapi.Depends(db.get_async_read_db)):
+        return {"shared": await data_base.run_sync(lambda session: permissions.get_access_context(session).shared)}
+
+    @app.post("/write")
+    def write(data_base: orm.Session = fastapi.Depends(db.get_db)):
+        _where(data_base)
+        data_base.commit()
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+    replica.recent_writes.clear()
+    for engine in engines:
+        engine.dispose()
+
+
+def _headers(user_id: int) -> dict:
+    return {"Authorization": f"Bearer {security.create_access_token({'sub': str(user_id)})}"}
+
+
+@pytest.mark.parametrize("path", ["/where", "/where_async"])
+def test_reads_go_to_replica(client, path):
+    assert client.get(path, headers=_headers(1)).json() == {"database": "replica"}
+
+
+@pytest.mark.parametrize("path", ["/where", "/where_async"])
+def test_reads_stick_to_primary_after_own_write(client, path):
+    client.post("/write", headers=_headers(1))
+
+    assert client.get(path, headers=_headers(1)).json() == {"database": "primary"}
+    assert client.get(path, headers=_headers(2)).json() == {"database": "replica"}
+
+
+def test_sticky_window_expires(client):
+    client.post("/write", headers=_headers(1))
+    replica.recent_writes.clear()
+
+    assert client.get("/where", headers=_headers(1)).json() == {"database": "replica"}
+
+
+@pytest.mark.parametrize("path", ["/shared", "/shared_async"])
+def test_replica_reads_do_not_feed_shared_index(client, path):
+    assert client.get(path, headers=_headers(1)).json() == {"shared": False}
+
+    client.post("/write", headers=_headers(1))
+
+    assert client.get(path, headers=_headers(1)).json() == {"shared": True}
+
+
+def test_wrote_recently_without_user():
+    assert not replica.wrote_recently(None)
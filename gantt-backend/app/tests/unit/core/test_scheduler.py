@@ -0,0 +1,92 @@
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+import sqlalchemy
+from apscheduler.schedulers.background import BackgroundScheduler
+from sqlalchemy import orm, pool
+
+from app.core import exception, schema
+from app.core import scheduler as scheduler_module
+from app.core.config import settings
+from app.models import task
+
+BACKEND_DIR = Path(__file__).parents[4]
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = sqlalchemy.create_engine("sqlite://", connect_args={"check_same_thread": False},
+                                      poolclass=pool.StaticPool)
+    task.TaskReminder.__table__.create(engine)
+    factory = orm.sessionmaker(bind=engine)
+    monkeypatch.setattr(scheduler_module, "SessionLocal", factory)
+    # Запущенный на паузе планировщик заменяет задачи по id, как в работающем приложении, но не выполняет их
+    test_scheduler = BackgroundScheduler()
+    test_scheduler.start(paused=True)
+    monkeypatch.setattr(scheduler_module, "scheduler", test_scheduler)
+    yield factory
+    test_scheduler.shutdown(wait=False)
+    engine.dispose()
+
+
+def test_scan_schedules_only_reminders_in_window(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "REMINDER_WINDOW_MINUTES", 60)
+    monkeypatch.setattr(settings, "REMINDER_SCAN_INTERVAL_MINUTES", 15)
+    now = datetime.utcnow()
+
+    with session_factory() as session:
+        session.add_all([
+            task.TaskReminder(id=1, task_id=1, user_id=1, remind_at=now - timedelta(minutes=5), sent=False),
+            task.TaskReminder(id=2, task_id=1, user_id=1, remind_at=now + timedelta(minutes=10), sent=False),
+            task.TaskReminder(id=3, task_id=1, user_id=1, remind_at=now + timedelta(minutes=20), sent=True),
+            task.TaskReminder(id=4, task_id=1, user_id=1, remind_at=now + timedelta(hours=3), sent=False),
+        ])
+        session.commit()
+
+    scheduler_module.schedule_upcoming_reminders()
+    scheduler_module.schedule_upcoming_reminders()
+
+    assert [job.id for job in scheduler_module.scheduler.get_jobs()] == ["2"]
+
+
+def test_window_covers_two_scan_intervals(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "REMINDER_WINDOW_MINUTES", 30)
+    monkeypatch.setattr(settings, "REMINDER_SCAN_INTERVAL_MINUTES", 30)
+
+    with session_factory() as session:
+        session.add(task.TaskReminder(id=1, task_id=1, user_id=1,
+                                      remind_at=datetime.utcnow() + timedelta(minutes=50), sent=False))
+        session.commit()
+
+    scheduler_module.schedule_upcoming_reminders()
+
+    assert [job.id for job in scheduler_module.scheduler.get_jobs()] == ["1"]
+
+
+def test_schema_check_requires_latest_revision(tmp_path):
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    with pytest.raises(exception.SchemaOutdatedError):
+        schema.check_schema(engine)
+
+    with engine.begin() as connection:
+        connection.execute(sqlalchemy.text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        connection.execute(sqlalchemy.text("INSERT INTO alembic_version VALUES ('0001')"))
+    with pytest.raises(exception.SchemaOutdatedError):
+        schema.check_schema(engine)
+
+    with engine.begin() as connection:
+        connection.execute(sqlalchemy.text("UPDATE alembic_version SET version_num = '0003'"))
+    schema.check_schema(engine)
+    engine.dispose()
+
+
+def test_main_import_skips_heavy_dependencies():
+    code = ("import sys, main; "
+            "print(','.join(m for m in ('pywebpush', 'ics', 'alembic') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True,
+                            check=True)
+
+    assert result.stdout.strip() == ""
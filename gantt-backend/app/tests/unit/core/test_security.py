@@ -0,0 +1,108 @@
+import asyncio
+import threading
+from concurrent import futures
+from unittest.mock import patch
+
+import jose
+import pytest
+from passlib.context import CryptContext
+
+from app.core import exception, security
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    security.token_cache.clear()
+    yield
+    security.token_cache.clear()
+
+
+def test_cached_decode_verifies_token_once():
+    token = security.create_access_token({"sub": "42"})
+
+    with patch("app.core.security.jwt.decode", wraps=security.jwt.decode) as decode:
+        first = security.decode_access_token_cached(token)
+        second = security.decode_access_token_cached(token)
+
+    assert first == second
+    assert first["sub"] == "42"
+    assert decode.call_count == 1
+
+
+def test_cached_claims_are_copies():
+    token = security.create_access_token({"sub": "42"})
+
+    security.decode_access_token_cached(token)["sub"] = "43"
+
+    assert security.decode_access_token_cached(token)["sub"] == "42"
+
+
+def test_expired_entry_is_verified_again():
+    cache = security.TokenCache()
+    cache.set("token", {"sub": "42", "exp": 100})
+
+    with patch("app.core.security.time.time", return_value=99):
+        assert cache.get("token") == {"sub": "42", "exp": 100}
+    with patch("app.core.security.time.time", return_value=100):
+        assert cache.get("token") is None
+
+
+def test_invalid_token_is_not_cached():
+    with pytest.raises(jose.JWTError):
+        security.decode_access_token_cached("not-a-token")
+
+    assert security.token_cache.get("not-a-token") is None
+
+
+def test_cache_is_bounded():
+    cache = security.TokenCache(max_entries=2)
+    for token in ("a", "b", "c"):
+        cache.set(token, {"exp": 2 ** 40})
+
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.get("c") is not None
+
+
+def test_hasher_runs_in_process_pool():
+    hasher = security.PasswordHasher(workers=1, queue_limit=1)
+    try:
+        password_hash = asyncio.run(hasher.hash("secret"))
+        assert asyncio.run(hasher.verify_and_update("secret", password_hash)) == (True, None)
+        assert asyncio.run(hasher.verify_and_update("wrong", password_hash)) == (False, None)
+        assert hasher._executor._mp_context.get_start_method() != "fork"
+    finally:
+        hasher.shutdown()
+
+
+def test_hasher_rejects_when_queue_is_full():
+    hasher = security.PasswordHasher(workers=1, queue_limit=0)
+    gate = threading.Event()
+
+    def hold(password):
+        gate.wait()
+        return password
+
+    async def burst():
+        executor = futures.ThreadPoolExecutor(max_workers=1)
+        with patch("app.core.security.futures.ProcessPoolExecutor", return_value=executor):
+            first = asyncio.ensure_future(hasher._run(hold, "first"))
+            await asyncio.sleep(0)
+            with pytest.raises(exception.UnavailableError):
+                await hasher.hash("second")
+            gate.set()
+            assert await first == "first"
+        hasher.shutdown()
+
+    asyncio.run(burst())
+
+
+def test_outdated_rounds_need_rehash():
+    old_hash = CryptContext(schemes=["pbkdf2_sha256"], pbkdf2_sha256__default_rounds=1000).hash("secret")
+
+    is_valid, new_hash = security.verify_and_update_password("secret", old_hash)
+
+    assert is_valid
+    assert new_hash is not None
+    assert security.verify_password("secret", new_hash)
+    assert security.verify_and_update_password("secret", new_hash) == (True, None)
@@ -0,0 +1,112 @@
+import logging
+import re
+
+import fastapi
+import pytest
+import sqlalchemy
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import sql_timing
+from app.core.config import settings
+
+
+def _server_timing(response) -> dict:
+    return {name: (float(duration), description) for name, duration, description in
+            re.findall(r'([\w-]+);dur=([\d.]+)(?:;desc="([^"]*)")?', response.headers["Server-Timing"])}
+
+
+@pytest.fixture
+def engine():
+    engine = sqlalchemy.create_engine("sqlite://")
+    sql_timing.instrument(engine)
+    sql_timing.instrument(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def client(engine):
+    async_engine = create_async_engine("sqlite+aiosqlite://")
+    sql_timing.instrument(async_engine.sync_engine)
+
+    app = fastapi.FastAPI()
+    app.add_middleware(sql_timing.SQLTimingMiddleware)
+
+    @app.get("/sync/{count}")
+    def run_sync(count: int):
+        with engine.connect() as connection:
+            for _ in range(count):
+                connection.execute(sqlalchemy.text("SELECT 1"))
+        return {}
+
+    @app.get("/failing")
+    def run_failing():
+        with engine.connect() as connection:
+            with pytest.raises(sqlalchemy.exc.OperationalError):
+                connection.execute(sqlalchemy.text("SELECT * FROM missing"))
+            return {"pending": len(connection.info.get(sql_timing._START_KEY, []))}
+
+    @app.get("/async/{count}")
+    async def run_async(count: int):
+        async with async_engine.connect() as connection:
+            for _ in range(count):
+                await connection.execute(sqlalchemy.text("SELECT 1"))
+        return {}
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.mark.parametrize("path", ["/sync", "/async"])
+def test_server_timing_counts_queries(client, path):
+    timing = _server_timing(client.get(f"{path}/3"))
+
+    assert timing["db"][1] == "3 queries"
+    assert timing["db"][0] >= timing["db-slowest"][0]
+
+    assert _server_timing(client.get(f"{path}/0"))["db"] == (0.0, "0 queries")
+
+
+def test_failed_statement_does_not_leave_start_time(client):
+    assert client.get("/failing").json() == {"pending": 0}
+
+
+def test_queries_outside_request_are_ignored(client, engine):
+    with engine.connect() as connection:
+        connection.execute(sqlalchemy.text("SELECT 1"))
+
+    assert _server_timing(client.get("/sync/1"))["db"][1] == "1 queries"
+
+
+def test_slow_request_and_query_are_logged(client, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SQL_SLOW_REQUEST_MS", 0)
+    monkeypatch.setattr(settings, "SQL_SLOW_QUERY_MS", 0)
+
+    with caplog.at_level(logging.WARNING, logger=sql_timing.logger.name):
+        client.get("/sync/2")
+
+    slow_queries = [r for r in caplog.records if r.getMessage().startswith("Медленный SQL-запрос")]
+    assert len(slow_queries) == 2
+
+    request_record, = [r for r in caplog.records if hasattr(r, "sql")]
+    assert request_record.sql["path"] == "/sync/2"
+    assert request_record.sql["status"] == 200
+    assert request_record.sql["queries"] == 2
+    assert request_record.sql["slowest_statement"] == "SELECT 1"
+    assert "queries=2" in request_record.getMessage()
+
+
+def test_fast_request_is_not_logged_as_warning(client, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SQL_SLOW_REQUEST_MS", 60_000)
+
+    with caplog.at_level(logging.WARNING, logger=sql_timing.logger.name):
+        client.get("/sync/1")
+
+    assert caplog.records == []
+
+
+def test_disabled(client, monkeypatch):
+    monkeypatch.setattr(settings, "SQL_TIMING_ENABLED", False)
+
+    assert "Server-Timing" not in client.get("/sync/1").headers
@@ -0,0 +1,38 @@
+import asyncio
+from unittest.mock import Mock
+
+from app.core.streaming import accepts_ndjson, ndjson_response
+from app.schemas.stream import StreamResponse
+
+
+def test_accepts_ndjson():
+    request = Mock()
+    request.headers = {"Accept": "application/x-ndjson"}
+
+    assert accepts_ndjson(request)
+
+
+def test_accepts_ndjson_default_json():
+    request = Mock()
+    request.headers = {"Accept": "application/json"}
+
+    assert not accepts_ndjson(request)
+
+
+def test_ndjson_response_sends_first_line_before_source_is_exhausted():
+    fetched = []
+
+    def items():
+        for i in range(3):
+            fetched.append(i)
+            yield {"id": i, "name": f"Stream {i}", "project_id": 42, "position": i}
+
+    response = ndjson_response(items(), StreamResponse)
+
+    async def first_chunk():
+        return await response.body_iterator.__anext__()
+
+    chunk = asyncio.run(first_chunk())
+
+    assert chunk == '{"id":0,"name":"Stream 0","project_id":42,"position":0}\n'
+    assert fetched == [0]
@@ -37,9 +37,9 @@ def test_create_goal():
     assert result.position == goal_data.position
 
     mock_db.add.assert_called_once()
-    mock_db.commit.assert_called_once()
+    mock_db.flush.assert_called_once()
     added_obj = mock_db.add.call_args[0][0]
-    mock_db.refresh.assert_called_once_with(added_obj)
+    mock_db.commit.assert_not_called()
 
     assert result is added_obj
 
@@ -66,9 +66,9 @@ def test_create_goal_minimum_data():
     assert result.position == goal_data.position
 
     mock_db.add.assert_called_once()
-    mock_db.commit.assert_called_once()
+    mock_db.flush.assert_called_once()
     added_obj = mock_db.add.call_args[0][0]
-    mock_db.refresh.assert_called_once_with(added_obj)
+    mock_db.commit.assert_not_called()
 
     assert result is added_obj
 
@@ -161,8 +161,8 @@ def test_update_goal_updates_fields():
 
     assert goal_obj.name == "Updated"
     assert goal_obj.deadline == new_deadline
-    mock_db.commit.assert_called_once()
-    mock_db.refresh.assert_called_once_with(goal_obj)
+    mock_db.flush.assert_called_once()
+    mock_db.commit.assert_not_called()
     assert result is goal_obj
 
 
@@ -187,18 +187,18 @@ def test_update_goal_empty_data():
 
     result = update_goal(mock_db, goal_obj, goal_data)
 
-    mock_db.commit.assert_called_once()
-    mock_db.refresh.assert_called_once_with(goal_obj)
+    mock_db.flush.assert_called_once()
+    mock_db.commit.assert_not_called()
     assert result is goal_obj
 
 
-def test_delete_goal_calls_delete_and_commit():
+def test_delete_goal_calls_delete_and_flush():
     mock_db = Mock()
     goal_obj = Mock()
     delete_goal(mock_db, goal_obj)
 
     mock_db.delete.assert_called_once_with(goal_obj)
-    mock_db.commit.assert_called_once()
+    mock_db.flush.assert_called_once()
 
 
 def test_delete_goal_does_not_refresh():
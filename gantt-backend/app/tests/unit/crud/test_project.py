@@ -63,9 +63,9 @@ def test_create_project():
     assert result.team_id == team_id
 
     mock_db.add.assert_called_once()
-    mock_db.commit.assert_called_once()
+    mock_db.flush.assert_called_once()
     added_obj = mock_db.add.call_args[0][0]
-    mock_db.refresh.assert_called_once_with(added_obj)
+    mock_db.commit.assert_not_called()
     assert result is added_obj
 
 
@@ -87,8 +87,8 @@ def test_update_project_updates_name():
     result = update_project(mock_db, project_obj, update_data)
 
     assert project_obj.name == "Updated name"
-    mock_db.commit.assert_called_once()
-    mock_db.refresh.assert_called_once_with(project_obj)
+    mock_db.flush.assert_called_once()
+    mock_db.commit.assert_not_called()
     assert result is project_obj
 
 
@@ -111,19 +111,19 @@ def test_update_project_empty_data():
 
     result = update_project(mock_db, project_obj, update_data)
 
-    mock_db.commit.assert_called_once()
-    mock_db.refresh.assert_called_once_with(project_obj)
+    mock_db.flush.assert_called_once()
+    mock_db.commit.assert_not_called()
     assert result is project_obj
 
 
-def test_delete_project_calls_delete_and_commit():
+def test_delete_project_calls_delete_and_flush():
     mock_db = Mock()
     project_obj = Mock()
 
     delete_project(mock_db, project_obj)
 
     mock_db.delete.assert_called_once_with(project_obj)
-    mock_db.commit.assert_called_once()
+    mock_db.flush.assert_called_once()
 
 
 def test_delete_project_does_not_refresh():
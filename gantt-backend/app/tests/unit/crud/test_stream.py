@@ -82,9 +82,9 @@ def test_create_new_stream():
     assert result.project_id == proj_id
 
     mock_db.add.assert_called_once()
-    mock_db.commit.assert_called_once()
+    mock_db.flush.assert_called_once()
     added_obj = mock_db.add.call_args[0][0]
-    mock_db.refresh.assert_called_once_with(added_obj)
+    mock_db.commit.assert_not_called()
     assert result is added_obj
 
 
@@ -111,8 +111,8 @@ def test_update_stream_updates_name():
     result = update_stream(mock_db, stream_obj, update_data)
 
     assert stream_obj.name == "New name"
-    mock_db.commit.assert_called_once()
-    mock_db.refresh.assert_called_once_with(stream_obj)
+    mock_db.flush.assert_called_once()
+    mock_db.commit.assert_not_called()
     assert result is stream_obj
 
 
@@ -143,8 +143,8 @@ def test_update_stream_same_name_no_db_check():
 
     result = update_stream(mock_db, stream_obj, update_data)
 
-    mock_db.commit.assert_called_once()
-    mock_db.refresh.assert_called_once_with(stream_obj)
+    mock_db.flush.assert_called_once()
+    mock_db.commit.assert_not_called()
     assert result is stream_obj
 
 
@@ -157,8 +157,8 @@ def test_update_stream_none_name_skips_update():
     result = update_stream(mock_db, stream_obj, update_data)
 
     assert stream_obj.name == "Stream test"
-    mock_db.commit.assert_called_once()
-    mock_db.refresh.assert_called_once_with(stream_obj)
+    mock_db.flush.assert_called_once()
+    mock_db.commit.assert_not_called()
     assert result is stream_obj
 
 
@@ -172,7 +172,7 @@ def test_delete_stream_deletes_tasks_goals_and_stream():
     delete_stream(mock_db, stream_id)
 
     mock_db.delete.assert_called_once_with(stream_obj)
-    mock_db.commit.assert_called_once()
+    mock_db.flush.assert_called_once()
 
     assert mock_db.query.return_value.filter.return_value.delete.call_count == 2
 
@@ -35,52 +35,57 @@ def test_get_task_by_id_returns_none_when_not_found():
 
 def test_get_tasks_by_stream_returns_list():
     mock_db = Mock()
-    expected = [Mock(), Mock()]
-    mock_db.query.return_value.filter.return_value.all.return_value = expected
+    expected = [Mock(assigned_users=[]), Mock(assigned_users=[])]
+    mock_db.query.return_value.filter.return_value.options.return_value.all.return_value = expected
 
     result = get_tasks_by_stream(mock_db, stream_id=42)
 
     assert result == expected
-    mock_db.query.return_value.filter.return_value.all.assert_called_once()
+    mock_db.query.return_value.filter.return_value.options.return_value.all.assert_called_once()
 
 
 def test_get_tasks_by_stream_returns_empty_list():
     mock_db = Mock()
-    mock_db.query.return_value.filter.return_value.all.return_value = []
+    mock_db.query.return_value.filter.return_value.options.return_value.all.return_value = []
 
     result = get_tasks_by_stream(mock_db, stream_id=42)
 
     assert result == []
 
 
-def test_get_tasks_by_project_returns_all_tasks():
+def test_get_tasks_by_stream_sets_assignee_email():
     mock_db = Mock()
+    task_obj = Mock()
+    task_obj.assigned_users = [Mock()]
+    task_obj.assigned_users[0].user.email = "test@test.com"
+    mock_db.query.return_value.filter.return_value.options.return_value.all.return_value = [task_obj]
+
+    result = get_tasks_by_stream(mock_db, stream_id=42)
 
-    stream1 = Mock()
-    stream1.id = 42
-    stream2 = Mock()
-    stream2.id = 43
+    assert result[0].assignee_email == "test@test.com"
 
-    project_obj = Mock()
-    project_obj.streams = [stream1, stream2]
 
-    tasks_stream1 = [Mock(), Mock()]
-    tasks_stream2 = [Mock()]
+def test_get_tasks_by_project_returns_all_tasks():
+    mock_db = Mock()
+    project_obj = Mock()
+    project_obj.id = 42
 
-    mock_db.query.return_value.filter.return_value.all.side_effect = [
-        tasks_stream1,
-        tasks_stream2,
-    ]
+    tasks = [Mock(assigned_users=[]), Mock(assigned_users=[]), Mock(assigned_users=[])]
+    query = mock_db.query.return_value.join.return_value.filter.return_value.options.return_value
+    query.all.return_value = tasks
 
     result = get_tasks_by_project(mock_db, project_obj)
 
-    assert result == tasks_stream1 + tasks_stream2
+    assert result == tasks
+    query.all.assert_called_once()
 
 
 def test_get_tasks_by_project_returns_empty_list_when_no_streams():
     mock_db = Mock()
     project_obj = Mock()
-    project_obj.streams = []
+    project_obj.id = 42
+    query = mock_db.query.return_value.join.return_value.filter.return_value.options.return_value
+    query.all.return_value = []
 
     result = get_tasks_by_project(mock_db, project_obj)
 
@@ -157,8 +162,8 @@ def test_update_task_updates_fields():
 
     assert task_obj.name == "Updated task"
     assert task_obj.description == "New description"
-    mock_db.commit.assert_called_once()
-    mock_db.refresh.assert_called_once_with(task_obj)
+    mock_db.flush.assert_called_once()
+    mock_db.commit.assert_not_called()
     assert result is task_obj
 
 
@@ -182,19 +187,19 @@ def test_update_task_empty_data():
 
     result = update_task(mock_db, task_obj, update_data)
 
-    mock_db.commit.assert_called_once()
-    mock_db.refresh.assert_called_once_with(task_obj)
+    mock_db.flush.assert_called_once()
+    mock_db.commit.assert_not_called()
     assert result is task_obj
 
 
-def test_delete_task_calls_delete_and_commit():
+def test_delete_task_calls_delete_and_flush():
     mock_db = Mock()
     task_obj = Mock()
 
     delete_task(mock_db, task_obj)
 
     mock_db.delete.assert_called_once_with(task_obj)
-    mock_db.commit.assert_called_once()
+    mock_db.flush.assert_called_once()
 
 
 def test_delete_task_does_not_refresh():
@@ -219,7 +224,7 @@ def test_create_task_relation():
     assert result.connection_id == connection_id
 
     mock_db.add.assert_called_once()
-    mock_db.commit.assert_called_once()
+    mock_db.flush.assert_called_once()
     added_obj = mock_db.add.call_args[0][0]
-    mock_db.refresh.assert_called_once_with(added_obj)
+    mock_db.commit.assert_not_called()
     assert result is added_obj
@@ -142,9 +142,9 @@ def test_create_team():
     assert result.name == "Test"
 
     mock_db.add.assert_called_once()
-    mock_db.commit.assert_called_once()
+    mock_db.flush.assert_called_once()
     added_obj = mock_db.add.call_args[0][0]
-    mock_db.refresh.assert_called_once_with(added_obj)
+    mock_db.commit.assert_not_called()
     assert result is added_obj
 
 
@@ -161,19 +161,19 @@ def test_add_user_to_team():
     assert result.role_id == role_id
 
     mock_db.add.assert_called_once()
-    mock_db.commit.assert_called_once()
+    mock_db.flush.assert_called_once()
     added_obj = mock_db.add.call_args[0][0]
-    mock_db.refresh.assert_called_once_with(added_obj)
+    mock_db.commit.assert_not_called()
     assert result is added_obj
 
 
-def test_delete_member_calls_delete_and_commit():
+def test_delete_member_deletes_without_commit():
     mock_db = Mock()
 
     delete_member(mock_db, team_id=42, user_id=42)
 
     mock_db.query.return_value.filter.return_value.delete.assert_called_once()
-    mock_db.commit.assert_called_once()
+    mock_db.commit.assert_not_called()
 
 
 def test_delete_member_does_not_refresh():
@@ -184,14 +184,14 @@ def test_delete_member_does_not_refresh():
     mock_db.refresh.assert_not_called()
 
 
-def test_delete_team_calls_delete_and_commit():
+def test_delete_team_calls_delete_and_flush():
     mock_db = Mock()
     team_obj = Mock()
 
     delete_team(mock_db, team_obj)
 
     mock_db.delete.assert_called_once_with(team_obj)
-    mock_db.commit.assert_called_once()
+    mock_db.flush.assert_called_once()
 
 
 def test_delete_team_does_not_refresh():
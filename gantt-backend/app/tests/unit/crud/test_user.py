@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 from sqlalchemy.exc import IntegrityError
 
 from app.crud.user import (
@@ -71,7 +71,7 @@ def test_get_user_by_nickname_returns_none_when_not_found():
 
 
 def test_create_user():
-    mock_db = Mock()
+    mock_db = MagicMock()
 
     result = create_user(
         mock_db,
@@ -85,15 +85,15 @@ def test_create_user():
     assert result.password_hash == "hash"
 
     mock_db.add.assert_called_once()
-    mock_db.commit.assert_called_once()
+    mock_db.flush.assert_called_once()
     added_obj = mock_db.add.call_args[0][0]
-    mock_db.refresh.assert_called_once_with(added_obj)
+    mock_db.commit.assert_not_called()
     assert result is added_obj
 
 
 def test_create_user_raises_conflict_on_integrity_error():
-    mock_db = Mock()
-    mock_db.commit.side_effect = IntegrityError(None, None, None)
+    mock_db = MagicMock()
+    mock_db.flush.side_effect = IntegrityError(None, None, None)
 
     with pytest.raises(ConflictError):
         create_user(
@@ -103,12 +103,13 @@ def test_create_user_raises_conflict_on_integrity_error():
             password_hash="hash",
         )
 
-    mock_db.rollback.assert_called_once()
+    mock_db.begin_nested.assert_called_once()
+    mock_db.rollback.assert_not_called()
 
 
 def test_create_user_does_not_refresh_on_integrity_error():
-    mock_db = Mock()
-    mock_db.commit.side_effect = IntegrityError(None, None, None)
+    mock_db = MagicMock()
+    mock_db.flush.side_effect = IntegrityError(None, None, None)
 
     with pytest.raises(ConflictError):
         create_user(
@@ -248,7 +248,7 @@ def test_create_task_service_success_with_position(mock_create, mock_check_perms
     )
     mock_create.assert_called_once_with(mock_db, stream_id, task_data)
     mock_db.commit.assert_called_once()
-    mock_db.refresh.assert_called_once_with(expected_task)
+    mock_db.refresh.assert_not_called()
     assert result is expected_task
 
 
@@ -311,7 +311,7 @@ def test_create_task_service_with_assignee(mock_create, mock_check_perms):
 
     mock_db.add.assert_called_once()
     mock_db.commit.assert_called_once()
-    mock_db.refresh.assert_called_once_with(new_task)
+    mock_db.refresh.assert_not_called()
 
 
 @patch("app.services.task_service.check_stream_permissions")
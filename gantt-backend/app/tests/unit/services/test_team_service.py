@@ -181,7 +181,7 @@ def test_create_team_service_success(mock_create_team, mock_add_user):
     mock_create_team.assert_called_once_with(mock_db, "Test team")
     mock_add_user.assert_called_once_with(mock_db, team_obj.id, owner_id, Role.EDITOR)
     mock_db.commit.assert_called_once()
-    mock_db.refresh.assert_called_once_with(team_obj)
+    mock_db.refresh.assert_not_called()
     assert result is team_obj
 
 
@@ -206,7 +206,7 @@ def test_update_team_service_success_name_only(mock_get_team, mock_check_perms):
     mock_check_perms.assert_called_once_with(mock_db, team_id, user_id, need_lead=True)
     assert team_obj.name == "Test team"
     mock_db.commit.assert_called_once()
-    mock_db.refresh.assert_called_once_with(team_obj)
+    mock_db.refresh.assert_not_called()
     assert result is team_obj
 
 
@@ -1,10 +1,13 @@
-from unittest.mock import Mock, patch
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
-from app.core import exception
+from app.core import exception, user_cache
 from app.services.user_service import (
+    CurrentUser,
     get_current_user_service,
+    get_user_profile_service,
     check_email_exists_service,
     register_user_service,
     login_user_service,
@@ -13,6 +16,13 @@ from app.services.user_service import (
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    user_cache.profiles.clear()
+    yield
+    user_cache.profiles.clear()
+
+
 @patch("app.services.user_service.user_crud.get_user_by_id")
 def test_get_current_user_service_success(mock_get_user):
     mock_db = Mock()
@@ -61,7 +71,7 @@ def test_check_email_exists_service_not_exists(mock_get_by_email):
 
 
 @patch("app.services.user_service.security.create_access_token")
-@patch("app.services.user_service.security.get_password_hash")
+@patch("app.services.user_service.security.password_hasher.hash", new_callable=AsyncMock)
 @patch("app.services.user_service.user_crud.create_user")
 @patch("app.services.user_service.user_crud.get_user_by_nickname")
 @patch("app.services.user_service.user_crud.get_user_by_email")
@@ -81,7 +91,7 @@ def test_register_user_service_success(
     mock_create_user.return_value = new_user
     mock_create_token.return_value = "test_token"
 
-    result = register_user_service(mock_db, "test@test.com", "Test", "pass")
+    result = asyncio.run(register_user_service(mock_db, "test@test.com", "Test", "pass"))
 
     mock_get_by_email.assert_called_once_with(mock_db, "test@test.com")
     mock_get_by_nickname.assert_called_once_with(mock_db, "Test")
@@ -92,6 +102,7 @@ def test_register_user_service_success(
         nickname="Test",
         password_hash="hash",
     )
+    mock_db.commit.assert_called_once()
     mock_create_token.assert_called_once_with({"sub": str(new_user.id)})
     assert result == {"access_token": "test_token", "token_type": "Bearer"}
 
@@ -103,7 +114,7 @@ def test_register_user_service_email_conflict(mock_get_by_email):
     mock_get_by_email.return_value = Mock(id=42)
 
     with pytest.raises(exception.ConflictError):
-        register_user_service(mock_db, "test@test.com", "Test", "pass")
+        asyncio.run(register_user_service(mock_db, "test@test.com", "Test", "pass"))
 
 
 @patch("app.services.user_service.user_crud.get_user_by_nickname")
@@ -117,10 +128,10 @@ def test_register_user_service_nickname_conflict(
     mock_get_by_nickname.return_value = Mock(id=42)
 
     with pytest.raises(exception.ConflictError):
-        register_user_service(mock_db, "test@test.com", "Test", "pass")
+        asyncio.run(register_user_service(mock_db, "test@test.com", "Test", "pass"))
 
 
-@patch("app.services.user_service.security.get_password_hash")
+@patch("app.services.user_service.security.password_hasher.hash", new_callable=AsyncMock)
 @patch("app.services.user_service.user_crud.create_user")
 @patch("app.services.user_service.user_crud.get_user_by_nickname")
 @patch("app.services.user_service.user_crud.get_user_by_email")
@@ -135,21 +146,21 @@ def test_register_user_service_create_conflict(
     mock_create_user.side_effect = exception.ConflictError()
 
     with pytest.raises(exception.ConflictError):
-        register_user_service(mock_db, "test@test.com", "Test ", "pass")
+        asyncio.run(register_user_service(mock_db, "test@test.com", "Test ", "pass"))
 
 
 @patch("app.services.user_service.security.create_access_token")
-@patch("app.services.user_service.security.verify_password")
+@patch("app.services.user_service.security.password_hasher.verify_and_update", new_callable=AsyncMock)
 @patch("app.services.user_service.user_crud.get_user_by_email")
 def test_login_user_service_success(mock_get_by_email, mock_verify, mock_create_token):
     mock_db = Mock()
     user_obj = Mock(id=42, password_hash="hash")
 
     mock_get_by_email.return_value = user_obj
-    mock_verify.return_value = True
+    mock_verify.return_value = (True, None)
     mock_create_token.return_value = "test_token"
 
-    result = login_user_service(mock_db, "test@test.com", "pass")
+    result = asyncio.run(login_user_service(mock_db, "test@test.com", "pass"))
 
     mock_get_by_email.assert_called_once_with(mock_db, "test@test.com")
     mock_verify.assert_called_once_with("pass", "hash")
@@ -164,20 +175,48 @@ def test_login_user_service_user_not_found(mock_get_by_email):
     mock_get_by_email.return_value = None
 
     with pytest.raises(exception.ForbiddenError):
-        login_user_service(mock_db, "test@test.com", "pass")
+        asyncio.run(login_user_service(mock_db, "test@test.com", "pass"))
 
 
-@patch("app.services.user_service.security.verify_password")
+@patch("app.services.user_service.security.password_hasher.verify_and_update", new_callable=AsyncMock)
 @patch("app.services.user_service.user_crud.get_user_by_email")
 def test_login_user_service_wrong_password(mock_get_by_email, mock_verify):
     mock_db = Mock()
     user_obj = Mock(id=42, password_hash="hash")
 
     mock_get_by_email.return_value = user_obj
-    mock_verify.return_value = False
+    mock_verify.return_value = (False, None)
 
     with pytest.raises(exception.ForbiddenError):
-        login_user_service(mock_db, "test@test.com", "pass")
+        asyncio.run(login_user_service(mock_db, "test@test.com", "pass"))
+
+
+@patch("app.services.user_service.user_crud.update_password_hash")
+@patch("app.services.user_service.security.password_hasher.verify_and_update", new_callable=AsyncMock)
+@patch("app.services.user_service.user_crud.get_user_by_email")
+def test_login_user_service_rehashes_outdated_hash(mock_get_by_email, mock_verify, mock_update_hash):
+    mock_db = Mock()
+    user_obj = Mock(id=42, password_hash="old_hash")
+
+    mock_get_by_email.return_value = user_obj
+    mock_verify.return_value = (True, "new_hash")
+
+    asyncio.run(login_user_service(mock_db, "test@test.com", "pass"))
+
+    mock_update_hash.assert_called_once_with(mock_db, user_obj, "new_hash")
+    mock_db.commit.assert_called_once()
+
+
+@patch("app.services.user_service.user_crud.update_password_hash")
+@patch("app.services.user_service.security.password_hasher.verify_and_update", new_callable=AsyncMock)
+@patch("app.services.user_service.user_crud.get_user_by_email")
+def test_login_user_service_keeps_current_hash(mock_get_by_email, mock_verify, mock_update_hash):
+    mock_get_by_email.return_value = Mock(id=42, password_hash="hash")
+    mock_verify.return_value = (True, None)
+
+    asyncio.run(login_user_service(Mock(), "test@test.com", "pass"))
+
+    mock_update_hash.assert_not_called()
 
 
 @patch("app.services.user_service.team_crud.get_teams_by_user")
@@ -185,7 +224,7 @@ def test_login_user_service_wrong_password(mock_get_by_email, mock_verify):
 def test_get_user_by_token_service_success(mock_get_user, mock_get_teams):
     mock_db = Mock()
     user_id = 42
-    user_obj = Mock(id=user_id)
+    user_obj = Mock(id=user_id, email="test@test.com", nickname="Test")
     teams = [Mock(), Mock()]
 
     mock_get_user.return_value = user_obj
@@ -195,7 +234,7 @@ def test_get_user_by_token_service_success(mock_get_user, mock_get_teams):
 
     mock_get_user.assert_called_once_with(mock_db, user_id)
     mock_get_teams.assert_called_once_with(mock_db, user_obj.id)
-    assert result_user is user_obj
+    assert (result_user.id, result_user.email, result_user.nickname) == (user_id, "test@test.com", "Test")
     assert result_teams is teams
 
 
@@ -215,7 +254,7 @@ def test_get_user_by_token_service_user_not_found(mock_get_user):
 def test_get_user_service_success(mock_get_user, mock_get_teams):
     mock_db = Mock()
     user_id = 42
-    user_obj = Mock(id=user_id)
+    user_obj = Mock(id=user_id, email="test@test.com", nickname="Test")
     teams = [Mock(), Mock()]
 
     mock_get_user.return_value = user_obj
@@ -225,7 +264,7 @@ def test_get_user_service_success(mock_get_user, mock_get_teams):
 
     mock_get_user.assert_called_once_with(mock_db, user_id)
     mock_get_teams.assert_called_once_with(mock_db, user_id)
-    assert result_user is user_obj
+    assert (result_user.id, result_user.email, result_user.nickname) == (user_id, "test@test.com", "Test")
     assert result_teams is teams
 
 
@@ -250,3 +289,51 @@ def test_get_user_service_user_not_found(mock_get_user, mock_get_teams):
         get_user_service(mock_db, user_id, user_id)
 
     mock_get_teams.assert_not_called()
+
+
+@patch("app.services.user_service.user_crud.get_user_by_id")
+def test_get_user_profile_service_uses_cache(mock_get_user):
+    mock_db = Mock()
+    mock_get_user.return_value = Mock(id=42, email="test@test.com", nickname="Test", password_hash="hash")
+
+    first = get_user_profile_service(mock_db, 42)
+    second = get_user_profile_service(mock_db, 42)
+
+    mock_get_user.assert_called_once_with(mock_db, 42)
+    assert first == second
+    assert "password_hash" not in user_cache.profiles.backend.get(user_cache.key(42))
+
+
+@patch("app.services.user_service.user_crud.get_user_by_id")
+def test_get_user_profile_service_not_found_is_not_cached(mock_get_user):
+    mock_db = Mock()
+    mock_get_user.side_effect = exception.NotFoundError()
+
+    for _ in range(2):
+        with pytest.raises(exception.NotFoundError):
+            get_user_profile_service(mock_db, 42)
+
+    assert mock_get_user.call_count == 2
+
+
+@patch("app.services.user_service.user_crud.get_user_by_id")
+def test_current_user_id_does_not_load_user(mock_get_user):
+    current_user = CurrentUser(Mock(), 42)
+
+    assert current_user.id == 42
+    mock_get_user.assert_not_called()
+
+
+@patch("app.services.user_service.user_crud.get_user_by_id")
+def test_current_user_loads_profile_and_row_lazily(mock_get_user):
+    mock_db = Mock()
+    mock_get_user.return_value = Mock(id=42, email="test@test.com", nickname="Test", password_hash="hash")
+    current_user = CurrentUser(mock_db, 42)
+
+    assert current_user.email == "test@test.com"
+    assert current_user.nickname == "Test"
+    assert mock_get_user.call_count == 1
+
+    assert current_user.password_hash == "hash"
+    assert current_user.password_hash == "hash"
+    assert mock_get_user.call_count == 2
@@ -0,0 +1,58 @@
+"""Накладные расходы auth_middleware на один запрос: полная проверка JWT против кэша проверенных токенов.
+
+Запуск из каталога gantt-backend:
+    python -m benchmarks.auth_middleware [--iterations 20000]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("AUTH_SECRET_KEY", "benchmark-secret-key")
+os.environ.setdefault("AUTH_DATABASE_URL", "sqlite://")
+os.environ.setdefault("AUTH_VAPID_PRIVATE_KEY", "benchmark-vapid-key")
+os.environ.setdefault("AUTH_VAPID_CLAIMS_SUB", "https://gantt-tracker.ru")
+
+from app.core import middleware, security  # noqa: E402
+
+
+async def _endpoint(scope, receive, send):
+    pass
+
+
+async def _run(token: str, iterations: int) -> float:
+    auth = middleware.AuthMiddleware(_endpoint)
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+    start = time.perf_counter()
+    for _ in range(iterations):
+        scope = {"type": "http", "method": "GET", "path": "/api/user", "query_string": b"", "headers": headers}
+        await auth(scope, None, None)
+    return time.perf_counter() - start
+
+
+def measure(iterations: int, cache_size: int) -> float:
+    """Среднее время прохождения middleware в микросекундах"""
+    security.token_cache.clear()
+    security.token_cache.max_entries = cache_size
+    token = security.create_access_token({"sub": "42"})
+    elapsed = asyncio.run(_run(token, iterations))
+    return elapsed / iterations * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    default_size = security.token_cache.max_entries
+    before = measure(args.iterations, cache_size=0)
+    after = measure(args.iterations, cache_size=default_size)
+
+    print(f"запросов:               {args.iterations:8d}")
+    print(f"без кэша (jose.decode): {before:8.1f} мкс/запрос")
+    print(f"с кэшем токенов:        {after:8.1f} мкс/запрос")
+    print(f"ускорение:              {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Пропускная способность под конкурентной нагрузкой: auth через app.middleware("http") против ASGI-middleware.
+
+Оба варианта используют одну и ту же проверку токена (middleware.authenticate) и кэш токенов,
+поэтому разница показывает только накладные расходы BaseHTTPMiddleware. Проверяются обычный
+JSON-ответ и потоковый ответ, как у экспорта календаря.
+
+Запуск из каталога gantt-backend:
+    python -m benchmarks.auth_throughput [--requests 5000] [--concurrency 100]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("AUTH_SECRET_KEY", "benchmark-secret-key")
+os.environ.setdefault("AUTH_DATABASE_URL", "sqlite://")
+os.environ.setdefault("AUTH_VAPID_PRIVATE_KEY", "benchmark-vapid-key")
+os.environ.setdefault("AUTH_VAPID_CLAIMS_SUB", "https://gantt-tracker.ru")
+
+import fastapi  # noqa: E402
+import httpx  # noqa: E402
+from starlette import responses  # noqa: E402
+
+from app.core import middleware, security  # noqa: E402
+
+STREAM_CHUNKS = 50
+
+
+async def _legacy_auth_middleware(request: fastapi.Request, call_next):
+    """Прежний вариант: функция, зарегистрированная через app.middleware("http")"""
+    if middleware.is_exempt_path(request.url.path):
+        return await call_next(request)
+
+    user_id, error_response = middleware.authenticate(request.headers.get("Authorization"))
+    if error_response is not None:
+        return error_response
+
+    request.state.user_id = user_id
+    return await call_next(request)
+
+
+def _build_app(asgi_middleware: bool) -> fastapi.FastAPI:
+    app = fastapi.FastAPI()
+    if asgi_middleware:
+        app.add_middleware(middleware.AuthMiddleware)
+    else:
+        app.middleware("http")(_legacy_auth_middleware)
+
+    @app.get("/json")
+    def get_json(request: fastapi.Request):
+        return {"user_id": request.state.user_id}
+
+    @app.get("/stream")
+    def get_stream():
+        return responses.StreamingResponse((b"BEGIN:VEVENT\r\nEND:VEVENT\r\n" for _ in range(STREAM_CHUNKS)),
+                                           media_type="text/calendar")
+
+    return app
+
+
+async def _load(app: fastapi.FastAPI, path: str, total: int, concurrency: int, token: str) -> float:
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {token}"}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        async def one():
+            async with semaphore:
+                response = await client.get(path, headers=headers)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    token = security.create_access_token({"sub": "42"})
+    print(f"запросов: {args.requests}, одновременно: {args.concurrency}")
+    for path in ("/json", "/stream"):
+        legacy = asyncio.run(_load(_build_app(False), path, args.requests, args.concurrency, token))
+        asgi = asyncio.run(_load(_build_app(True), path, args.requests, args.concurrency, token))
+        print(f"{path:8} http-middleware: {legacy:8.0f} rps   ASGI: {asgi:8.0f} rps   {asgi / legacy:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
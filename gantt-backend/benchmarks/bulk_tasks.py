@@ -0,0 +1,82 @@
+"""Импорт задач в стрим: по одной через /task/new против одного запроса /tasks/bulk.
+
+Обе схемы работают с файловой SQLite-базой после alembic upgrade. Число SQL-запросов берется
+из заголовка Server-Timing.
+
+Запуск из каталога gantt-backend:
+    python -m benchmarks.bulk_tasks [--tasks 1000]
+"""
+import argparse
+import os
+import re
+import tempfile
+import time
+
+_directory = tempfile.TemporaryDirectory()
+os.environ.setdefault("AUTH_SECRET_KEY", "benchmark-secret-key")
+os.environ["AUTH_DATABASE_URL"] = f"sqlite:///{_directory.name}/bulk_tasks.db"
+os.environ.setdefault("AUTH_VAPID_PRIVATE_KEY", "benchmark-vapid-key")
+os.environ.setdefault("AUTH_VAPID_CLAIMS_SUB", "https://gantt-tracker.ru")
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main as app_main  # noqa: E402
+from app.core import db, security  # noqa: E402
+from app.models import project, stream, tag, team, user  # noqa: E402
+
+
+def _seed():
+    config = Config("alembic.ini")
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+
+    with db.SessionLocal() as session:
+        session.add(user.User(id=1, email="owner@test.com", nickname="owner", password_hash="-"))
+        session.add(team.Team(id=1, name="Team"))
+        session.add(team.UserTeam(user_id=1, team_id=1, role_id=2))
+        session.add(project.Project(id=1, name="Project", team_id=1))
+        session.add_all(stream.Stream(id=stream_id, name=f"Stream {stream_id}", project_id=1) for stream_id in (1, 2))
+        session.add_all(tag.Tag(id=tag_id, name=f"Tag {tag_id}", color="#ffffff", team_id=1) for tag_id in (1, 2))
+        session.commit()
+
+
+def _task(i: int) -> dict:
+    return {"name": f"Imported {i}", "assignee_email": "owner@test.com", "tag_ids": [1, 2]}
+
+
+def _queries(response) -> int:
+    return int(re.search(r'desc="(\d+) queries"', response.headers["Server-Timing"]).group(1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1000)
+    args = parser.parse_args()
+
+    _seed()
+    headers = {"Authorization": f"Bearer {security.create_access_token({'sub': '1'})}"}
+
+    with TestClient(app_main.app) as client:
+        start = time.perf_counter()
+        queries = 0
+        for i in range(args.tasks):
+            response = client.post("/api/stream/1/task/new", json=_task(i), headers=headers)
+            response.raise_for_status()
+            queries += _queries(response)
+        single = time.perf_counter() - start
+        print(f"по одной:  {single * 1000:8.0f} мс   SQL-запросов {queries}")
+
+        start = time.perf_counter()
+        response = client.post("/api/stream/2/tasks/bulk", json={"tasks": [_task(i) for i in range(args.tasks)]},
+                               headers=headers)
+        response.raise_for_status()
+        bulk = time.perf_counter() - start
+        print(f"пачкой:    {bulk * 1000:8.0f} мс   SQL-запросов {_queries(response)}   {single / bulk:5.1f}x")
+
+    _directory.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Холодный старт воркера: быстрый режим против прежнего запуска.
+
+Каждый замер идет в отдельном процессе: импорт main и обработка startup до готовности принимать запросы.
+Прежний запуск воспроизводится явно: pywebpush и ics импортируются сразу, create_all проверяет схему,
+а все неотправленные напоминания читаются из базы до готовности воркера.
+
+Запуск из каталога gantt-backend:
+    python -m benchmarks.cold_start [--runs 5] [--reminders 20000]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+os.environ.setdefault("AUTH_SECRET_KEY", "benchmark-secret-key")
+os.environ.setdefault("AUTH_DATABASE_URL", "sqlite://")
+os.environ.setdefault("AUTH_VAPID_PRIVATE_KEY", "benchmark-vapid-key")
+os.environ.setdefault("AUTH_VAPID_CLAIMS_SUB", "https://gantt-tracker.ru")
+
+import sqlalchemy  # noqa: E402
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+
+_STARTUP = """
+import json, time
+start = time.perf_counter()
+{eager_imports}
+import main
+from fastapi.testclient import TestClient
+imported = time.perf_counter()
+{eager_startup}
+with TestClient(main.app):
+    ready = time.perf_counter()
+print(json.dumps({{"import": imported - start, "ready": ready - start}}))
+"""
+
+_LEGACY_IMPORTS = "import ics, pywebpush"
+_LEGACY_STARTUP = """
+from app.core import db, scheduler
+from app.models.base import Base
+Base.metadata.create_all(bind=db.engine)
+from app.core.config import settings
+settings.REMINDER_WINDOW_MINUTES = 10 ** 7
+scheduler.schedule_upcoming_reminders()
+"""
+
+
+def _seed(url: str, reminders: int):
+    config = Config("alembic.ini")
+    config.set_main_option("sqlalchemy.url", url)
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+
+    now = datetime.utcnow()
+    rows = [{"task_id": 1, "user_id": 1, "sent": False,
+             "remind_at": now + timedelta(minutes=random.randint(1, 60 * 24 * 365))} for _ in range(reminders)]
+    engine = sqlalchemy.create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(sqlalchemy.text(
+            "INSERT INTO task_reminders (task_id, user_id, sent, remind_at) VALUES (:task_id, :user_id, :sent, :remind_at)"
+        ), rows)
+    engine.dispose()
+
+
+def _measure(url: str, legacy: bool, runs: int) -> dict:
+    code = _STARTUP.format(eager_imports=_LEGACY_IMPORTS if legacy else "",
+                           eager_startup=_LEGACY_STARTUP if legacy else "")
+    env = {**os.environ, "AUTH_DATABASE_URL": url}
+    samples = [json.loads(subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True,
+                                         check=True).stdout.splitlines()[-1]) for _ in range(runs)]
+    return {name: statistics.median(s[name] for s in samples) * 1000 for name in ("import", "ready")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--reminders", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/cold_start.db"
+        _seed(url, args.reminders)
+        print(f"замеров: {args.runs}, неотправленных напоминаний: {args.reminders}")
+
+        for name, legacy in (("прежний", True), ("быстрый", False)):
+            result = _measure(url, legacy, args.runs)
+            print(f"{name:10} импорт {result['import']:7.0f} мс   готов к запросам {result['ready']:7.0f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Всплеск входов: хеширование паролей в пуле потоков AnyIO против отдельного пула процессов.
+
+Одновременно с пачкой логинов идут запросы к легкому синхронному эндпоинту. При хешировании
+в синхронном роуте логины занимают все потоки AnyIO, и легкие запросы ждут в очереди;
+с пулом процессов потоки свободны, а лишние логины сразу получают 503.
+
+Запуск из каталога gantt-backend:
+    python -m benchmarks.login_storm [--logins 400] [--pings 400] [--workers 2] [--queue-limit 64]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("AUTH_SECRET_KEY", "benchmark-secret-key")
+os.environ.setdefault("AUTH_DATABASE_URL", "sqlite://")
+os.environ.setdefault("AUTH_VAPID_PRIVATE_KEY", "benchmark-vapid-key")
+os.environ.setdefault("AUTH_VAPID_CLAIMS_SUB", "https://gantt-tracker.ru")
+
+import fastapi  # noqa: E402
+import httpx  # noqa: E402
+
+from app.core import exception, security  # noqa: E402
+from app.core.config import settings  # noqa: E402
+
+PASSWORD = "benchmark-password"
+
+
+def _build_app(password_hash: str, hasher: security.PasswordHasher | None) -> fastapi.FastAPI:
+    app = fastapi.FastAPI()
+
+    if hasher is None:
+        @app.post("/login")
+        def login_legacy():
+            if not security.verify_password(PASSWORD, password_hash):
+                raise fastapi.HTTPException(status_code=401)
+            return {}
+    else:
+        @app.post("/login")
+        async def login():
+            try:
+                is_valid, _ = await hasher.verify_and_update(PASSWORD, password_hash)
+            except exception.UnavailableError:
+                raise fastapi.HTTPException(status_code=503)
+            if not is_valid:
+                raise fastapi.HTTPException(status_code=401)
+            return {}
+
+    @app.get("/ping")
+    def ping():
+        return {}
+
+    return app
+
+
+async def _storm(app: fastapi.FastAPI, logins: int, pings: int):
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    statuses = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        async def login():
+            statuses.append((await client.post("/login")).status_code)
+
+        async def ping():
+            await asyncio.sleep(0.001)
+            start = time.perf_counter()
+            (await client.get("/ping")).raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)), *(ping() for _ in range(pings)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "elapsed": elapsed,
+        "ping_p50": statistics.median(latencies) * 1000,
+        "ping_p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "ok": statuses.count(200),
+        "rejected": statuses.count(503),
+    }
+
+
+def _report(name: str, result: dict):
+    print(f"{name:14} ping p50 {result['ping_p50']:8.1f} мс  p95 {result['ping_p95']:8.1f} мс   "
+          f"логинов: {result['ok']} ок, {result['rejected']} отклонено, {result['elapsed']:.2f} с")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--pings", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--queue-limit", type=int, default=64)
+    args = parser.parse_args()
+
+    password_hash = security.get_password_hash(PASSWORD)
+    print(f"логинов: {args.logins}, легких запросов: {args.pings}, "
+          f"раундов pbkdf2: {settings.PASSWORD_HASH_ROUNDS}")
+
+    _report("пул потоков", asyncio.run(_storm(_build_app(password_hash, None), args.logins, args.pings)))
+
+    hasher = security.PasswordHasher(args.workers, args.queue_limit)
+    try:
+        _report("пул процессов", asyncio.run(_storm(_build_app(password_hash, hasher), args.logins, args.pings)))
+    finally:
+        hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Накладные расходы MetricsMiddleware: пропускная способность легкого эндпоинта с метриками и без.
+
+Запуск из каталога gantt-backend:
+    python -m benchmarks.metrics_overhead [--requests 5000] [--concurrency 100]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("AUTH_SECRET_KEY", "benchmark-secret-key")
+os.environ.setdefault("AUTH_DATABASE_URL", "sqlite://")
+os.environ.setdefault("AUTH_VAPID_PRIVATE_KEY", "benchmark-vapid-key")
+os.environ.setdefault("AUTH_VAPID_CLAIMS_SUB", "https://gantt-tracker.ru")
+
+import fastapi  # noqa: E402
+import httpx  # noqa: E402
+
+from app.core import metrics  # noqa: E402
+
+
+def _build_app(with_metrics: bool) -> fastapi.FastAPI:
+    app = fastapi.FastAPI()
+    if with_metrics:
+        app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    return app
+
+
+async def _load(app: fastapi.FastAPI, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        async def one(i: int):
+            async with semaphore:
+                (await client.get(f"/items/{i}")).raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"запросов: {args.requests}, одновременно: {args.concurrency}")
+    plain = asyncio.run(_load(_build_app(False), args.requests, args.concurrency))
+    measured = asyncio.run(_load(_build_app(True), args.requests, args.concurrency))
+    print(f"без метрик: {plain:8.0f} rps   с метриками: {measured:8.0f} rps   {measured / plain:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ import sys
 
 sys.path.append(os.path.dirname(__file__))
 import fastapi
+from starlette.concurrency import run_in_threadpool
 
 from app.api.auth import router as auth_router
 from app.api.goal import router as goal_router
@@ -16,15 +17,16 @@ from app.api.reminder import router as reminder_router
 from app.api.push import router as push_router
 from app.api.custom_field import router as custom_field_router
 from app.api.calendar import router as calendar_router
-from app.core import middleware
-from app.core.db import engine
-from app.models.base import Base
+from app.api.system import router as system_router
+from app.core import metrics, middleware, schema, security, sql_timing
+from app.core.config import settings
+from app.core.db import async_engine, engine
 from app.core.scheduler import start_scheduler
 
-Base.metadata.create_all(bind=engine)
-
 app = fastapi.FastAPI(title="Task Tracker API")
-app.middleware("http")(middleware.auth_middleware)
+app.add_middleware(middleware.AuthMiddleware)
+app.add_middleware(sql_timing.SQLTimingMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
 
 app.include_router(auth_router)
 app.include_router(team_router)
@@ -40,6 +42,7 @@ app.include_router(calendar_router)
 app.include_router(reminder_router)
 app.include_router(push_router)
 app.include_router(custom_field_router)
+app.include_router(system_router)
 
 @app.get("/")
 def read_root():
@@ -47,8 +50,15 @@ def read_root():
 
 @app.on_event("startup")
 async def startup_event():
+    if settings.SCHEMA_CHECK_ON_STARTUP:
+        await run_in_threadpool(schema.check_schema, engine)
     start_scheduler()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    security.password_hasher.shutdown()
+    await async_engine.dispose()
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,57 @@
+from logging.config import fileConfig
+
+import sqlalchemy
+from alembic import context
+from sqlalchemy import pool
+
+from app.core.config import settings
+from app.models import (  # noqa: F401  модели регистрируют свои таблицы в метаданных
+    base,
+    custom_field,
+    goal,
+    meta,
+    project,
+    push,
+    stream,
+    tag,
+    task,
+    team,
+    user,
+)
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = base.Base.metadata
+
+
+def _database_url() -> str:
+    return config.get_main_option("sqlalchemy.url") or settings.DATABASE_URL
+
+
+def _configure(**kwargs):
+    context.configure(target_metadata=target_metadata, compare_type=True, **kwargs)
+
+
+def run_migrations_offline():
+    """Сгенерировать SQL без подключения к базе: alembic upgrade head --sql"""
+    _configure(url=_database_url(), literal_binds=True, dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """Применить миграции к базе"""
+    engine = sqlalchemy.create_engine(_database_url(), poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        _configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,223 @@
+"""Начальная схема: таблицы моделей на момент перехода на миграции и справочники
+
+Базы, созданные раньше через Base.metadata.create_all, помечаются этой ревизией без ее выполнения:
+    alembic stamp 0001
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0001"
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+CUSTOM_FIELD_TYPE = sa.Enum("STRING", "TEXT", "DATE", "DATETIME", "BOOL", name="customfieldtype")
+
+
+def _dictionary(name: str):
+    return op.create_table(
+        name,
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def upgrade() -> None:
+    connections = _dictionary("Connections")
+    priorities = _dictionary("Priority")
+    roles = _dictionary("Roles")
+    statuses = _dictionary("Status")
+
+    op.create_table(
+        "Teams",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "Users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("nickname", sa.String(), nullable=False),
+        sa.Column("password_hash", sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_Users_email", "Users", ["email"], unique=True)
+    op.create_index("ix_Users_nickname", "Users", ["nickname"], unique=True)
+
+    op.create_table(
+        "Projects",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["team_id"], ["Teams.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "Tags",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("color", sa.String(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["team_id"], ["Teams.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name", "team_id", name="uq_tag_name_team"),
+    )
+    op.create_table(
+        "UserTeam",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=False),
+        sa.Column("role_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["role_id"], ["Roles.id"]),
+        sa.ForeignKeyConstraint(["team_id"], ["Teams.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["Users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "custom_fields",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("type", CUSTOM_FIELD_TYPE, nullable=False),
+        sa.ForeignKeyConstraint(["team_id"], ["Teams.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_custom_fields_id", "custom_fields", ["id"])
+    op.create_table(
+        "push_subscriptions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("endpoint", sa.String(), nullable=False),
+        sa.Column("p256dh", sa.String(), nullable=False),
+        sa.Column("auth", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["Users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "Streams",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["Projects.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "Goals",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("start_date", sa.DateTime(), nullable=True),
+        sa.Column("deadline", sa.DateTime(), nullable=True),
+        sa.Column("stream_id", sa.Integer(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["stream_id"], ["Streams.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "Tasks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("stream_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("status_id", sa.Integer(), nullable=True),
+        sa.Column("priority_id", sa.Integer(), nullable=True),
+        sa.Column("start_date", sa.DateTime(), nullable=True),
+        sa.Column("deadline", sa.DateTime(), nullable=True),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["stream_id"], ["Streams.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_Tasks_name", "Tasks", ["name"])
+    op.create_table(
+        "TaskHistory",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("changed_by_id", sa.Integer(), nullable=False),
+        sa.Column("changed_at", sa.DateTime(), nullable=False),
+        sa.Column("field_name", sa.String(), nullable=False),
+        sa.Column("old_value", sa.Text(), nullable=True),
+        sa.Column("new_value", sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(["changed_by_id"], ["Users.id"]),
+        sa.ForeignKeyConstraint(["task_id"], ["Tasks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "TaskRelations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("task_id_1", sa.Integer(), nullable=False),
+        sa.Column("task_id_2", sa.Integer(), nullable=False),
+        sa.Column("connection_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["connection_id"], ["Connections.id"]),
+        sa.ForeignKeyConstraint(["task_id_1"], ["Tasks.id"]),
+        sa.ForeignKeyConstraint(["task_id_2"], ["Tasks.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "TaskTags",
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("tag_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["tag_id"], ["Tags.id"]),
+        sa.ForeignKeyConstraint(["task_id"], ["Tasks.id"]),
+        sa.PrimaryKeyConstraint("task_id", "tag_id"),
+    )
+    op.create_table(
+        "UserTask",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["task_id"], ["Tasks.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["Users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "task_custom_field_values",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("custom_field_id", sa.Integer(), nullable=False),
+        sa.Column("value_string", sa.String(length=255), nullable=True),
+        sa.Column("value_text", sa.Text(), nullable=True),
+        sa.Column("value_date", sa.Date(), nullable=True),
+        sa.Column("value_datetime", sa.DateTime(), nullable=True),
+        sa.Column("value_bool", sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(["custom_field_id"], ["custom_fields.id"]),
+        sa.ForeignKeyConstraint(["task_id"], ["Tasks.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_task_custom_field_values_id", "task_custom_field_values", ["id"])
+    op.create_table(
+        "task_reminders",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("remind_at", sa.DateTime(), nullable=False),
+        sa.Column("sent", sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(["task_id"], ["Tasks.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["Users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    # Справочники, которые раньше заполнял sql/init.sql; id используются фронтендом и проверками ролей
+    op.bulk_insert(statuses, [{"id": i, "name": name} for i, name in
+                              enumerate(["No status", "To do", "Doing", "Done"], start=1)])
+    op.bulk_insert(priorities, [{"id": i, "name": name} for i, name in
+                                enumerate(["No priority", "Low", "Medium", "High", "Highest"], start=1)])
+    op.bulk_insert(roles, [{"id": 1, "name": "Reader"}, {"id": 2, "name": "Editor"}])
+    op.bulk_insert(connections, [{"id": i, "name": name} for i, name in
+                                 enumerate(["T1 blocks T2", "T1 duplicates T2", "T1 related to T2"], start=1)])
+
+
+def downgrade() -> None:
+    for table in ("task_reminders", "task_custom_field_values", "UserTask", "TaskTags", "TaskRelations",
+                  "TaskHistory", "Tasks", "Goals", "Streams", "push_subscriptions", "custom_fields", "UserTeam",
+                  "Tags", "Projects", "Users", "Teams", "Status", "Roles", "Priority", "Connections"):
+        op.drop_table(table)
+    CUSTOM_FIELD_TYPE.drop(op.get_bind(), checkfirst=True)
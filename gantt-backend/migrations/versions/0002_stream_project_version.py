@@ -0,0 +1,36 @@
+"""Счетчик версии у проектов и потоков для ETag и условных запросов
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0002"
+down_revision: str | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLES = ("Projects", "Streams")
+
+
+def _has_version(table: str) -> bool:
+    if op.get_context().as_sql:
+        return False
+    # Базы, поднятые create_all уже после появления версий, содержат колонку до stamp 0001
+    return "version" in {column["name"] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        if not _has_version(table):
+            op.add_column(table, sa.Column("version", sa.Integer(), server_default="0", nullable=False))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("version")
@@ -0,0 +1,74 @@
+"""Индексы для горячих запросов: внешние ключи списков, членство в команде, история и напоминания
+
+На PostgreSQL индексы строятся через CREATE INDEX CONCURRENTLY вне транзакции, чтобы не блокировать
+запись в таблицы на время построения. Прерванный CREATE INDEX CONCURRENTLY оставляет индекс в состоянии
+INVALID: IF NOT EXISTS его бы пропустил, а уникальность по нему не проверяется. Поэтому перед созданием
+такие индексы удаляются, и повторный запуск миграции достраивает их заново.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0003"
+down_revision: str | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (имя, таблица, колонки, unique)
+INDEXES = (
+    ("ix_Tasks_stream_id", "Tasks", ["stream_id"], False),
+    ("ix_UserTask_task_id", "UserTask", ["task_id"], False),
+    ("ix_UserTask_user_id", "UserTask", ["user_id"], False),
+    ("ix_UserTeam_user_id_team_id", "UserTeam", ["user_id", "team_id"], False),
+    ("ix_Streams_project_id", "Streams", ["project_id"], False),
+    ("ix_Goals_stream_id", "Goals", ["stream_id"], False),
+    ("ix_Projects_team_id", "Projects", ["team_id"], False),
+    ("ix_TaskRelations_task_id_1", "TaskRelations", ["task_id_1"], False),
+    ("ix_TaskRelations_task_id_2", "TaskRelations", ["task_id_2"], False),
+    ("ix_TaskHistory_task_id_changed_at", "TaskHistory", ["task_id", "changed_at"], False),
+    ("ix_task_reminders_sent_remind_at", "task_reminders", ["sent", "remind_at"], False),
+    ("ix_TaskTags_tag_id", "TaskTags", ["tag_id"], False),
+    ("uq_task_custom_field_value", "task_custom_field_values", ["task_id", "custom_field_id"], True),
+)
+
+
+def _remove_duplicate_custom_field_values():
+    """Оставить по одному значению на пару (задача, поле) перед созданием уникального индекса"""
+    values = sa.table("task_custom_field_values", sa.column("id"), sa.column("task_id"),
+                      sa.column("custom_field_id"))
+    latest = (sa.select(sa.func.max(values.c.id))
+              .group_by(values.c.task_id, values.c.custom_field_id)
+              .scalar_subquery())
+    op.execute(values.delete().where(values.c.id.not_in(latest)))
+
+
+def _is_invalid_index(name: str) -> bool:
+    """Остался ли индекс INVALID после прерванного CREATE INDEX CONCURRENTLY (только PostgreSQL)"""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return False
+    return bind.execute(sa.text("SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+                                "WHERE pg_class.relname = :name AND pg_table_is_visible(pg_class.oid) "
+                                "AND NOT pg_index.indisvalid"), {"name": name}).first() is not None
+
+
+def upgrade() -> None:
+    _remove_duplicate_custom_field_values()
+
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            if _is_invalid_index(name):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
+            op.create_index(name, table, columns, unique=unique, if_not_exists=True,
+                            postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
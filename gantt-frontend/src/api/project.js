@@ -48,3 +48,14 @@ export async function deleteProjectApi(projectId, token) {
     return { ok: false, status: e.response.status };
   }
 }
+
+export async function fetchProjectGanttApi(projectId, token) {
+  try {
+    const response = await axios.get(`/api/project/${projectId}/gantt`, {
+      headers: { Authorization: token },
+    });
+    return { ok: true, gantt: response.data };
+  } catch (e) {
+    return { ok: false, status: e.response.status };
+  }
+}
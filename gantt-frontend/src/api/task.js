@@ -48,12 +48,22 @@ export async function deleteTaskApi(taskId, token) {
   }
 }
 
-export async function fetchAllUserTasksApi(token) {
+export async function fetchUserTasksPageApi(
+  token,
+  filters = {},
+  cursor = null,
+) {
   try {
     const response = await axios.get(`/api/tasks/all`, {
       headers: { Authorization: token },
+      params: cursor ? { ...filters, cursor } : filters,
+      paramsSerializer: { indexes: null },
     });
-    return { ok: true, tasks: response.data };
+    return {
+      ok: true,
+      tasks: response.data,
+      nextCursor: response.headers["x-next-cursor"] || null,
+    };
   } catch (e) {
     return { ok: false, status: e.response.status };
   }
@@ -14,7 +14,7 @@ import {
   Button,
   Select,
 } from "@mui/material";
-import { fetchStreamsApi } from "../../api/stream.js";
+import { fetchProjectGanttApi } from "../../api/project.js";
 import { fetchStatusesApi, fetchPrioritiesApi } from "../../api/meta.js";
 import GanttStream from "./GanttStream.jsx";
 import GanttTimelineHeader from "./GanttTimelineHeader.jsx";
@@ -44,8 +44,8 @@ import {
 } from "@mui/icons-material";
 
 import { useProcessError } from "../../hooks/useProcessError.js";
-import { fetchGoalsApi, updateGoalApi, deleteGoalApi } from "../../api/goal.js";
-import { fetchTasksApi, updateTaskApi, deleteTaskApi } from "../../api/task.js";
+import { updateGoalApi, deleteGoalApi } from "../../api/goal.js";
+import { updateTaskApi, deleteTaskApi } from "../../api/task.js";
 import { fetchTeamTagsApi } from "../../api/tag.js";
 import { generateRelationColors } from "../../utils/relationColors.js";
 
@@ -173,26 +173,20 @@ const GanttChart = ({
   const loadStreamsData = useCallback(async () => {
     setLoading(true);
 
-    const streamsResp = await fetchStreamsApi(projId, token);
-    if (!streamsResp.ok) {
-      processError(streamsResp.status);
+    const ganttResp = await fetchProjectGanttApi(projId, token);
+    if (!ganttResp.ok) {
+      processError(ganttResp.status);
       setLoading(false);
       return;
     }
 
-    const streams = streamsResp.streams;
-    const streamData = await Promise.all(
-      streams.map(async (stream) => {
-        const gResp = await fetchGoalsApi(stream.id, token);
-        const tResp = await fetchTasksApi(stream.id, token);
-        return {
-          id: stream.id,
-          name: stream.name,
-          goals: gResp.goals,
-          tasks: tResp.tasks,
-        };
-      }),
-    );
+    const { streams, goals, tasks } = ganttResp.gantt;
+    const streamData = streams.map((stream) => ({
+      id: stream.id,
+      name: stream.name,
+      goals: goals.filter((goal) => goal.stream_id === stream.id),
+      tasks: tasks.filter((task) => task.stream_id === stream.id),
+    }));
     setStreamsData(streamData);
 
     setLoading(false);
@@ -0,0 +1,50 @@
+import { useCallback, useEffect, useRef, useState } from "react";
+import { fetchUserTasksPageApi } from "../api/task.js";
+
+// Задачи пользователя по страницам: первая грузится при смене фильтров,
+// следующие — по loadMore
+export const useTaskPages = (token, query, onError = null) => {
+  const [tasks, setTasks] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loading, setLoading] = useState(true);
+  const requestRef = useRef(0);
+  const queryKey = JSON.stringify(query);
+
+  const loadPage = useCallback(
+    async (cursor) => {
+      const request = ++requestRef.current;
+      setLoading(true);
+
+      const response = await fetchUserTasksPageApi(
+        token,
+        JSON.parse(queryKey),
+        cursor,
+      );
+      // ответ на устаревший запрос (фильтры уже поменялись) отбрасываем
+      if (request !== requestRef.current) return;
+
+      if (response.ok) {
+        setTasks((prev) =>
+          cursor ? [...prev, ...response.tasks] : response.tasks,
+        );
+        setNextCursor(response.nextCursor);
+      } else {
+        if (!cursor) setTasks([]);
+        setNextCursor(null);
+        if (onError) onError(response.status);
+      }
+      setLoading(false);
+    },
+    [token, queryKey],
+  );
+
+  useEffect(() => {
+    loadPage(null);
+  }, [loadPage]);
+
+  const loadMore = useCallback(() => {
+    if (nextCursor) loadPage(nextCursor);
+  }, [loadPage, nextCursor]);
+
+  return { tasks, loading, hasMore: Boolean(nextCursor), loadMore };
+};
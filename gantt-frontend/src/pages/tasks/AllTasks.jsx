@@ -1,18 +1,21 @@
 import React, { useEffect, useState, useMemo, useCallback } from "react";
 import { useParams } from "react-router-dom";
-import { CircularProgress } from "@mui/material";
+import { Button, CircularProgress } from "@mui/material";
 import StreamLayout from "../../components/layout/StreamLayout.jsx";
 import AllTasksTable from "../../components/tasks/AllTasksTable.jsx";
 import AdvancedFiltersPanel from "../../components/tasks/AdvancedFiltersPanel.jsx";
 import ExportTasksButton from "../../components/ui/ExportTasksButton.jsx";
-import { fetchAllUserTasksApi } from "../../api/task.js";
 import { fetchUserEmailApi } from "../../api/user.js";
 import { fetchStatusesApi, fetchPrioritiesApi } from "../../api/meta.js";
-import { sortTasks, applyAdvancedFilters } from "../../utils/taskUtils.js";
+import { useTaskPages } from "../../hooks/useTaskPages.js";
+import {
+  sortTasks,
+  applyAdvancedFilters,
+  toTaskQuery,
+} from "../../utils/taskUtils.js";
 
 const AllTasks = () => {
   const { teamId } = useParams();
-  const [tasks, setTasks] = useState([]);
   const [statuses, setStatuses] = useState([]);
   const [priorities, setPriorities] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -40,15 +43,39 @@ const AllTasks = () => {
     [],
   );
 
+  const taskQuery = useMemo(
+    () => toTaskQuery(advancedFilters, userEmail),
+    [advancedFilters, userEmail],
+  );
+  const {
+    tasks,
+    loading: tasksLoading,
+    hasMore,
+    loadMore,
+  } = useTaskPages(token, taskQuery);
+
+  // Варианты фильтров собираются по всем уже загруженным задачам, чтобы выбор
+  // одного значения не скрывал остальные
+  const [seenTasks, setSeenTasks] = useState({});
+  useEffect(() => {
+    setSeenTasks((prev) => {
+      const next = { ...prev };
+      tasks.forEach((task) => (next[task.id] = task));
+      return next;
+    });
+  }, [tasks]);
+  const filterOptionTasks = useMemo(
+    () => Object.values(seenTasks),
+    [seenTasks],
+  );
+
   const loadData = useCallback(async () => {
     setLoading(true);
     try {
-      const tasksResponse = await fetchAllUserTasksApi(token);
       const emailResponse = await fetchUserEmailApi(token);
       const statusesResponse = await fetchStatusesApi();
       const prioritiesResponse = await fetchPrioritiesApi();
 
-      setTasks(tasksResponse.ok ? tasksResponse.tasks : []);
       setUserEmail(emailResponse.ok ? emailResponse.email : "");
       setStatuses(statusesResponse.ok ? statusesResponse.statuses : []);
       setPriorities(prioritiesResponse.ok ? prioritiesResponse.priorities : []);
@@ -128,7 +155,7 @@ const AllTasks = () => {
             </div>
 
             <AdvancedFiltersPanel
-              tasks={tasks}
+              tasks={filterOptionTasks}
               onFiltersChange={setAdvancedFilters}
               statuses={statuses}
               priorities={priorities}
@@ -144,7 +171,21 @@ const AllTasks = () => {
                 handleSort={handleSort}
               />
             ) : (
-              <div>Нет задач</div>
+              !tasksLoading && <div>Нет задач</div>
+            )}
+
+            {tasksLoading ? (
+              <div className="flex justify-center p-4">
+                <CircularProgress size={24} />
+              </div>
+            ) : (
+              hasMore && (
+                <div className="flex justify-center p-4">
+                  <Button variant="outlined" onClick={loadMore}>
+                    Загрузить ещё
+                  </Button>
+                </div>
+              )
             )}
           </StreamLayout>
         </div>
@@ -1,20 +1,19 @@
 import React, { useEffect, useState, useMemo, useCallback } from "react";
 import { useParams } from "react-router-dom";
-import { CircularProgress } from "@mui/material";
+import { Button, CircularProgress } from "@mui/material";
 import StreamLayout from "../../components/layout/StreamLayout.jsx";
 import TaskFilters from "../../components/ui/TaskFilters.jsx";
 import ExportTasksButton from "../../components/ui/ExportTasksButton.jsx";
 import AllTasksTable from "../../components/tasks/AllTasksTable.jsx";
 import { useProcessError } from "../../hooks/useProcessError.js";
-import { fetchAllUserTasksApi } from "../../api/task.js";
+import { useTaskPages } from "../../hooks/useTaskPages.js";
 import { fetchUserEmailApi } from "../../api/user.js";
 import { fetchTeamNameApi } from "../../api/team.js";
 import { fetchStatusesApi, fetchPrioritiesApi } from "../../api/meta.js";
-import { sortTasks, filterTasksByTeamAndUser } from "../../utils/taskUtils.js";
+import { sortTasks } from "../../utils/taskUtils.js";
 
 const ImmediateTasks = () => {
   const { teamId } = useParams();
-  const [tasks, setTasks] = useState([]);
   const [statuses, setStatuses] = useState([]);
   const [priorities, setPriorities] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -32,6 +31,19 @@ const ImmediateTasks = () => {
   );
   const processError = useProcessError();
 
+  const taskQuery = useMemo(() => {
+    const query = {};
+    if (teamFilter === "selected" && teamId) query.team_id = [Number(teamId)];
+    if (filterMode === "my" && userEmail) query.assignee_email = [userEmail];
+    return query;
+  }, [teamFilter, teamId, filterMode, userEmail]);
+  const {
+    tasks,
+    loading: tasksLoading,
+    hasMore,
+    loadMore,
+  } = useTaskPages(token, taskQuery, processError);
+
   const statusMap = useMemo(() => {
     const map = {};
     statuses.forEach((s) => (map[s.id] = s.name));
@@ -47,16 +59,11 @@ const ImmediateTasks = () => {
   const loadData = useCallback(async () => {
     setLoading(true);
 
-    const tasksResponse = await fetchAllUserTasksApi(token);
     const emailResponse = await fetchUserEmailApi(token);
     const teamNameResponse = await fetchTeamNameApi(teamId, token);
     const statusesResponse = await fetchStatusesApi();
     const prioritiesResponse = await fetchPrioritiesApi();
 
-    if (!tasksResponse.ok) {
-      processError(tasksResponse.status);
-    }
-
     if (!emailResponse.ok) {
       processError(emailResponse.status);
     }
@@ -73,7 +80,6 @@ const ImmediateTasks = () => {
       processError(prioritiesResponse.status);
     }
 
-    setTasks(tasksResponse.ok ? tasksResponse.tasks : []);
     setUserEmail(emailResponse.ok ? emailResponse.email : "");
     setTeamName(teamNameResponse.ok ? teamNameResponse.name : "Команда");
     setStatuses(statusesResponse.ok ? statusesResponse.statuses : []);
@@ -95,25 +101,15 @@ const ImmediateTasks = () => {
     }
   };
 
-  const filteredTasks = useMemo(() => {
-    return filterTasksByTeamAndUser(
-      tasks,
-      filterMode,
-      teamFilter,
-      userEmail,
-      teamId,
-    );
-  }, [tasks, filterMode, teamFilter, userEmail, teamId]);
-
   const immediateTasks = useMemo(() => {
-    const filtered = filteredTasks.filter((task) => task.status_id !== 4);
+    const filtered = tasks.filter((task) => task.status_id !== 4);
     return sortTasks(filtered, sortField, sortOrder, statusMap, priorityMap);
-  }, [filteredTasks, sortField, sortOrder, statusMap, priorityMap]);
+  }, [tasks, sortField, sortOrder, statusMap, priorityMap]);
 
   const completedTasks = useMemo(() => {
-    const filtered = filteredTasks.filter((task) => task.status_id === 4);
+    const filtered = tasks.filter((task) => task.status_id === 4);
     return sortTasks(filtered, sortField, sortOrder, statusMap, priorityMap);
-  }, [filteredTasks, sortField, sortOrder, statusMap, priorityMap]);
+  }, [tasks, sortField, sortOrder, statusMap, priorityMap]);
 
   if (loading) {
     return (
@@ -154,7 +150,7 @@ const ImmediateTasks = () => {
                 handleSort={handleSort}
               />
             ) : (
-              <div className="mb-8">Нет задач</div>
+              !tasksLoading && <div className="mb-8">Нет задач</div>
             )}
 
             <h2 className="font-bold text-lg mb-4 mt-8">Завершённые задачи</h2>
@@ -167,7 +163,21 @@ const ImmediateTasks = () => {
                 handleSort={handleSort}
               />
             ) : (
-              <div>Нет задач</div>
+              !tasksLoading && <div>Нет задач</div>
+            )}
+
+            {tasksLoading ? (
+              <div className="flex justify-center p-4">
+                <CircularProgress size={24} />
+              </div>
+            ) : (
+              hasMore && (
+                <div className="flex justify-center p-4">
+                  <Button variant="outlined" onClick={loadMore}>
+                    Загрузить ещё
+                  </Button>
+                </div>
+              )
             )}
           </StreamLayout>
         </div>
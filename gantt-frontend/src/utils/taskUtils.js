@@ -88,26 +88,32 @@ export const sortTasks = (
   return sorted;
 };
 
-export const filterTasksByTeamAndUser = (
-  tasks,
-  filterMode,
-  teamFilter,
-  userEmail,
-  selectedTeamId,
-) => {
-  let filtered = tasks;
-
-  if (teamFilter === "selected" && selectedTeamId) {
-    filtered = filtered.filter(
-      (task) => task.team_id === Number(selectedTeamId),
-    );
+// Фильтры, которые умеет /api/tasks/all; поиск по тексту и по именам команд,
+// проектов и стримов остаются на клиенте
+export const toTaskQuery = (filters, userEmail = "") => {
+  const query = {};
+  if (!filters) return query;
+
+  if (filters.status && filters.status.length > 0) {
+    query.status_id = filters.status;
   }
-
-  if (filterMode === "my") {
-    filtered = filtered.filter((task) => task.assignee_email === userEmail);
+  if (filters.priority && filters.priority.length > 0) {
+    query.priority_id = filters.priority;
+  }
+  if (filters.tags && filters.tags.length > 0) {
+    query.tag_id = filters.tags;
+  }
+  if (filters.assignee && filters.assignee.length > 0) {
+    query.assignee_email = filters.assignee.map((a) =>
+      a === "__my__" ? userEmail : a,
+    );
   }
+  if (filters.startDate) query.start_date_from = filters.startDate;
+  if (filters.startDateEnd) query.start_date_to = filters.startDateEnd;
+  if (filters.deadline) query.deadline_from = filters.deadline;
+  if (filters.deadlineEnd) query.deadline_to = filters.deadlineEnd;
 
-  return filtered;
+  return query;
 };
 
 export const applyAdvancedFilters = (